@@ -241,9 +241,6 @@ finished_loading = False
 def load_data():
     global finished_loading
 
-    # load in the spritesheets
-    sprites.load_all()
-
     clan_list = read_clans()
     if clan_list:
         switch_set_value(Switch.clan_list, clan_list)
@@ -342,7 +339,7 @@ def load_game():
     del loading_thread
 
 
-# load spritesheets
+# load spritesheets, only once as they are the same for every clan
 sprites.load_all()
 load_game()
 
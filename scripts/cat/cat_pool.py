@@ -0,0 +1,96 @@
+"""
+Pools of cats to pick random cats from without going through every cat.
+
+A pool keeps its cats in a list together with the position of each cat, so
+cats can be added, removed and picked at random in constant time.
+"""
+
+from scripts.game_structure.rng.relationships import choice, randrange
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+class CatPool:
+    """A set of cats that supports random picks in constant time."""
+
+    def __init__(self):
+        self._cats: List = []
+        self._positions: Dict[str, int] = {}
+        """cat ID: position of the cat in _cats"""
+
+    def __len__(self) -> int:
+        return len(self._cats)
+
+    def __contains__(self, cat) -> bool:
+        position = self._positions.get(cat.ID)
+        return position is not None and self._cats[position] is cat
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._cats))
+
+    def add(self, cat):
+        """Adds the cat, replacing an older cat object with the same ID."""
+        position = self._positions.get(cat.ID)
+        if position is not None:
+            self._cats[position] = cat
+            return
+        self._positions[cat.ID] = len(self._cats)
+        self._cats.append(cat)
+
+    def discard(self, cat):
+        """Removes the cat if it is in the pool, by moving the last cat into its spot."""
+        position = self._positions.get(cat.ID)
+        if position is None or self._cats[position] is not cat:
+            return
+        del self._positions[cat.ID]
+        last_cat = self._cats.pop()
+        if last_cat is not cat:
+            self._cats[position] = last_cat
+            self._positions[last_cat.ID] = position
+
+    def clear(self):
+        self._cats.clear()
+        self._positions.clear()
+
+    def choice(self, exclude=None):
+        """
+        Returns a random cat of the pool, or None if there is none.
+
+        :param exclude: This cat is never returned, default None
+        """
+        count = len(self._cats)
+        excluded = self._positions.get(exclude.ID) if exclude is not None else None
+        if excluded is None or self._cats[excluded] is not exclude:
+            return self._cats[randrange(count)] if count else None
+
+        if count < 2:
+            return None
+        # pick from every spot but the excluded one, the last spot stands in for it
+        position = randrange(count - 1)
+        return self._cats[count - 1 if position == excluded else position]
+
+    def filtered_choice(self, predicate: Callable, exclude=None, tries: int = 8):
+        """
+        Returns a random cat of the pool for which the predicate is True, or None if there is none.
+        Random cats are tried first, the pool is only gone through if none of them fit.
+
+        :param predicate: Function taking a cat, returns if that cat may be picked
+        :param exclude: This cat is never returned, default None
+        :param tries: How many random cats are tried before going through the pool, default 8
+        """
+        for _ in range(tries):
+            cat = self.choice(exclude)
+            if cat is None:
+                return None
+            if predicate(cat):
+                return cat
+
+        candidates = self.filter(predicate, exclude)
+        return choice(candidates) if candidates else None
+
+    def filter(self, predicate: Optional[Callable] = None, exclude=None) -> List:
+        """Returns the cats of the pool for which the predicate is True, in no particular order."""
+        return [
+            cat
+            for cat in self._cats
+            if cat is not exclude and (predicate is None or predicate(cat))
+        ]
@@ -8,23 +8,48 @@ import bisect
 import itertools
 import os.path
 import sys
-from random import choice, choices, randint, sample, random, getrandbits, randrange
-from typing import Dict, List, Any, Union, Callable, Optional, TYPE_CHECKING
+from copy import deepcopy
+from scripts.game_structure.rng.generation import (
+    choice,
+    choices,
+    randint,
+    sample,
+    random,
+    getrandbits,
+    randrange,
+)
+from typing import (
+    Dict,
+    List,
+    Any,
+    Union,
+    Callable,
+    Optional,
+    Iterable,
+    Tuple,
+    TYPE_CHECKING,
+)
 
 import i18n
 import ujson  # type: ignore
 
 import scripts.game_structure.localization as pronouns
+from scripts.cat.cat_pool import CatPool
 from scripts.cat.enums import CatAge, CatRank, CatSocial, CatGroup
 from scripts.cat.history import History
+from scripts.cat.history_cache import history_cache
+from scripts.cat.infections import get_injury_infectiousness, infection_tracker
 from scripts.cat.names import Name
 from scripts.cat.pelts import Pelt
 from scripts.cat.personality import Personality
 from scripts.cat.skills import CatSkills
 from scripts.cat.status import Status, StatusDict
 from scripts.cat.thoughts import Thoughts
+from scripts.cat_relations.family_clusters import family_clusters
 from scripts.cat_relations.inheritance import Inheritance
+from scripts.cat_relations import relationship_store
 from scripts.cat_relations.relationship import Relationship
+from scripts.cat_relations.relationship_map import RelationshipMap
 from scripts.clan_package.settings import get_clan_setting
 from scripts.conditions import (
     Illness,
@@ -35,8 +60,13 @@ from scripts.conditions import (
 )
 from scripts.event_class import Single_Event
 from scripts.events_module.generate_events import GenerateEvents
+from scripts.events_module.moon_profiler import profiled
 from scripts.game_structure import image_cache, constants
-from scripts.game_structure.game.save_load import safe_save
+from scripts.game_structure.game.save_load import (
+    safe_save,
+    safe_delete,
+    wait_for_save,
+)
 from scripts.game_structure.game.settings import game_setting_get
 from scripts.game_structure.game.switches import switch_get_value, Switch
 from scripts.game_structure.game_essentials import game
@@ -112,6 +142,14 @@ class Cat:
     all_cats_list: List[Cat] = []
     ordered_cat_list: List[Cat] = []
 
+    status_index: Dict[Tuple[Optional[CatGroup], CatRank], Dict[str, Cat]] = {}
+    """(group, rank): {ID: cat} of the cats in all_cats, kept up to date by their Status.
+    Use fetch_cats_in_group to query it."""
+    index_order = itertools.count()
+    living_clan_pool = CatPool()
+    """the cats alive in the player Clan, kept up to date together with status_index.
+    Use fetch_random_living_clan_cat to pick from it."""
+
     grief_strings = {}
 
     def __init__(
@@ -181,16 +219,17 @@ class Cat:
         self.personality = Personality(
             trait="troublesome", lawful=0, aggress=0, stable=0, social=0
         )
-        self.parent1 = parent1
-        self.parent2 = parent2
+        # the cat has no ID yet, so these are added to the family index further down
+        self._parent1 = parent1
+        self._parent2 = parent2
         self.par2species = par2species
-        self.adoptive_parents = adoptive_parents if adoptive_parents else []
+        self._adoptive_parents = adoptive_parents if adoptive_parents else []
         self.pelt = pelt if pelt else Pelt()
         self.former_mentor = []
         self.patrol_with_mentor = 0
         self.apprentice = []
         self.former_apprentices = []
-        self.relationships = {}
+        self.relationships = RelationshipMap(self)
         self.mate = []
         self.previous_mates = []
         self._pronouns: Dict[str, List[Dict[str, Union[str, int]]]] = {}
@@ -205,6 +244,8 @@ class Cat:
         self.leader_death_heal = None
         self.also_got = False
         self.permanent_condition = {}
+        self._saved_conditions: Optional[str] = None
+        """conditions as they were last saved, None if there is no condition file"""
         self.experience_level = None
 
         # Various behavior toggles
@@ -355,6 +396,14 @@ class Cat:
 
         # SAVE CAT INTO ALL_CATS DICTIONARY IN CATS-CLASS
         self.all_cats[self.ID] = self
+        family_clusters.add_cat(self.ID)
+        self.all_cats_order = next(Cat.index_order)
+        """position of the cat in all_cats, used to keep that order in lookups"""
+        self._status_key = None
+        self.status.on_change = self.update_status_index
+        self.update_status_index()
+        for parent_id in (self.parent1, self.parent2, *self.adoptive_parents):
+            Inheritance.add_possible_child(self, parent_id)
 
         if self.ID is not None and self.ID != "0":
             Cat.insert_cat(self)
@@ -539,6 +588,34 @@ class Cat:
     def __hash__(self):
         return hash(self.ID)
 
+    @property
+    def parent1(self) -> Optional[str]:
+        return self._parent1
+
+    @parent1.setter
+    def parent1(self, parent_id: Optional[str]):
+        self._parent1 = parent_id
+        Inheritance.add_possible_child(self, parent_id)
+
+    @property
+    def parent2(self) -> Optional[str]:
+        return self._parent2
+
+    @parent2.setter
+    def parent2(self, parent_id: Optional[str]):
+        self._parent2 = parent_id
+        Inheritance.add_possible_child(self, parent_id)
+
+    @property
+    def adoptive_parents(self) -> List[str]:
+        return self._adoptive_parents
+
+    @adoptive_parents.setter
+    def adoptive_parents(self, parent_ids: List[str]):
+        self._adoptive_parents = parent_ids
+        for parent_id in parent_ids:
+            Inheritance.add_possible_child(self, parent_id)
+
     @property
     def dead(self) -> bool:
         return self.status.group and self.status.group.is_afterlife()
@@ -625,11 +702,22 @@ class Cat:
         """load history if it is None"""
         if self._history is None:
             self.load_history()
+        else:
+            history_cache.used(self)
         return self._history
 
     @history.setter
     def history(self, val: History):
         self._history = val
+        if val is None:
+            history_cache.remove(self)
+        else:
+            history_cache.store(self, val)
+
+    @property
+    def history_loaded(self) -> bool:
+        """True if the history is in memory, checking this doesn't load it."""
+        return self._history is not None
 
     def get_genderalign_string(self):
         # translate it if it's default
@@ -1162,6 +1250,10 @@ class Cat:
         history_directory = f"{get_save_dir()}/{clanname}/history/"
         cat_history_directory = history_directory + self.ID + "_history.json"
 
+        # the history might have been dropped by a save that is still being written,
+        # an error writing it is raised where the save is finished instead
+        wait_for_save(raise_error=False)
+
         if not os.path.exists(cat_history_directory):
             self._history = History(
                 beginning={},
@@ -1174,10 +1266,12 @@ class Cat:
                 murder={},
                 cat=self,
             )
+            history_cache.loaded(self, self._history)
             return
         try:
             with open(cat_history_directory, "r", encoding="utf-8") as read_file:
-                history_data = ujson.loads(read_file.read())
+                history_text = read_file.read()
+                history_data = ujson.loads(history_text)
 
                 self._history = History(
                     beginning=(
@@ -1214,6 +1308,8 @@ class Cat:
                     murder=history_data["murder"] if "murder" in history_data else {},
                     cat=self,
                 )
+                self._history.dirty = False
+                history_cache.loaded(self, self._history, len(history_text))
         except Exception:
             self._history = None
             print(
@@ -1231,9 +1327,11 @@ class Cat:
         if not os.path.exists(history_dir):
             os.makedirs(history_dir)
 
-        history_dict = self.history.make_dict()
+        history_data = ujson.dumps(self.history.make_dict(), indent=4)
         try:
-            safe_save(f"{history_dir}/{self.ID}_history.json", history_dict)
+            safe_save(f"{history_dir}/{self.ID}_history.json", history_data)
+            self.history.dirty = False
+            history_cache.store(self, self.history, len(history_data))
         except:
             self.history = History(
                 beginning={},
@@ -1568,6 +1666,7 @@ class Cat:
     #                              moon skip functions                             #
     # ---------------------------------------------------------------------------- #
 
+    @profiled("Cat.one_moon")
     def one_moon(self):
         """Handles a moon skip for an alive cat."""
         old_age = self.age
@@ -1598,6 +1697,7 @@ class Cat:
         if self.status.rank.is_any_apprentice_rank():
             self.update_mentor()
 
+    @profiled("Cat.thoughts")
     def thoughts(self):
         """Generates a thought for the cat, which displays on their profile."""
         all_cats = self.all_cats
@@ -1681,18 +1781,14 @@ class Cat:
         # insert thought
         self.thought = str(chosen_thought)
 
+    @profiled("Cat.relationship_interaction")
     def relationship_interaction(self):
         """Randomly choose a cat of the Clan and have an interaction with them."""
-        cats_to_choose = [
-            iter_cat
-            for iter_cat in Cat.all_cats.values()
-            if iter_cat.ID != self.ID and iter_cat.status.alive_in_player_clan
-        ]
+        chosen_cat = Cat.fetch_random_living_clan_cat(exclude=self)
         # if there are no cats to interact, stop
-        if not cats_to_choose:
+        if not chosen_cat:
             return
 
-        chosen_cat = choice(cats_to_choose)
         if chosen_cat.ID not in self.relationships:
             self.create_one_relationship(chosen_cat)
         relevant_relationship = self.relationships[chosen_cat.ID]
@@ -1975,9 +2071,10 @@ class Cat:
                 "infectiousness": new_illness.infectiousness,
                 "duration": new_illness.duration,
                 "moon_start": game.clan.age if game.clan else 0,
-                "risks": new_illness.risks,
+                "risks": deepcopy(new_illness.risks),
                 "event_triggered": new_illness.new,
             }
+            infection_tracker.add(self)
 
     def get_injured(self, name, event_triggered=False, lethal=True, severity="default"):
         """Add an injury to this cat.
@@ -2043,7 +2140,7 @@ class Cat:
                 "duration": new_injury.duration,
                 "moon_start": game.clan.age if game.clan else 0,
                 "illness_infectiousness": new_injury.illness_infectiousness,
-                "risks": new_injury.risks,
+                "risks": deepcopy(new_injury.risks),
                 "complication": None,
                 "cause_permanent": new_injury.cause_permanent,
                 "event_triggered": new_injury.new,
@@ -2174,7 +2271,7 @@ class Cat:
                 "moon_start": game.clan.age if game.clan else 0,
                 "mortality": new_perm_condition.current_mortality,
                 "illness_infectiousness": new_perm_condition.illness_infectiousness,
-                "risks": new_perm_condition.risks,
+                "risks": deepcopy(new_perm_condition.risks),
                 "complication": None,
                 "event_triggered": new_perm_condition.new,
             }
@@ -2249,28 +2346,23 @@ class Cat:
             if len(infectious_illnesses) == 0:
                 return
 
+        injury_modifiers = [
+            (injury_name, get_injury_infectiousness(injury_name, injury))
+            for injury_name, injury in self.injuries.items()
+        ]
         for illness in infectious_illnesses:
             illness_name = illness
             rate = cat.illnesses[illness]["infectiousness"]
-            if self.is_injured():
-                for y in self.injuries:
-                    illness_infect = list(
-                        filter(
-                            lambda ill: ill["name"] == illness_name,
-                            self.injuries[y]["illness_infectiousness"],
-                        )
+            for injury_name, modifiers in injury_modifiers:
+                rate -= modifiers.get(illness_name, 0)
+
+                # prevent rate lower 0 and print warning message
+                if rate < 0:
+                    print(
+                        f"WARNING: injury {injury_name} has lowered "
+                        f"chance of {illness_name} infection to {rate}"
                     )
-                    if illness_infect is not None and len(illness_infect) > 0:
-                        illness_infect = illness_infect[0]
-                        rate -= illness_infect["lower_by"]
-
-                    # prevent rate lower 0 and print warning message
-                    if rate < 0:
-                        print(
-                            f"WARNING: injury {self.injuries[y]['name']} has lowered \
-                            chance of {illness_name} infection to {rate}"
-                        )
-                        rate = 1
+                    rate = 1
 
             if not random() * rate:
                 text = f"{self.name} had contact with {cat.name} and now has {illness_name}."
@@ -2280,8 +2372,12 @@ class Cat:
                 )
                 self.get_ill(illness_name)
 
-    def save_condition(self):
-        # save conditions for each cat
+    def save_condition(self, full_save=False) -> bool:
+        """Saves the conditions of the cat, if they changed since the last save.
+
+        :param full_save: Rewrite the condition file even if nothing changed, default False
+        :return: False if the conditions were unchanged and nothing was written
+        """
         clanname = None
         if switch_get_value(Switch.clan_name) != "":
             clanname = switch_get_value(Switch.clan_name)
@@ -2298,9 +2394,11 @@ class Cat:
             or self.dead
             or self.status.is_outsider
         ):
-            if os.path.exists(condition_file_path):
-                os.remove(condition_file_path)
-            return
+            if self._saved_conditions is None and not full_save:
+                return False
+            safe_delete(condition_file_path)
+            self._saved_conditions = None
+            return True
 
         conditions = {}
 
@@ -2313,7 +2411,14 @@ class Cat:
         if self.is_disabled():
             conditions["permanent conditions"] = self.permanent_condition
 
-        safe_save(condition_file_path, conditions)
+        # the condition dicts are changed in place all over the place, so compare the contents
+        conditions_str = ujson.dumps(conditions)
+        if conditions_str == self._saved_conditions and not full_save:
+            return False
+
+        safe_save(condition_file_path, conditions_str)
+        self._saved_conditions = conditions_str
+        return True
 
     def load_conditions(self):
         if switch_get_value(Switch.clan_name) != "":
@@ -2332,6 +2437,9 @@ class Cat:
                 self.illnesses = rel_data.get("illnesses", {})
                 self.injuries = rel_data.get("injuries", {})
                 self.permanent_condition = rel_data.get("permanent conditions", {})
+                self._saved_conditions = ujson.dumps(rel_data)
+            if self.illnesses:
+                infection_tracker.add(self)
 
             if "paralyzed" in self.permanent_condition and not self.pelt.paralyzed:
                 self.pelt.paralyzed = True
@@ -2649,6 +2757,7 @@ class Cat:
     def set_adoptive_parent(self, other_cat: Cat):
         """Sets up a parent-child relationship between self and other_cat."""
         self.adoptive_parents.append(other_cat.ID)
+        Inheritance.add_possible_child(self, other_cat.ID)
         self.create_inheritance_new_cat()
 
         # Set starting relationship values
@@ -2684,26 +2793,24 @@ class Cat:
             )
             return None
 
-        self.relationships[other_cat.ID] = Relationship(self, other_cat)
+        self.relationships.set_default(other_cat)
         return self.relationships[other_cat.ID]
 
     def create_relationships_new_cat(self):
         """Create relationships for a new generated cat."""
-        for inter_cat in Cat.all_cats.values():
+        # dead cats have no relationships
+        if self.dead:
+            return
+        # only with the cats that are in (or outside of) the Clan at the same time
+        for inter_cat in Cat.fetch_cats_in_group(self.status.group):
             # the inter_cat is the same as the current cat
             if inter_cat.ID == self.ID:
                 continue
             # if the cat already has (somehow) a relationship with the inter cat
             if inter_cat.ID in self.relationships:
                 continue
-            # if they dead (dead cats have no relationships)
-            if self.dead or inter_cat.dead:
-                continue
-            # if they are not outside of the Clan at the same time
-            if self.status.group != inter_cat.status.group:
-                continue
-            inter_cat.relationships[self.ID] = Relationship(inter_cat, self)
-            self.relationships[inter_cat.ID] = Relationship(self, inter_cat)
+            inter_cat.relationships.set_default(self)
+            self.relationships.set_default(inter_cat)
 
     def init_all_relationships(self):
         """Create Relationships to all current Clancats."""
@@ -2773,6 +2880,20 @@ class Cat:
                 if siblings and like < 30:
                     like = 30
 
+                if not (
+                    mates
+                    or related
+                    or romantic_love
+                    or like
+                    or dislike
+                    or admiration
+                    or comfortable
+                    or jealousy
+                    or trust
+                ):
+                    self.relationships.set_default(the_cat)
+                    continue
+
                 rel = Relationship(
                     cat_from=self,
                     cat_to=the_cat,
@@ -2788,29 +2909,6 @@ class Cat:
                 )
                 self.relationships[the_cat.ID] = rel
 
-    def save_relationship_of_cat(self, relationship_dir):
-        # save relationships for each cat
-
-        rel = []
-        for r in self.relationships.values():
-            r_data = {
-                "cat_from_id": r.cat_from.ID,
-                "cat_to_id": r.cat_to.ID,
-                "mates": r.mates,
-                "family": r.family,
-                "romantic_love": r.romantic_love,
-                "platonic_like": r.platonic_like,
-                "dislike": r.dislike,
-                "admiration": r.admiration,
-                "comfortable": r.comfortable,
-                "jealousy": r.jealousy,
-                "trust": r.trust,
-                "log": r.log,
-            }
-            rel.append(r_data)
-
-        safe_save(f"{relationship_dir}/{self.ID}_relations.json", rel)
-
     def load_relationship_of_cat(self):
         if switch_get_value(Switch.clan_name) != "":
             clanname = switch_get_value(Switch.clan_name)
@@ -2820,39 +2918,56 @@ class Cat:
         relation_directory = get_save_dir() + "/" + clanname + "/relationships/"
         relation_cat_directory = relation_directory + self.ID + "_relations.json"
 
-        self.relationships = {}
-        if os.path.exists(relation_directory):
-            if not os.path.exists(relation_cat_directory):
-                self.init_all_relationships()
-                for cat in Cat.all_cats.values():
-                    cat.create_one_relationship(self)
-                return
-            try:
+        self.relationships = RelationshipMap(self)
+        store = relationship_store.get_clan_store(clanname)
+        if store is not None:
+            rel_data = store.get_relations_of(self.ID)
+        elif os.path.exists(relation_directory):
+            # old save, the per-cat files are replaced by the store with the next save
+            rel_data = [] if os.path.exists(relation_cat_directory) else None
+        else:
+            return
+
+        if rel_data is None:
+            self.init_all_relationships()
+            for cat in Cat.all_cats.values():
+                cat.create_one_relationship(self)
+            return
+        try:
+            if store is None:
                 with open(relation_cat_directory, "r", encoding="utf-8") as read_file:
                     rel_data = ujson.loads(read_file.read())
-                    for rel in rel_data:
-                        cat_to = self.all_cats.get(rel["cat_to_id"])
-                        if cat_to is None or rel["cat_to_id"] == self.ID:
-                            continue
-                        new_rel = Relationship(
-                            cat_from=self,
-                            cat_to=cat_to,
-                            mates=rel["mates"] or False,
-                            family=rel["family"] or False,
-                            romantic_love=(rel["romantic_love"] or 0),
-                            platonic_like=(rel["platonic_like"] or 0),
-                            dislike=rel["dislike"] or 0,
-                            admiration=rel["admiration"] or 0,
-                            comfortable=rel["comfortable"] or 0,
-                            jealousy=rel["jealousy"] or 0,
-                            trust=rel["trust"] or 0,
-                            log=rel["log"],
-                        )
-                        self.relationships[rel["cat_to_id"]] = new_rel
-            except:
-                print(
-                    f"WARNING: There was an error reading the relationship file of cat #{self}."
+            for rel in rel_data:
+                cat_to = self.all_cats.get(rel["cat_to_id"])
+                if cat_to is None or rel["cat_to_id"] == self.ID:
+                    continue
+                if not (
+                    rel["mates"]
+                    or rel["family"]
+                    or rel["log"]
+                    or any(rel[stat] for stat in relationship_store.STAT_FIELDS)
+                ):
+                    self.relationships.set_default(cat_to)
+                    continue
+                new_rel = Relationship(
+                    cat_from=self,
+                    cat_to=cat_to,
+                    mates=rel["mates"] or False,
+                    family=rel["family"] or False,
+                    romantic_love=(rel["romantic_love"] or 0),
+                    platonic_like=(rel["platonic_like"] or 0),
+                    dislike=rel["dislike"] or 0,
+                    admiration=rel["admiration"] or 0,
+                    comfortable=rel["comfortable"] or 0,
+                    jealousy=rel["jealousy"] or 0,
+                    trust=rel["trust"] or 0,
+                    log=rel["log"],
                 )
+                self.relationships[rel["cat_to_id"]] = new_rel
+        except:
+            print(
+                f"WARNING: There was an error reading the relationship file of cat #{self}."
+            )
 
     @staticmethod
     def mediate_relationship(mediator, cat1, cat2, allow_romantic, sabotage=False):
@@ -3187,6 +3302,76 @@ class Cat:
             f"sprites/faded/{file_name}"
         ).convert_alpha()
 
+    def update_status_index(self):
+        """Moves the cat to the bucket of its current group and rank in Cat.status_index."""
+        key = (self.status.group, self.status.rank)
+        if key == self._status_key:
+            return
+        self.drop_from_status_index()
+        Cat.status_index.setdefault(key, {})[self.ID] = self
+        self._status_key = key
+        if self.status.alive_in_player_clan:
+            Cat.living_clan_pool.add(self)
+
+    def drop_from_status_index(self):
+        """Removes the cat from Cat.status_index, for cats removed from all_cats."""
+        if self._status_key is None:
+            return
+        cats = Cat.status_index.get(self._status_key, {})
+        # a newer cat object with the same ID might have taken the spot
+        if cats.get(self.ID) is self:
+            del cats[self.ID]
+        Cat.living_clan_pool.discard(self)
+        self._status_key = None
+
+    @staticmethod
+    def fetch_cats_in_group(
+        group: Optional[CatGroup], ranks: Optional[Iterable[CatRank]] = None
+    ) -> List[Cat]:
+        """
+        Returns the cats in all_cats that are currently in the given group, in all_cats order.
+        Only touches the cats of that group, not every cat.
+
+        :param group: The group, None for cats outside of any group
+        :param ranks: Only return cats with these ranks, default None for any rank
+        """
+        found = []
+        for (index_group, rank), cats in Cat.status_index.items():
+            if index_group != group or (ranks is not None and rank not in ranks):
+                continue
+            for cat_id, cat in cats.items():
+                if Cat.all_cats.get(cat_id) is cat:
+                    found.append(cat)
+
+        found.sort(key=lambda cat: cat.all_cats_order)
+        return found
+
+    @staticmethod
+    def fetch_living_clan_cats(ranks: Optional[Iterable[CatRank]] = None) -> List[Cat]:
+        """
+        Returns the cats alive in the player Clan, optionally only those with the given ranks.
+        """
+        return Cat.fetch_cats_in_group(CatGroup.PLAYER_CLAN, ranks)
+
+    @staticmethod
+    def fetch_random_living_clan_cat(
+        exclude: Optional[Cat] = None, predicate: Optional[Callable] = None
+    ) -> Optional[Cat]:
+        """
+        Returns a random cat alive in the player Clan, or None if there is none.
+        Doesn't go through the whole Clan unless few cats fit the predicate.
+
+        :param exclude: This cat is never returned, default None
+        :param predicate: Function taking a cat, only cats for which it returns True are picked
+        """
+
+        def is_possible(cat):
+            return Cat.all_cats.get(cat.ID) is cat and (
+                predicate is None or predicate(cat)
+            )
+
+        return Cat.living_clan_pool.filtered_choice(is_possible, exclude)
+
     @staticmethod
     def fetch_cat(ID: str):
         """Fetches a cat object. Works for both faded and non-faded cats. Returns none if no cat was found."""
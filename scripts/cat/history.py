@@ -1,4 +1,4 @@
-import random
+from scripts.game_structure.rng import events as random
 
 import i18n
 
@@ -35,6 +35,8 @@ class History:
         self.scar_events = scar_events if scar_events else []
         self.murder = murder if murder else {}
         self.cat = cat
+        self.dirty = True
+        """Set when the history changed since it was last saved"""
 
         # fix 'old' history save bugs
         if self.mentor_influence["trait"] is None:
@@ -165,6 +167,7 @@ class History:
         adds joining age and moon info to the cat's history save
         :param clan_born: default False, set True if the cat was not born in the Clan
         """
+        self.dirty = True
         if not game.clan:
             return
 
@@ -179,6 +182,7 @@ class History:
         """
         adds mentor influence to the cat's history save
         """
+        self.dirty = True
 
         if not self.mentor_influence["trait"]:
             return
@@ -261,6 +265,7 @@ class History:
         """
         adds mentor influence to the cat's history save
         """
+        self.dirty = True
 
         if not self.mentor_influence["skill"]:
             return
@@ -308,6 +313,7 @@ class History:
 
     def add_facet_mentor_influence(self, mentor_id, facet, amount):
         """Adds the history information for a single mentor facet change, that occurs after a patrol."""
+        self.dirty = True
 
         if mentor_id not in self.mentor_influence["trait"]:
             self.mentor_influence["trait"][mentor_id] = {}
@@ -317,6 +323,7 @@ class History:
 
     def add_skill_mentor_influence(self, mentor_id, path, amount):
         """Adds mentor influence on skills."""
+        self.dirty = True
 
         if not isinstance(path, SkillPath):
             path = SkillPath[path]
@@ -332,6 +339,7 @@ class History:
         adds ceremony honor to the cat's history
         :param honor: the honor trait given during the cat's ceremony
         """
+        self.dirty = True
         if not game.clan:
             return
 
@@ -355,6 +363,7 @@ class History:
         :param scar_text: text for scar history
         :param other_cat: cat object of other cat involved.
         """
+        self.dirty = True
 
         # If the condition already exists, we don't want to overwrite it
         if condition in self.possible_history:
@@ -385,6 +394,7 @@ class History:
         # :param scar: set True if removing scar
         # :param death: set True if removing death
         """
+        self.dirty = True
 
         if condition in self.possible_history:
             self.possible_history.pop(condition)
@@ -394,6 +404,7 @@ class History:
         possible_history to see if anything is saved there, and, if so, use the text and
         other_cat there (overriding the
         passed death_text and other_cat)."""
+        self.dirty = True
 
         if not game.clan:
             return
@@ -411,6 +422,7 @@ class History:
         )
 
     def add_scar(self, scar_text, condition=None, other_cat=None):
+        self.dirty = True
         if not game.clan:
             return
 
@@ -433,6 +445,8 @@ class History:
         :param victim: cat object for the victim
         :param murderer_id: murderer's cat ID
         """
+        self.dirty = True
+        victim.history.dirty = True
         if not game.clan:
             return
         if "is_murderer" not in self.murder:
@@ -473,6 +487,8 @@ class History:
         :param clan_reveal: set to True if the whole Clan now knows about the murder
         :param aware_individuals: if only individual cats are learning about the murder, give a list of their cat objects
         """
+        self.dirty = True
+        victim.history.dirty = True
         if aware_individuals is None:
             aware_individuals = []
 
@@ -514,6 +530,7 @@ class History:
         """
         generates and adds lead ceremony to history
         """
+        self.dirty = True
 
         self.lead_ceremony = self.cat.generate_lead_ceremony()
 
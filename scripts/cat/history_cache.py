@@ -0,0 +1,84 @@
+"""
+Keeps the histories of recently used cats in memory.
+
+A cat's history is read from the save the first time it is used. Histories are
+no longer dropped after every save: they stay loaded until all of them together
+grow over the budget set in the game config (``save_load``, ``history_cache_kb``).
+Then, once the last save is written, the least recently used histories are dropped, those of dead
+and faded cats first. Histories with unsaved changes are never dropped.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+from scripts.game_structure import constants
+
+DEFAULT_HISTORY_SIZE = 512
+"""estimated size in bytes of a history that wasn't read from or written to a file yet"""
+
+
+class HistoryCache:
+    def __init__(self):
+        self.resident = OrderedDict()
+        """cat ID: (cat, history, size in bytes), least recently used first"""
+        self.size = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def get_budget() -> int:
+        return constants.CONFIG["save_load"]["history_cache_kb"] * 1024
+
+    def used(self, cat):
+        """Marks the loaded history of the cat as used."""
+        with self._lock:
+            self.stats["hits"] += 1
+            if cat.ID in self.resident:
+                self.resident.move_to_end(cat.ID)
+
+    def loaded(self, cat, history, size=DEFAULT_HISTORY_SIZE):
+        """Adds a history that had to be read from the save."""
+        with self._lock:
+            self.stats["misses"] += 1
+            self.store(cat, history, size)
+
+    def store(self, cat, history, size=DEFAULT_HISTORY_SIZE):
+        """Adds the history of the cat, or updates its size."""
+        with self._lock:
+            self.remove(cat)
+            self.resident[cat.ID] = (cat, history, size)
+            self.size += size
+
+    def remove(self, cat):
+        with self._lock:
+            entry = self.resident.pop(cat.ID, None)
+            if entry is not None:
+                self.size -= entry[2]
+
+    def trim(self, all_cats: Dict):
+        """Drops saved histories until the cache fits its budget again. Histories of dead
+        cats and of cats that are not in all_cats anymore go first, then the least recently
+        used ones. Should only be called once the last save is written, so the dropped
+        histories can be read back from it."""
+        with self._lock:
+            budget = self.get_budget()
+            for only_cold in (True, False):
+                for cat_id, (cat, history, size) in list(self.resident.items()):
+                    if self.size <= budget:
+                        return
+                    if history.dirty:
+                        continue
+                    if only_cold and not cat.dead and all_cats.get(cat_id) is cat:
+                        continue
+                    self.remove(cat)
+                    cat.history = None
+                    self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self.resident.clear()
+            self.size = 0
+
+
+history_cache = HistoryCache()
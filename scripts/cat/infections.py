@@ -0,0 +1,75 @@
+"""
+Keeps track of the ill cats and of how injuries change the chance to catch an illness.
+
+Outbreaks used to go through every living cat for each ill cat to count the
+sick and the healthy ones, and contacts went through the infectiousness list
+of every injury again for each illness. The ill cats are now registered when
+they get ill or their conditions are loaded, and the injury modifiers are
+read once from ``resources/dicts/conditions/injuries.json``.
+"""
+
+import threading
+from typing import Dict, List
+
+import ujson
+
+with open("resources/dicts/conditions/injuries.json", "r", encoding="utf-8") as f:
+    INJURY_INFECTIOUSNESS: Dict[str, Dict[str, int]] = {
+        injury: {
+            modifier["name"]: modifier["lower_by"]
+            for modifier in details["illness_infectiousness"]
+        }
+        for injury, details in ujson.loads(f.read()).items()
+    }
+"""injury: {illness: how much the injury lowers the infection rate of that illness}"""
+
+
+def get_injury_infectiousness(injury_name: str, injury: Dict) -> Dict[str, int]:
+    """Returns {illness: lower_by} for an injury of a cat. Injuries that are not in the
+    resources anymore use the modifiers saved with the injury."""
+    modifiers = INJURY_INFECTIOUSNESS.get(injury_name)
+    if modifiers is None:
+        modifiers = {
+            modifier["name"]: modifier["lower_by"]
+            for modifier in injury.get("illness_infectiousness", [])
+        }
+    return modifiers
+
+
+class InfectionTracker:
+    """The cats that may be ill, so the sick cats can be found without going through every cat."""
+
+    def __init__(self):
+        self.infected: Dict[str, object] = {}
+        """cat ID: cat, for every cat that got ill since it was added. Cats that got
+        better are only removed the next time the ill cats are looked up."""
+        self._lock = threading.RLock()
+
+    def add(self, cat):
+        with self._lock:
+            self.infected[cat.ID] = cat
+
+    def clear(self):
+        with self._lock:
+            self.infected.clear()
+
+    def fetch_ill_cats(self, all_cats: Dict) -> List:
+        """Returns the ill cats that are in all_cats, in no particular order."""
+        with self._lock:
+            ill_cats = []
+            for cat_id, cat in list(self.infected.items()):
+                if not cat.is_ill() or all_cats.get(cat_id) is not cat:
+                    del self.infected[cat_id]
+                    continue
+                ill_cats.append(cat)
+            return ill_cats
+
+    def count_living_clan_ill_cats(self, all_cats: Dict) -> int:
+        return sum(
+            1
+            for cat in self.fetch_ill_cats(all_cats)
+            if cat.status.alive_in_player_clan
+        )
+
+
+infection_tracker = InfectionTracker()
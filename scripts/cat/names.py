@@ -4,7 +4,7 @@ Module that handles the name generation for all cats.
 
 import contextlib
 import os
-import random
+from scripts.game_structure.rng import generation as random
 
 import ujson
 
@@ -1,5 +1,5 @@
-import random
-from random import choice
+from scripts.game_structure.rng import generation as random
+from scripts.game_structure.rng.generation import choice
 from re import sub
 
 import i18n
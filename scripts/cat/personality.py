@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from random import randint, choice, choices
+from scripts.game_structure.rng.generation import randint, choice, choices
 
 import ujson
 
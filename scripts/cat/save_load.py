@@ -4,7 +4,17 @@ from typing import TYPE_CHECKING, Type
 
 import ujson
 
-from scripts.game_structure.game.save_load import safe_save
+from scripts.cat.history_cache import history_cache
+from scripts.cat_relations.relationship_store import (
+    STORE_FILE_NAME,
+    save_relationships,
+)
+from scripts.game_structure.game.save_load import (
+    safe_save,
+    safe_delete,
+    on_save_failed,
+    wait_for_save,
+)
 from scripts.game_structure.game.settings.settings import game_setting_get
 from scripts.housekeeping.datadir import get_save_dir
 
@@ -18,41 +28,89 @@ faded_ids = []
 cat_to_fade = []
 """Cats who have been faded since the last save"""
 
+last_saved_clan = None
+"""Name of the Clan saved last, the next save is a full save if it is another Clan or None"""
 
-def save_cats(clanname, cat_class: Type["Cat"], game: "Game"):
-    """Save the cat data."""
+save_counter = {"saved": 0, "skipped": 0}
+"""Amount of condition, history and relationship records the last save wrote and skipped as unchanged"""
+
+
+def save_cats(clanname, cat_class: Type["Cat"], game: "Game", full_save=False):
+    """Save the cat data. Conditions, histories and relationships are only rewritten if they
+    changed since the last save.
+
+    :param full_save: Rewrite every record even if it is unchanged, default False
+    """
+    global last_saved_clan
 
     directory = Path(get_save_dir()) / clanname
     history_dir = directory / "history"
     relationships_dir = directory / "relationships"
 
+    # the records are marked as saved before they are written, see forget_last_save
+    wait_for_save(raise_error=False)
     if not directory.exists():
         directory.mkdir(parents=True)
-
-    # Delete all existing relationship files
+        full_save = True
+    if clanname != last_saved_clan:
+        full_save = True
+    last_saved_clan = None
+    on_save_failed(forget_last_save)
+
+    if not full_save:
+        # histories stay loaded between saves, only drop cold ones if there are too many.
+        # The last save is written by now, so they can be read back.
+        history_cache.trim(cat_class.all_cats)
+
+    # Delete the per-cat relationship files of old saves, they are replaced by the store
     if not relationships_dir.exists():
         relationships_dir.mkdir()
-    for f in relationships_dir.glob("*.json"):
-        f.unlink()
+    for f in relationships_dir.glob("*_relations.json"):
+        if f.name != STORE_FILE_NAME:
+            safe_delete(f)
 
     save_faded_cats(clanname, cat_class, game)  # Fades cat and saves them, if needed
 
+    saved = 0
+    skipped = 0
     clan_cats = []
     for inter_cat in cat_class.all_cats.values():
         cat_data = inter_cat.get_save_dict()
         clan_cats.append(cat_data)
 
-        inter_cat.save_condition()
+        if inter_cat.save_condition(full_save):
+            saved += 1
+        else:
+            skipped += 1
 
-        if inter_cat.history:
+        # histories that were never loaded can't have changed
+        if inter_cat.history_loaded and (full_save or inter_cat.history.dirty):
             inter_cat.save_history(history_dir)
-            # after saving, dump the history info
-            inter_cat.history = None
-        if not inter_cat.dead:
-            inter_cat.save_relationship_of_cat(relationships_dir)
+            saved += 1
+        else:
+            skipped += 1
+
+    living_cats = [
+        inter_cat for inter_cat in cat_class.all_cats.values() if not inter_cat.dead
+    ]
+    unchanged_relationships = save_relationships(clanname, living_cats, full_save)
+    saved += len(living_cats) - unchanged_relationships
+    skipped += unchanged_relationships
 
     safe_save(f"{get_save_dir()}/{clanname}/clan_cats.json", clan_cats)
 
+    save_counter["saved"] = saved
+    save_counter["skipped"] = skipped
+    last_saved_clan = clanname
+
+
+def forget_last_save():
+    """Makes the next save a full save. Conditions, histories and relationships are marked
+    as saved when they are added to the save, so if it can't be written, they have to be
+    written again even if they didn't change since."""
+    global last_saved_clan
+    last_saved_clan = None
+
 
 def save_faded_cats(clanname, cat_class: Type["Cat"], game: "Game"):
     """Deals with fades cats, if needed, adding them as faded"""
@@ -1,4 +1,4 @@
-import random
+from scripts.game_structure.rng import generation as random
 from enum import Enum, Flag, auto
 from typing import Union
 
@@ -1,5 +1,8 @@
 import logging
 import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 
 import pygame
@@ -18,6 +21,51 @@ class Sprites:
     white_patches_tints = {}
     clan_symbols = []
 
+    CAT_SPRITE_CACHE_BYTES = 32 * 1024 * 1024
+    """Memory cap of the composited cat sprites cache"""
+
+    SPRITESHEETS = (
+        "lineart",
+        "lineartdf",
+        "lineartdead",
+        "eyes",
+        "eyes2",
+        "skin",
+        "scars",
+        "missingscars",
+        "medcatherbs",
+        "wild",
+        "collars",
+        "bellcollars",
+        "bowcollars",
+        "nyloncollars",
+        "singlecolours",
+        "speckledcolours",
+        "tabbycolours",
+        "bengalcolours",
+        "marbledcolours",
+        "rosettecolours",
+        "smokecolours",
+        "tickedcolours",
+        "mackerelcolours",
+        "classiccolours",
+        "sokokecolours",
+        "agouticolours",
+        "singlestripecolours",
+        "maskedcolours",
+        "shadersnewwhite",
+        "lightingnew",
+        "whitepatches",
+        "tortiepatchesmasks",
+        "fademask",
+        "fadestarclan",
+        "fadedarkforest",
+    )
+    """Spritesheets every sprite folder has"""
+
+    LOAD_WORKERS = min(8, os.cpu_count() or 1)
+    """Threads decoding the spritesheets while load_all converts and divides them"""
+
     def __init__(self):
         """Class that handles and hold all spritesheets.
         Size is normally automatically determined by the size
@@ -26,12 +74,19 @@ class Sprites:
         self.symbol_dict = None
         self.size = None
         self.spritesheets = {}
+        self.load_timings = {}
+        """Seconds load_all took for each sprite folder"""
         self.images = {}
         self.sprites = {}
 
         # Shared empty sprite for placeholders
         self.blank_sprite = None
 
+        # Composited cat sprites, keyed by appearance. Least recently used first.
+        self.cat_sprite_cache = OrderedDict()
+        self.cat_sprite_cache_bytes = 0
+        self.cat_sprite_cache_stats = {"hits": 0, "misses": 0}
+
         self.load_tints()
 
     def load_tints(self):
@@ -105,10 +160,39 @@ class Sprites:
                 self.sprites[full_name] = new_sprite
                 i += 1
 
+    def get_cat_sprite(self, key):
+        """Returns the composited cat sprite cached for the key, or None.
+        The sprite is shared by all cats that look the same, so don't draw on it."""
+        sprite = self.cat_sprite_cache.get(key)
+        if sprite is None:
+            self.cat_sprite_cache_stats["misses"] += 1
+            return None
+        self.cat_sprite_cache_stats["hits"] += 1
+        self.cat_sprite_cache.move_to_end(key)
+        return sprite
+
+    def cache_cat_sprite(self, key, sprite: pygame.Surface):
+        """Caches a composited cat sprite, dropping the least recently used ones when the
+        cache grows over CAT_SPRITE_CACHE_BYTES."""
+        if key in self.cat_sprite_cache:
+            return
+        self.cat_sprite_cache[key] = sprite
+        self.cat_sprite_cache_bytes += _surface_bytes(sprite)
+        while self.cat_sprite_cache_bytes > self.CAT_SPRITE_CACHE_BYTES:
+            _, old_sprite = self.cat_sprite_cache.popitem(last=False)
+            self.cat_sprite_cache_bytes -= _surface_bytes(old_sprite)
+
+    def clear_cat_sprite_cache(self):
+        self.cat_sprite_cache.clear()
+        self.cat_sprite_cache_bytes = 0
+
     def load_all(self):
         if not game.sprite_folders:
             raise Exception("[SPS] Cannot find sprite folders or none exist")
 
+        # the cached cat sprites were made from the old sheets
+        self.clear_cat_sprite_cache()
+
         lineart = pygame.image.load('sprites/1/lineart.png')
 
         # get the width and height of the spritesheet
@@ -130,357 +214,344 @@ class Sprites:
 
         del width, height  # unneeded
 
-        # load sprite sheets for all folders
-        for f in game.sprite_folders:
-            for x in [
-                "lineart",
-                "lineartdf",
-                "lineartdead",
-                "eyes",
-                "eyes2",
-                "skin",
-                "scars",
-                "missingscars",
-                "medcatherbs",
-                "wild",
-                "collars",
-                "bellcollars",
-                "bowcollars",
-                "nyloncollars",
-                "singlecolours",
-                "speckledcolours",
-                "tabbycolours",
-                "bengalcolours",
-                "marbledcolours",
-                "rosettecolours",
-                "smokecolours",
-                "tickedcolours",
-                "mackerelcolours",
-                "classiccolours",
-                "sokokecolours",
-                "agouticolours",
-                "singlestripecolours",
-                "maskedcolours",
-                "shadersnewwhite",
-                "lightingnew",
-                "whitepatches",
-                "tortiepatchesmasks",
-                "fademask",
-                "fadestarclan",
-                "fadedarkforest",
-                "symbols",
-            ]:
-                if "lineart" in x and (
-                    constants.CONFIG["fun"]["april_fools"]
-                    or is_today(SpecialDate.APRIL_FOOLS)
-                ):
-                    self.spritesheet(f"sprites/{f}/aprilfools{x}.png", x)
-                elif 'symbols' in x:
-                    self.spritesheet(f"sprites/{x}.png", x)
-                else:
-                    self.spritesheet(f"sprites/{f}/{x}.png", x)
-
-            # Line art
-            self.make_group("lineart", (0, 0), f"lines{f}_")
-            self.make_group("shadersnewwhite", (0, 0), f"shaders{f}_")
-            self.make_group("lightingnew", (0, 0), f"lighting{f}_")
-
-            self.make_group("lineartdead", (0, 0), f"lineartdead{f}_")
-            self.make_group("lineartdf", (0, 0), f"lineartdf{f}_")
-
-            # Fading Fog
-            for i in range(0, 3):
-                self.make_group("fademask", (i, 0), f"fademask{f}_{i}")
-                self.make_group("fadestarclan", (i, 0), f"fadestarclan{f}_{i}")
-                self.make_group("fadedarkforest", (i, 0), f"fadedf{f}_{i}")
+        # the sheets are decoded in the background, but converted on this (main) thread,
+        # where the display they are converted for lives
+        executor = ThreadPoolExecutor(max_workers=self.LOAD_WORKERS)
+        decoding = {
+            (f, x): executor.submit(pygame.image.load, self.get_spritesheet_path(f, x))
+            for f in game.sprite_folders
+            for x in self.SPRITESHEETS
+        }
+        try:
+            self.spritesheet("sprites/symbols.png", "symbols")
+            self.load_timings = {}
+
+            # load sprite sheets for all folders
+            for f in game.sprite_folders:
+                start = time.perf_counter()
+                for x in self.SPRITESHEETS:
+                    self.spritesheets[x] = decoding.pop((f, x)).result().convert_alpha()
+
+                # Line art
+                self.make_group("lineart", (0, 0), f"lines{f}_")
+                self.make_group("shadersnewwhite", (0, 0), f"shaders{f}_")
+                self.make_group("lightingnew", (0, 0), f"lighting{f}_")
+
+                self.make_group("lineartdead", (0, 0), f"lineartdead{f}_")
+                self.make_group("lineartdf", (0, 0), f"lineartdf{f}_")
+
+                # Fading Fog
+                for i in range(0, 3):
+                    self.make_group("fademask", (i, 0), f"fademask{f}_{i}")
+                    self.make_group("fadestarclan", (i, 0), f"fadestarclan{f}_{i}")
+                    self.make_group("fadedarkforest", (i, 0), f"fadedf{f}_{i}")
+
+                # Define eye colors
+                eye_colors = [
+                    [
+                        "YELLOW",
+                        "AMBER",
+                        "HAZEL",
+                        "PALEGREEN",
+                        "GREEN",
+                        "BLUE",
+                        "DARKBLUE",
+                        "GREY",
+                        "CYAN",
+                        "EMERALD",
+                        "HEATHERBLUE",
+                        "SUNLITICE",
+                    ],
+                    [
+                        "COPPER",
+                        "SAGE",
+                        "COBALT",
+                        "PALEBLUE",
+                        "BRONZE",
+                        "SILVER",
+                        "PALEYELLOW",
+                        "GOLD",
+                        "GREENYELLOW",
+                        "ORANGE",
+                    ],
+                ]
 
-            # Define eye colors
-            eye_colors = [
-                [
-                    "YELLOW",
-                    "AMBER",
-                    "HAZEL",
-                    "PALEGREEN",
-                    "GREEN",
-                    "BLUE",
-                    "DARKBLUE",
-                    "GREY",
-                    "CYAN",
-                    "EMERALD",
-                    "HEATHERBLUE",
-                    "SUNLITICE",
-                ],
-                [
-                    "COPPER",
-                    "SAGE",
-                    "COBALT",
-                    "PALEBLUE",
-                    "BRONZE",
-                    "SILVER",
-                    "PALEYELLOW",
-                    "GOLD",
-                    "GREENYELLOW",
-                    "ORANGE",
-                ],
-            ]
+                for row, colors in enumerate(eye_colors):
+                    for col, color in enumerate(colors):
+                        self.make_group("eyes", (col, row), f"eyes{f}_{color}")
+                        self.make_group("eyes2", (col, row), f"eyes2{f}_{color}")
+
+                # Define white patches
+                white_patches = [
+                    [
+                        "FULLWHITE",
+                        "ANY",
+                        "TUXEDO",
+                        "LITTLE",
+                        "COLOURPOINT",
+                        "VAN",
+                        "ANYTWO",
+                        "MOON",
+                        "PHANTOM",
+                        "POWDER",
+                        "BLEACHED",
+                        "SAVANNAH",
+                        "FADESPOTS",
+                        "PEBBLESHINE",
+                    ],
+                    [
+                        "EXTRA",
+                        "ONEEAR",
+                        "BROKEN",
+                        "LIGHTTUXEDO",
+                        "BUZZARDFANG",
+                        "RAGDOLL",
+                        "LIGHTSONG",
+                        "VITILIGO",
+                        "BLACKSTAR",
+                        "PIEBALD",
+                        "CURVED",
+                        "PETAL",
+                        "SHIBAINU",
+                        "OWL",
+                    ],
+                    [
+                        "TIP",
+                        "FANCY",
+                        "FRECKLES",
+                        "RINGTAIL",
+                        "HALFFACE",
+                        "PANTSTWO",
+                        "GOATEE",
+                        "VITILIGOTWO",
+                        "PAWS",
+                        "MITAINE",
+                        "BROKENBLAZE",
+                        "SCOURGE",
+                        "DIVA",
+                        "BEARD",
+                    ],
+                    [
+                        "TAIL",
+                        "BLAZE",
+                        "PRINCE",
+                        "BIB",
+                        "VEE",
+                        "UNDERS",
+                        "HONEY",
+                        "FAROFA",
+                        "DAMIEN",
+                        "MISTER",
+                        "BELLY",
+                        "TAILTIP",
+                        "TOES",
+                        "TOPCOVER",
+                    ],
+                    [
+                        "APRON",
+                        "CAPSADDLE",
+                        "MASKMANTLE",
+                        "SQUEAKS",
+                        "STAR",
+                        "TOESTAIL",
+                        "RAVENPAW",
+                        "PANTS",
+                        "REVERSEPANTS",
+                        "SKUNK",
+                        "KARPATI",
+                        "HALFWHITE",
+                        "APPALOOSA",
+                        "DAPPLEPAW",
+                    ],
+                    [
+                        "HEART",
+                        "LILTWO",
+                        "GLASS",
+                        "MOORISH",
+                        "SEPIAPOINT",
+                        "MINKPOINT",
+                        "SEALPOINT",
+                        "MAO",
+                        "LUNA",
+                        "CHESTSPECK",
+                        "WINGS",
+                        "PAINTED",
+                        "HEARTTWO",
+                        "WOODPECKER",
+                    ],
+                    [
+                        "BOOTS",
+                        "MISS",
+                        "COW",
+                        "COWTWO",
+                        "BUB",
+                        "BOWTIE",
+                        "MUSTACHE",
+                        "REVERSEHEART",
+                        "SPARROW",
+                        "VEST",
+                        "LOVEBUG",
+                        "TRIXIE",
+                        "SAMMY",
+                        "SPARKLE",
+                    ],
+                    [
+                        "RIGHTEAR",
+                        "LEFTEAR",
+                        "ESTRELLA",
+                        "SHOOTINGSTAR",
+                        "EYESPOT",
+                        "REVERSEEYE",
+                        "FADEBELLY",
+                        "FRONT",
+                        "BLOSSOMSTEP",
+                        "PEBBLE",
+                        "TAILTWO",
+                        "BUDDY",
+                        "BACKSPOT",
+                        "EYEBAGS",
+                    ],
+                    [
+                        "BULLSEYE",
+                        "FINN",
+                        "DIGIT",
+                        "KROPKA",
+                        "FCTWO",
+                        "FCONE",
+                        "MIA",
+                        "SCAR",
+                        "BUSTER",
+                        "SMOKEY",
+                        "HAWKBLAZE",
+                        "CAKE",
+                        "ROSINA",
+                        "PRINCESS",
+                    ],
+                    ["LOCKET", "BLAZEMASK", "TEARS", "DOUGIE"],
+                ]
 
-            for row, colors in enumerate(eye_colors):
-                for col, color in enumerate(colors):
-                    self.make_group("eyes", (col, row), f"eyes{f}_{color}")
-                    self.make_group("eyes2", (col, row), f"eyes2{f}_{color}")
+                for row, patches in enumerate(white_patches):
+                    for col, patch in enumerate(patches):
+                        self.make_group("whitepatches", (col, row), f"white{f}_{patch}")
 
-            # Define white patches
-            white_patches = [
-                [
-                    "FULLWHITE",
-                    "ANY",
-                    "TUXEDO",
-                    "LITTLE",
-                    "COLOURPOINT",
-                    "VAN",
-                    "ANYTWO",
-                    "MOON",
-                    "PHANTOM",
-                    "POWDER",
-                    "BLEACHED",
-                    "SAVANNAH",
-                    "FADESPOTS",
-                    "PEBBLESHINE",
-                ],
-                [
-                    "EXTRA",
-                    "ONEEAR",
-                    "BROKEN",
-                    "LIGHTTUXEDO",
-                    "BUZZARDFANG",
-                    "RAGDOLL",
-                    "LIGHTSONG",
-                    "VITILIGO",
-                    "BLACKSTAR",
-                    "PIEBALD",
-                    "CURVED",
-                    "PETAL",
-                    "SHIBAINU",
-                    "OWL",
-                ],
-                [
-                    "TIP",
-                    "FANCY",
-                    "FRECKLES",
-                    "RINGTAIL",
-                    "HALFFACE",
-                    "PANTSTWO",
-                    "GOATEE",
-                    "VITILIGOTWO",
-                    "PAWS",
-                    "MITAINE",
-                    "BROKENBLAZE",
-                    "SCOURGE",
-                    "DIVA",
-                    "BEARD",
-                ],
-                [
-                    "TAIL",
-                    "BLAZE",
-                    "PRINCE",
-                    "BIB",
-                    "VEE",
-                    "UNDERS",
-                    "HONEY",
-                    "FAROFA",
-                    "DAMIEN",
-                    "MISTER",
-                    "BELLY",
-                    "TAILTIP",
-                    "TOES",
-                    "TOPCOVER",
-                ],
-                [
-                    "APRON",
-                    "CAPSADDLE",
-                    "MASKMANTLE",
-                    "SQUEAKS",
-                    "STAR",
-                    "TOESTAIL",
-                    "RAVENPAW",
-                    "PANTS",
-                    "REVERSEPANTS",
-                    "SKUNK",
-                    "KARPATI",
-                    "HALFWHITE",
-                    "APPALOOSA",
-                    "DAPPLEPAW",
-                ],
-                [
-                    "HEART",
-                    "LILTWO",
-                    "GLASS",
-                    "MOORISH",
-                    "SEPIAPOINT",
-                    "MINKPOINT",
-                    "SEALPOINT",
-                    "MAO",
-                    "LUNA",
-                    "CHESTSPECK",
-                    "WINGS",
-                    "PAINTED",
-                    "HEARTTWO",
-                    "WOODPECKER",
-                ],
-                [
-                    "BOOTS",
-                    "MISS",
-                    "COW",
-                    "COWTWO",
-                    "BUB",
-                    "BOWTIE",
-                    "MUSTACHE",
-                    "REVERSEHEART",
-                    "SPARROW",
-                    "VEST",
-                    "LOVEBUG",
-                    "TRIXIE",
-                    "SAMMY",
-                    "SPARKLE",
-                ],
-                [
-                    "RIGHTEAR",
-                    "LEFTEAR",
-                    "ESTRELLA",
-                    "SHOOTINGSTAR",
-                    "EYESPOT",
-                    "REVERSEEYE",
-                    "FADEBELLY",
-                    "FRONT",
-                    "BLOSSOMSTEP",
-                    "PEBBLE",
-                    "TAILTWO",
-                    "BUDDY",
-                    "BACKSPOT",
-                    "EYEBAGS",
-                ],
-                [
-                    "BULLSEYE",
-                    "FINN",
-                    "DIGIT",
-                    "KROPKA",
-                    "FCTWO",
-                    "FCONE",
-                    "MIA",
-                    "SCAR",
-                    "BUSTER",
-                    "SMOKEY",
-                    "HAWKBLAZE",
-                    "CAKE",
-                    "ROSINA",
-                    "PRINCESS",
-                ],
-                ["LOCKET", "BLAZEMASK", "TEARS", "DOUGIE"],
-            ]
+                # Define colors and categories
+                color_categories = [
+                    ["WHITE", "PALEGREY", "SILVER", "GREY", "DARKGREY", "GHOST", "BLACK"],
+                    ["CREAM", "PALEGINGER", "GOLDEN", "GINGER", "DARKGINGER", "SIENNA"],
+                    ["LIGHTBROWN", "LILAC", "BROWN", "GOLDEN-BROWN", "DARKBROWN", "CHOCOLATE"],
+                ]
 
-            for row, patches in enumerate(white_patches):
-                for col, patch in enumerate(patches):
-                    self.make_group("whitepatches", (col, row), f"white{f}_{patch}")
+                color_types = [
+                    "singlecolours",
+                    "tabbycolours",
+                    "marbledcolours",
+                    "rosettecolours",
+                    "smokecolours",
+                    "tickedcolours",
+                    "speckledcolours",
+                    "bengalcolours",
+                    "mackerelcolours",
+                    "classiccolours",
+                    "sokokecolours",
+                    "agouticolours",
+                    "singlestripecolours",
+                    "maskedcolours",
+                ]
 
-            # Define colors and categories
-            color_categories = [
-                ["WHITE", "PALEGREY", "SILVER", "GREY", "DARKGREY", "GHOST", "BLACK"],
-                ["CREAM", "PALEGINGER", "GOLDEN", "GINGER", "DARKGINGER", "SIENNA"],
-                ["LIGHTBROWN", "LILAC", "BROWN", "GOLDEN-BROWN", "DARKBROWN", "CHOCOLATE"],
-            ]
+                for row, colors in enumerate(color_categories):
+                    for col, color in enumerate(colors):
+                        for color_type in color_types:
+                            self.make_group(color_type, (col, row), f"{color_type[:-7]}{f}_{color}")
+
+                # tortiepatchesmasks
+                tortiepatchesmasks = [
+                    [
+                        "ONE",
+                        "TWO",
+                        "THREE",
+                        "FOUR",
+                        "REDTAIL",
+                        "DELILAH",
+                        "HALF",
+                        "STREAK",
+                        "MASK",
+                        "SMOKE",
+                    ],
+                    [
+                        "MINIMALONE",
+                        "MINIMALTWO",
+                        "MINIMALTHREE",
+                        "MINIMALFOUR",
+                        "OREO",
+                        "SWOOP",
+                        "CHIMERA",
+                        "CHEST",
+                        "ARMTAIL",
+                        "GRUMPYFACE",
+                    ],
+                    [
+                        "MOTTLED",
+                        "SIDEMASK",
+                        "EYEDOT",
+                        "BANDANA",
+                        "PACMAN",
+                        "STREAMSTRIKE",
+                        "SMUDGED",
+                        "DAUB",
+                        "EMBER",
+                        "BRIE",
+                    ],
+                    [
+                        "ORIOLE",
+                        "ROBIN",
+                        "BRINDLE",
+                        "PAIGE",
+                        "ROSETAIL",
+                        "SAFI",
+                        "DAPPLENIGHT",
+                        "BLANKET",
+                        "BELOVED",
+                        "BODY",
+                    ],
+                    ["SHILOH", "FRECKLED", "HEARTBEAT"],
+                ]
 
-            color_types = [
-                "singlecolours",
-                "tabbycolours",
-                "marbledcolours",
-                "rosettecolours",
-                "smokecolours",
-                "tickedcolours",
-                "speckledcolours",
-                "bengalcolours",
-                "mackerelcolours",
-                "classiccolours",
-                "sokokecolours",
-                "agouticolours",
-                "singlestripecolours",
-                "maskedcolours",
-            ]
+                for row, masks in enumerate(tortiepatchesmasks):
+                    for col, mask in enumerate(masks):
+                        self.make_group("tortiepatchesmasks", (col, row), f"tortiemask{f}_{mask}")
 
-            for row, colors in enumerate(color_categories):
-                for col, color in enumerate(colors):
-                    for color_type in color_types:
-                        self.make_group(color_type, (col, row), f"{color_type[:-7]}{f}_{color}")
+                # Define skin colors
+                skin_colors = [
+                    ["BLACK", "RED", "PINK", "DARKBROWN", "BROWN", "LIGHTBROWN"],
+                    ["DARK", "DARKGREY", "GREY", "DARKSALMON", "SALMON", "PEACH"],
+                    ["DARKMARBLED", "MARBLED", "LIGHTMARBLED", "DARKBLUE", "BLUE", "LIGHTBLUE"],
+                ]
 
-            # tortiepatchesmasks
-            tortiepatchesmasks = [
-                [
-                    "ONE",
-                    "TWO",
-                    "THREE",
-                    "FOUR",
-                    "REDTAIL",
-                    "DELILAH",
-                    "HALF",
-                    "STREAK",
-                    "MASK",
-                    "SMOKE",
-                ],
-                [
-                    "MINIMALONE",
-                    "MINIMALTWO",
-                    "MINIMALTHREE",
-                    "MINIMALFOUR",
-                    "OREO",
-                    "SWOOP",
-                    "CHIMERA",
-                    "CHEST",
-                    "ARMTAIL",
-                    "GRUMPYFACE",
-                ],
-                [
-                    "MOTTLED",
-                    "SIDEMASK",
-                    "EYEDOT",
-                    "BANDANA",
-                    "PACMAN",
-                    "STREAMSTRIKE",
-                    "SMUDGED",
-                    "DAUB",
-                    "EMBER",
-                    "BRIE",
-                ],
-                [
-                    "ORIOLE",
-                    "ROBIN",
-                    "BRINDLE",
-                    "PAIGE",
-                    "ROSETAIL",
-                    "SAFI",
-                    "DAPPLENIGHT",
-                    "BLANKET",
-                    "BELOVED",
-                    "BODY",
-                ],
-                ["SHILOH", "FRECKLED", "HEARTBEAT"],
-            ]
+                for row, colors in enumerate(skin_colors):
+                    for col, color in enumerate(colors):
+                        self.make_group("skin", (col, row), f"skin{f}_{color}")
 
-            for row, masks in enumerate(tortiepatchesmasks):
-                for col, mask in enumerate(masks):
-                    self.make_group("tortiepatchesmasks", (col, row), f"tortiemask{f}_{mask}")
+                self.load_scars(f)
 
-            # Define skin colors
-            skin_colors = [
-                ["BLACK", "RED", "PINK", "DARKBROWN", "BROWN", "LIGHTBROWN"],
-                ["DARK", "DARKGREY", "GREY", "DARKSALMON", "SALMON", "PEACH"],
-                ["DARKMARBLED", "MARBLED", "LIGHTMARBLED", "DARKBLUE", "BLUE", "LIGHTBLUE"],
-            ]
+                self.load_timings[f] = time.perf_counter() - start
+                logger.info("Loaded sprite folder %s in %.3fs", f, self.load_timings[f])
+        finally:
+            # an error stops the sheets still being decoded
+            executor.shutdown(cancel_futures=True)
+        self.load_symbols()
 
-            for row, colors in enumerate(skin_colors):
-                for col, color in enumerate(colors):
-                    self.make_group("skin", (col, row), f"skin{f}_{color}")
+    def get_spritesheet_path(self, folder, name):
+        """
+        Returns the path of a spritesheet of a sprite folder.
 
-            self.load_scars(f)
-        self.load_symbols()
+        :param folder: Name of the sprite folder
+        :param name: Name of the spritesheet, one of SPRITESHEETS
+        """
+        if "lineart" in name and (
+            constants.CONFIG["fun"]["april_fools"] or is_today(SpecialDate.APRIL_FOOLS)
+        ):
+            return f"sprites/{folder}/aprilfools{name}.png"
+        return f"sprites/{folder}/{name}.png"
 
     def load_scars(self, f):
         """
@@ -724,6 +795,9 @@ class Sprites:
             ) as read_file:
                 self.symbol_dict = ujson.loads(read_file.read())
 
+        # loading the sprites again shouldn't list the symbols twice
+        self.clan_symbols.clear()
+
         # U and X omitted from letter list due to having no prefixes
         letters = [
             "A",
@@ -811,5 +885,9 @@ class Sprites:
         return recolored_symbol
 
 
+def _surface_bytes(surface: pygame.Surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
 # CREATE INSTANCE
 sprites = Sprites()
@@ -1,7 +1,7 @@
 from collections import defaultdict
 from itertools import groupby
-from random import choice
-from typing import TypedDict, Optional, List, Dict
+from scripts.game_structure.rng.generation import choice
+from typing import TypedDict, Optional, List, Dict, Callable
 
 from scripts.cat.enums import CatRank, CatSocial, CatStanding, CatAge, CatGroup
 from scripts.game_structure.game_essentials import game
@@ -53,6 +53,9 @@ class Status:
         standings with the group. Near is a bool with True indicating the cat is within interact-able distance of that 
         group."""
 
+        self.on_change: Optional[Callable[[], None]] = None
+        """Called whenever the group or rank changes, used by the cat to keep Cat's status index up to date"""
+
         # converting all the save info into enums
         for entry in self.group_history:
             entry["group"] = CatGroup(entry["group"]) if entry["group"] else None
@@ -145,6 +148,11 @@ class Status:
         )
 
         self._start_standing()
+        self._changed()
+
+    def _changed(self):
+        if self.on_change:
+            self.on_change()
 
     def _start_group_history(
         self,
@@ -375,6 +383,7 @@ class Status:
             self.change_standing(standing_with_past_group)
 
         self.group_history.append({"group": new_group, "rank": new_rank, "moons_as": 0})
+        self._changed()
 
         # add member standing for new group
         self.change_standing(CatStanding.MEMBER)
@@ -512,11 +521,13 @@ class Status:
                 self.group_history.remove(last_entry)
                 last_entry = self.group_history[-1]
             if last_entry["group"] == self.group and last_entry["rank"] == new_rank:
+                self._changed()
                 return
 
         self.group_history.append(
             {"group": self.group, "rank": new_rank, "moons_as": 0}
         )
+        self._changed()
 
     def change_group_nearness(self, group: CatGroup):
         """
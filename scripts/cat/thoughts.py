@@ -1,6 +1,6 @@
 import traceback
-from random import choice
-from typing import TYPE_CHECKING
+from scripts.game_structure.rng.events import choice, randrange
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
 import i18n
 
@@ -12,7 +12,75 @@ if TYPE_CHECKING:
     from scripts.cat.cats import Cat
 
 
+class ThoughtIndex:
+    """The thoughts of one or more thought files, bucketed by the constraints that are the
+    same for every cat of the same age, rank and lost state in the same moon. Only the
+    thoughts in a cat's bucket have to be checked against its other constraints."""
+
+    def __init__(self, thoughts: list):
+        self.thoughts = thoughts
+        self._buckets: Dict[tuple, list] = {}
+
+    def get_candidates(self, main_cat, random_cat, biome, season, camp) -> list:
+        """Returns the thoughts fitting the biome, season, camp and the main cat's age and
+        rank. They still need to be checked with cats_fulfill_thought_constraints."""
+        key = (
+            biome,
+            season,
+            camp,
+            main_cat.age,
+            main_cat.status.rank,
+            main_cat.status.is_lost(),
+            random_cat is None,
+        )
+        if key not in self._buckets:
+            self._buckets[key] = [
+                thought
+                for thought in self.thoughts
+                if self._fits_bucket(thought, main_cat, random_cat, biome, season, camp)
+            ]
+        return self._buckets[key]
+
+    @staticmethod
+    def _fits_bucket(thought, main_cat, random_cat, biome, season, camp) -> bool:
+        if "biome" in thought and biome not in thought["biome"]:
+            return False
+        if "season" in thought and season not in thought["season"]:
+            return False
+        if "camp" in thought and camp not in thought["camp"]:
+            return False
+        if not random_cat and any("r_c" in text for text in thought["thoughts"]):
+            return False
+        return event_for_cat(
+            {
+                "age": thought.get("main_age_constraint", []),
+                "status": thought.get("main_status_constraint", []),
+            },
+            main_cat,
+        )
+
+    def choose(self, main_cat, random_cat, game_mode, biome, season, camp):
+        """Returns a random thought that fulfills all constraints, or None if there is none.
+        Every such thought is as likely as when choosing from the full filtered list, but
+        the candidates are drawn in random order and only checked until one fits."""
+        candidates = list(
+            self.get_candidates(main_cat, random_cat, biome, season, camp)
+        )
+        for i in range(len(candidates)):
+            j = randrange(i, len(candidates))
+            candidates[i], candidates[j] = candidates[j], candidates[i]
+            if Thoughts.cats_fulfill_thought_constraints(
+                main_cat, random_cat, candidates[i], game_mode, biome, season, camp
+            ):
+                return candidates[i]
+        return None
+
+
 class Thoughts:
+    thought_indexes: Dict[Tuple[str, ...], ThoughtIndex] = {}
+    """Thought files: their index, for the language in index_lang"""
+    index_lang: Optional[str] = None
+
     @staticmethod
     def thought_fulfill_rel_constraints(main_cat, random_cat, constraint) -> bool:
         """Check if the relationship fulfills the interaction relationship constraints."""
@@ -300,7 +368,9 @@ class Thoughts:
         return created_list
 
     @staticmethod
-    def load_thoughts(main_cat, other_cat, game_mode, biome, season, camp):
+    def get_thought_index(main_cat) -> ThoughtIndex:
+        """Returns the index of the thoughts for the cat's rank and life state, building it
+        the first time it is needed in the current language."""
         rank = main_cat.status.rank
         rank = rank.replace(" ", "_")
 
@@ -322,26 +392,44 @@ class Thoughts:
             spec_dir = ""
 
         # newborns only pull from their status thoughts. this is done for convenience
-        try:
-            if main_cat.age == "newborn":
-                loaded_thoughts = load_lang_resource(
-                    f"thoughts/{life_dir}{spec_dir}/newborn.json"
-                )
-            else:
-                thoughts = load_lang_resource(
-                    f"thoughts/{life_dir}{spec_dir}/{rank}.json"
-                )
-                genthoughts = load_lang_resource(
-                    f"thoughts/{life_dir}{spec_dir}/general.json"
-                )
-                loaded_thoughts = thoughts + genthoughts
-
-            final_thoughts = Thoughts.create_thoughts(
-                loaded_thoughts, main_cat, other_cat, game_mode, biome, season, camp
+        if main_cat.age == "newborn":
+            locations = (f"thoughts/{life_dir}{spec_dir}/newborn.json",)
+        else:
+            locations = (
+                f"thoughts/{life_dir}{spec_dir}/{rank}.json",
+                f"thoughts/{life_dir}{spec_dir}/general.json",
             )
-            return final_thoughts
+
+        if Thoughts.index_lang != i18n.config.get("locale"):
+            Thoughts.thought_indexes = {}
+            Thoughts.index_lang = i18n.config.get("locale")
+
+        index = Thoughts.thought_indexes.get(locations)
+        if index is None:
+            loaded_thoughts = []
+            for location in locations:
+                loaded_thoughts += load_lang_resource(location)
+            index = ThoughtIndex(loaded_thoughts)
+            Thoughts.thought_indexes[locations] = index
+        return index
+
+    @staticmethod
+    def load_thoughts(main_cat, other_cat, game_mode, biome, season, camp):
+        try:
+            index = Thoughts.get_thought_index(main_cat)
         except IOError:
             print("ERROR: loading thoughts")
+            return None
+
+        return Thoughts.create_thoughts(
+            index.get_candidates(main_cat, other_cat, biome, season, camp),
+            main_cat,
+            other_cat,
+            game_mode,
+            biome,
+            season,
+            camp,
+        )
 
     @staticmethod
     def get_chosen_thought(main_cat, other_cat, game_mode, biome, season, camp):
@@ -353,11 +441,11 @@ class Thoughts:
             ).lower() == "rickastley":
                 return i18n.t("defaults.rickroll")
             else:
-                chosen_thought_group = choice(
-                    Thoughts.load_thoughts(
-                        main_cat, other_cat, game_mode, biome, season, camp
-                    )
+                chosen_thought_group = Thoughts.get_thought_index(main_cat).choose(
+                    main_cat, other_cat, game_mode, biome, season, camp
                 )
+                if chosen_thought_group is None:
+                    return i18n.t("defaults.thought")
                 chosen_thought = choice(chosen_thought_group["thoughts"])
         except Exception:
             traceback.print_exc()
@@ -0,0 +1,131 @@
+"""
+Families of the Clan as clusters of cats linked by blood or adoptive parents.
+
+The clusters are kept in a union-find (disjoint set) structure. A cluster is
+joined with another whenever a parent of a cat is set, so families only ever
+grow by merging and no cat's relatives have to be looked up again. Only cats
+currently in ``Cat.all_cats`` count as members of their family; cats that fade
+away stay in the structure to keep their relatives linked.
+
+Kits join the families of both their parents. ``Cat.get_relatives`` already
+reaches into both sides (grandparents, parents' siblings, cousins), so every
+cat's relatives are always in its family, and in a long-running Clan the two
+take in nearly the same living cats.
+"""
+
+import threading
+from typing import Dict, FrozenSet, Optional, Set
+
+
+class FamilyClusters:
+    """Union-find of the cats linked by parents, tracking the biggest family."""
+
+    def __init__(self):
+        self._parents: Dict[str, str] = {}
+        """cat ID: ID of the next cat towards the root of its cluster"""
+        self._members: Dict[str, Set[str]] = {}
+        """root ID: IDs of the cats of that cluster which are in all_cats"""
+        self._biggest: Optional[str] = None
+        """root of the biggest cluster"""
+        self._biggest_stale = False
+        """set when the biggest cluster lost a member and has to be looked for again"""
+        self._lock = threading.RLock()
+
+    def find(self, cat_id: str) -> str:
+        """Returns the root of the cluster the cat belongs to."""
+        with self._lock:
+            if cat_id not in self._parents:
+                self._parents[cat_id] = cat_id
+                self._members[cat_id] = set()
+                return cat_id
+
+            while self._parents[cat_id] != cat_id:
+                # path halving, every other cat on the way now points to its grandparent
+                self._parents[cat_id] = self._parents[self._parents[cat_id]]
+                cat_id = self._parents[cat_id]
+            return cat_id
+
+    def link(self, kit_id: str, parent_id: Optional[str]):
+        """Joins the families of a cat and its parent."""
+        if not parent_id:
+            return
+        with self._lock:
+            kit_root = self.find(kit_id)
+            parent_root = self.find(parent_id)
+            if kit_root == parent_root:
+                return
+
+            # keep the root of the bigger cluster, so few members have to be moved
+            if len(self._members[kit_root]) < len(self._members[parent_root]):
+                kit_root, parent_root = parent_root, kit_root
+            self._parents[parent_root] = kit_root
+            self._members[kit_root] |= self._members.pop(parent_root)
+
+            if self._biggest == parent_root:
+                self._biggest = kit_root
+            self._check_biggest(kit_root)
+
+    def add_cat(self, cat_id: str):
+        """Counts the cat as a member of its family, called when it is added to all_cats."""
+        with self._lock:
+            root = self.find(cat_id)
+            self._members[root].add(cat_id)
+            self._check_biggest(root)
+
+    def remove_cat(self, cat_id: str):
+        """Stops counting the cat as a member of its family, called when it is removed from all_cats."""
+        with self._lock:
+            if cat_id not in self._parents:
+                return
+            root = self.find(cat_id)
+            self._members[root].discard(cat_id)
+            if root == self._biggest:
+                self._biggest_stale = True
+
+    def clear(self):
+        with self._lock:
+            self._parents.clear()
+            self._members.clear()
+            self._biggest = None
+            self._biggest_stale = False
+
+    def family_of(self, cat_id: str) -> FrozenSet[str]:
+        """Returns the IDs of the cats in all_cats that are in the same family as the cat."""
+        with self._lock:
+            return frozenset(self._members[self.find(cat_id)])
+
+    def biggest_family(self) -> FrozenSet[str]:
+        """Returns the IDs of the cats of the biggest family."""
+        with self._lock:
+            root = self._get_biggest()
+            return frozenset(self._members[root]) if root is not None else frozenset()
+
+    def biggest_family_size(self) -> int:
+        with self._lock:
+            root = self._get_biggest()
+            return len(self._members[root]) if root is not None else 0
+
+    def in_biggest_family(self, cat_id: str) -> bool:
+        with self._lock:
+            root = self._get_biggest()
+            return root is not None and cat_id in self._members[root]
+
+    def _get_biggest(self) -> Optional[str]:
+        if self._biggest_stale:
+            self._biggest = max(
+                self._members, key=lambda root: len(self._members[root]), default=None
+            )
+            self._biggest_stale = False
+        return self._biggest
+
+    def _check_biggest(self, root: str):
+        """Makes the cluster the biggest one if it grew past the current biggest."""
+        if self._biggest_stale:
+            return
+        if self._biggest is None or len(self._members[root]) > len(
+            self._members[self._biggest]
+        ):
+            self._biggest = root
+
+
+family_clusters = FamilyClusters()
@@ -11,6 +11,7 @@ while mating and for the display of the family tree screen.
 import i18n
 from strenum import StrEnum  # pylint: disable=no-name-in-module
 
+from scripts.cat_relations.family_clusters import family_clusters
 from scripts.utility import adjust_list_text
 
 
@@ -33,6 +34,8 @@ BLOOD_RELATIVE_TYPES = [
 
 class Inheritance:
     all_inheritances = {}  # ID: object
+    # parent ID: {kit ID: kit}, kits whose parents changed since are kept
+    possible_children = {}
 
     def __init__(self, cat, born=False):
         self.need_update = False
@@ -90,7 +93,13 @@ class Inheritance:
         # mates
         self.init_mates()
 
-        for inter_id, inter_cat in self.cat.all_cats.items():
+        # only kits of the cat, of the parents, of the grandparents and of their kits
+        # can be kits, siblings, parents siblings or cousins
+        parents_siblings = self.get_possible_children(self.grand_parents)
+        possible_relatives = self.get_possible_children(
+            [self.cat.ID, *self.get_parents(), *self.grand_parents, *parents_siblings]
+        )
+        for inter_id, inter_cat in possible_relatives.items():
             if inter_id == self.cat.ID:
                 continue
 
@@ -107,7 +116,7 @@ class Inheritance:
             self.init_cousins(inter_id, inter_cat)
 
         # since grand kits depending on kits, ALL KITS HAVE TO BE SET FIRST!
-        for inter_id, inter_cat in self.cat.all_cats.items():
+        for inter_id, inter_cat in self.get_possible_children(self.kits).items():
             if inter_id == self.cat.ID:
                 continue
 
@@ -221,10 +230,32 @@ class Inheritance:
             and parent.ID not in self.cat.adoptive_parents
         ):
             self.cat.adoptive_parents.append(parent.ID)
+        self.add_possible_child(self.cat, parent.ID)
         self.all_involved.append(parent.ID)
         self.all_but_cousins.append(parent.ID)
         self.update_all_related_inheritance()
 
+    @staticmethod
+    def add_possible_child(kit, parent_id):
+        """Adds the kit to the possible children of the parent and joins their families.
+        Called whenever a parent of a cat is set."""
+        if parent_id:
+            Inheritance.possible_children.setdefault(parent_id, {})[kit.ID] = kit
+            family_clusters.link(kit.ID, parent_id)
+
+    def get_possible_children(self, parent_ids) -> dict:
+        """Returns the cats in all_cats that may be kits of one of the given cats, in all_cats
+        order. The cats still have to be checked, their parents could have changed since.
+
+        :param parent_ids: the IDs of the parents
+        """
+        kits = {}
+        for parent_id in parent_ids:
+            for kit_id, kit in self.possible_children.get(parent_id, {}).items():
+                if self.cat.all_cats.get(kit_id) is kit:
+                    kits[kit_id] = kit
+        return dict(sorted(kits.items(), key=lambda item: item[1].all_cats_order))
+
     # ---------------------------------------------------------------------------- #
     #                            different init function                           #
     # ---------------------------------------------------------------------------- #
@@ -493,8 +524,8 @@ class Inheritance:
                 }
                 self.other_mates.append(mate_id)
 
-            # iterate over all cats, to get the children of the sibling
-            for _c in self.cat.all_cats.values():
+            # iterate over the possible kits, to get the children of the sibling
+            for _c in self.get_possible_children([inter_id]).values():
                 _c_parents = self.get_parents(_c)
                 _c_adoptive = self.get_adoptive_parents(_c)
                 if inter_id in _c_parents:
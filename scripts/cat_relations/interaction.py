@@ -1,5 +1,9 @@
 import i18n
 
+from scripts.cat_relations.relationship_constraint import (
+    RelationshipConstraint,
+    get_relationship_constraint,
+)
 from scripts.game_structure.localization import load_lang_resource
 
 
@@ -35,9 +39,7 @@ class SingleInteraction:
         )
         self.get_injuries = get_injuries if get_injuries else {}
         self.has_injuries = has_injuries if has_injuries else {}
-        self.relationship_constraint = (
-            relationship_constraint if relationship_constraint else []
-        )
+        self.relationship_constraint = relationship_constraint
         self.backstory_constraint = backstory_constraint if backstory_constraint else {}
         self.main_status_constraint = (
             main_status_constraint if main_status_constraint else []
@@ -60,6 +62,18 @@ class SingleInteraction:
         self.reaction_random_cat = reaction_random_cat if reaction_random_cat else {}
         self.also_influences = also_influences if also_influences else {}
 
+    @property
+    def relationship_constraint(self) -> list:
+        return self._relationship_constraint
+
+    @relationship_constraint.setter
+    def relationship_constraint(self, constraint):
+        """Sets the constraint tags and compiles them."""
+        self._relationship_constraint = constraint if constraint else []
+        self.compiled_relationship_constraint = RelationshipConstraint(
+            self._relationship_constraint, f"interaction {self.id}"
+        )
+
 
 class GroupInteraction:
     def __init__(
@@ -92,9 +106,7 @@ class GroupInteraction:
         )
         self.get_injuries = get_injuries if get_injuries else {}
         self.has_injuries = has_injuries if has_injuries else {}
-        self.relationship_constraint = (
-            relationship_constraint if relationship_constraint else {}
-        )
+        self.relationship_constraint = relationship_constraint
         self.backstory_constraint = backstory_constraint if backstory_constraint else {}
         self.status_constraint = status_constraint if status_constraint else {}
         self.trait_constraint = trait_constraint if trait_constraint else {}
@@ -102,6 +114,19 @@ class GroupInteraction:
         self.specific_reaction = specific_reaction if specific_reaction else {}
         self.general_reaction = general_reaction if general_reaction else {}
 
+    @property
+    def relationship_constraint(self) -> dict:
+        return self._relationship_constraint
+
+    @relationship_constraint.setter
+    def relationship_constraint(self, constraint):
+        """Sets the constraint tags for each pair of cats and compiles them."""
+        self._relationship_constraint = constraint if constraint else {}
+        self.compiled_relationship_constraint = {
+            name: RelationshipConstraint(tags, f"group interaction {self.id}")
+            for name, tags in self._relationship_constraint.items()
+        }
+
 
 # ---------------------------------------------------------------------------- #
 #                some useful functions related to interactions                 #
@@ -109,116 +134,20 @@ class GroupInteraction:
 
 
 def rel_fulfill_rel_constraints(relationship, constraint, interaction_id) -> bool:
-    """Check if the relationship fulfills the interaction relationship constraints."""
+    """Check if the relationship fulfills the interaction relationship constraints.
+
+    :param Relationship relationship: The relationship to check
+    :param constraint: The constraint, either already compiled or a list of tags
+    :param str interaction_id: ID of the interaction, used when reporting a malformed constraint
+    """
     # if the constraints are not existing, they are considered to be fulfilled
     if not constraint:
         return True
-    if len(constraint) == 0:
-        return True
-
-    if "siblings" in constraint and not relationship.cat_from.is_sibling(
-        relationship.cat_to
-    ):
-        return False
-
-    if "mates" in constraint and (
-        relationship.cat_from.ID not in relationship.cat_to.mate
-        or relationship.cat_to.ID not in relationship.cat_from.mate
-    ):
-        return False
-
-    if "not_mates" in constraint and (
-        relationship.cat_from.ID in relationship.cat_to.mate
-        or relationship.cat_to.ID in relationship.cat_from.mate
-    ):
-        return False
-
-    if "parent/child" in constraint and not relationship.cat_from.is_parent(
-        relationship.cat_to
-    ):
-        return False
-
-    if "child/parent" in constraint and not relationship.cat_to.is_parent(
-        relationship.cat_from
-    ):
-        return False
-
-    value_types = [
-        "romantic",
-        "platonic",
-        "dislike",
-        "admiration",
-        "comfortable",
-        "jealousy",
-        "trust",
-    ]
-    for v_type in value_types:
-        tags = [i for i in constraint if v_type in i]
-        if len(tags) < 1:
-            continue
-        lower_than = False
-        # try to extract the value/threshold from the text
-        try:
-            splitted = tags[0].split("_")
-            threshold = int(splitted[1])
-            if len(splitted) >= 3:
-                lower_than = True
-        except:  # TODO: find out what this try-except is protecting against and explicitly guard for it
-            print(
-                f"ERROR: interaction {interaction_id} with the relationship constraint for "
-                f"the value {v_type} doesn't follow the formatting guidelines."
-            )
-            break
-
-        if threshold > 100:
-            print(
-                f"ERROR: interaction {interaction_id} has a relationship constraint for the value {v_type}, "
-                f"which is higher than the max value of a relationship (100)."
-            )
-            break
-        elif threshold <= 0:
-            print(
-                f"ERROR: interaction {interaction_id} has a relationship constraints for the value {v_type}, "
-                f"which is lower than the min value of a relationship or 0."
-            )
-            break
-
-        threshold_fulfilled = False
-        if v_type == "romantic":
-            if not lower_than and relationship.romantic_love >= threshold:
-                threshold_fulfilled = True
-            elif lower_than and relationship.romantic_love <= threshold:
-                threshold_fulfilled = True
-        if v_type == "platonic":
-            if not lower_than and relationship.platonic_like >= threshold:
-                threshold_fulfilled = True
-            elif lower_than and relationship.platonic_like <= threshold:
-                threshold_fulfilled = True
-        if v_type == "dislike":
-            if not lower_than and relationship.dislike >= threshold:
-                threshold_fulfilled = True
-            elif lower_than and relationship.dislike <= threshold:
-                threshold_fulfilled = True
-        if v_type == "comfortable":
-            if not lower_than and relationship.comfortable >= threshold:
-                threshold_fulfilled = True
-            elif lower_than and relationship.comfortable <= threshold:
-                threshold_fulfilled = True
-        if v_type == "jealousy":
-            if not lower_than and relationship.jealousy >= threshold:
-                threshold_fulfilled = True
-            elif lower_than and relationship.jealousy <= threshold:
-                threshold_fulfilled = True
-        if v_type == "trust":
-            if not lower_than and relationship.trust >= threshold:
-                threshold_fulfilled = True
-            elif lower_than and relationship.trust <= threshold:
-                threshold_fulfilled = True
-
-        if not threshold_fulfilled:
-            return False
-
-    return True
+    if not isinstance(constraint, RelationshipConstraint):
+        constraint = get_relationship_constraint(
+            constraint, f"interaction {interaction_id}"
+        )
+    return constraint.fulfilled_by(relationship)
 
 
 def cats_fulfill_single_interaction_constraints(
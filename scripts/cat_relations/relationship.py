@@ -1,5 +1,5 @@
-import random
-from random import choice
+from scripts.game_structure.rng import relationships as random
+from scripts.game_structure.rng.relationships import choice
 
 import i18n
 
@@ -39,6 +39,11 @@ class Relationship:
         trust=0,
         log=None,
     ) -> None:
+        self.virtual_in = None
+        """The RelationshipMap this relationship is still a default entry of, if any"""
+        self.dirty = True
+        """Set when the relationship changed since it was last saved"""
+        self._saved_log_length = 0
         self.chosen_interaction = None
         self.cat_from = cat_from
         self.cat_to = cat_to
@@ -63,6 +68,38 @@ class Relationship:
         self.jealousy = jealousy
         self.trust = trust
 
+    def needs_save(self) -> bool:
+        """Returns True if the relationship changed since it was last saved. Log entries are
+        appended directly to the list, so these are checked by length."""
+        return self.dirty or len(self.log) != self._saved_log_length
+
+    def mark_saved(self):
+        """Marks the relationship as written to the save."""
+        self.dirty = False
+        self._saved_log_length = len(self.log)
+
+    def is_default(self) -> bool:
+        """Returns True if the relationship has no values, flags or log entries at all."""
+        return not (
+            self.mates
+            or self.family
+            or self.log
+            or self.romantic_love
+            or self.platonic_like
+            or self.dislike
+            or self.admiration
+            or self.comfortable
+            or self.jealousy
+            or self.trust
+        )
+
+    def changed(self):
+        """Marks the relationship as changed. A default relationship is stored in its map from
+        here on."""
+        self.dirty = True
+        if self.virtual_in is not None:
+            self.virtual_in.materialize(self)
+
     def link_relationship(self):
         """Add the other relationship object to this easily access and change the other side."""
         if self.cat_from.ID in self.cat_to.relationships:
@@ -521,7 +558,7 @@ class Relationship:
                 continue
 
             relationship_fulfill_conditions = rel_fulfill_rel_constraints(
-                self, interact.relationship_constraint, interact.id
+                self, interact.compiled_relationship_constraint, interact.id
             )
             if not relationship_fulfill_conditions:
                 continue
@@ -629,6 +666,24 @@ class Relationship:
     #                                   property                                   #
     # ---------------------------------------------------------------------------- #
 
+    @property
+    def mates(self):
+        return self._mates
+
+    @mates.setter
+    def mates(self, value):
+        self.changed()
+        self._mates = value
+
+    @property
+    def family(self):
+        return self._family
+
+    @family.setter
+    def family(self, value):
+        self.changed()
+        self._family = value
+
     @property
     def romantic_love(self):
         return self._romantic_love
@@ -639,6 +694,7 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
+        self.changed()
         self._romantic_love = value
 
     @property
@@ -651,6 +707,7 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
+        self.changed()
         self._platonic_like = value
 
     @property
@@ -663,6 +720,7 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
+        self.changed()
         self._dislike = value
 
     @property
@@ -675,6 +733,7 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
+        self.changed()
         self._admiration = value
 
     @property
@@ -687,6 +746,7 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
+        self.changed()
         self._comfortable = value
 
     @property
@@ -699,6 +759,7 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
+        self.changed()
         self._jealousy = value
 
     @property
@@ -711,4 +772,5 @@ class Relationship:
             value = 100
         if value < 0:
             value = 0
+        self.changed()
         self._trust = value
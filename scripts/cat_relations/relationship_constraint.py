@@ -0,0 +1,182 @@
+"""
+Relationship constraints of interactions and events, such as ``"siblings"``,
+``"romantic_40"`` or ``"dislike_20_lower"``.
+
+The tags are parsed once into a RelationshipConstraint, when the interaction or
+event is loaded, instead of again for every relationship they are checked against.
+Constraints that don't follow the formatting guidelines are reported when they
+are parsed.
+"""
+
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+VALUE_ATTRIBUTES = {
+    "romantic": "romantic_love",
+    "platonic": "platonic_like",
+    "dislike": "dislike",
+    "admiration": "admiration",
+    "comfortable": "comfortable",
+    "jealousy": "jealousy",
+    "trust": "trust",
+}
+"""value type used in the tags: attribute of the relationship"""
+
+
+class RelationshipConstraint:
+    """A parsed list of relationship constraint tags."""
+
+    __slots__ = (
+        "tags",
+        "siblings",
+        "mates",
+        "not_mates",
+        "parent_child",
+        "child_parent",
+        "thresholds",
+        "malformed",
+    )
+
+    def __init__(self, constraint: Optional[Iterable[str]] = None, source: str = None):
+        """
+        :param constraint: The constraint tags, can be empty
+        :param source: What the constraint belongs to, e.g. "interaction some_id", used when
+            reporting a malformed constraint
+        """
+        self.tags: Tuple[str, ...] = tuple(constraint) if constraint else ()
+        self.siblings = "siblings" in self.tags
+        self.mates = "mates" in self.tags
+        self.not_mates = "not_mates" in self.tags
+        self.parent_child = "parent/child" in self.tags
+        self.child_parent = "child/parent" in self.tags
+
+        self.thresholds: Tuple[Tuple[str, int, bool], ...] = ()
+        """(relationship attribute, threshold, if the value has to be lower than the threshold)"""
+        self.malformed = False
+        """if a value constraint doesn't follow the formatting guidelines, the ones after it are ignored"""
+
+        thresholds = []
+        for value_type, attribute in VALUE_ATTRIBUTES.items():
+            tags = [tag for tag in self.tags if value_type in tag]
+            if not tags:
+                continue
+
+            if len(tags) > 1:
+                print(
+                    f"ERROR: {source} has multiple relationship constraints for the value {value_type}."
+                )
+                self.malformed = True
+                break
+
+            splitted = tags[0].split("_")
+            try:
+                threshold = int(splitted[1])
+            except (IndexError, ValueError):
+                print(
+                    f"ERROR: {source} with the relationship constraint for the value {value_type} "
+                    f"doesn't follow the formatting guidelines."
+                )
+                self.malformed = True
+                break
+
+            if threshold > 100:
+                print(
+                    f"ERROR: {source} has a relationship constraint for the value {value_type}, "
+                    f"which is higher than the max value of a relationship (100)."
+                )
+                self.malformed = True
+                break
+            if threshold <= 0:
+                print(
+                    f"ERROR: {source} has a relationship constraint for the value {value_type}, "
+                    f"which is lower than the min value of a relationship or 0."
+                )
+                self.malformed = True
+                break
+
+            thresholds.append((attribute, threshold, len(splitted) >= 3))
+        self.thresholds = tuple(thresholds)
+
+    def __bool__(self):
+        return bool(self.tags)
+
+    def family_fulfilled_by(self, relationship) -> bool:
+        """Check if the cats of the relationship are related the way the constraint needs."""
+        cat_from = relationship.cat_from
+        cat_to = relationship.cat_to
+        if self.siblings and not cat_from.is_sibling(cat_to):
+            return False
+        if self.mates and (
+            cat_from.ID not in cat_to.mate or cat_to.ID not in cat_from.mate
+        ):
+            return False
+        if self.not_mates and (
+            cat_from.ID in cat_to.mate or cat_to.ID in cat_from.mate
+        ):
+            return False
+        if self.parent_child and not cat_from.is_parent(cat_to):
+            return False
+        if self.child_parent and not cat_to.is_parent(cat_from):
+            return False
+        return True
+
+    def fulfilled_by(self, relationship) -> bool:
+        """Check if the relationship fulfills the constraint."""
+        for attribute, threshold, lower_than in self.thresholds:
+            value = getattr(relationship, attribute)
+            if value > threshold if lower_than else value < threshold:
+                return False
+        return self.family_fulfilled_by(relationship)
+
+    def filter_values(self, relationships: Iterable) -> List:
+        """Returns the relationships whose values fulfill the constraint, ignoring how the cats are related."""
+        relationships = list(relationships)
+        for attribute, threshold, lower_than in self.thresholds:
+            get_value = attrgetter(attribute)
+            if lower_than:
+                relationships = [
+                    rel for rel in relationships if get_value(rel) <= threshold
+                ]
+            else:
+                relationships = [
+                    rel for rel in relationships if get_value(rel) >= threshold
+                ]
+        return relationships
+
+    def filter(self, relationships: Iterable) -> List:
+        """
+        Returns the relationships that fulfill the constraint, keeping their order.
+        Each value is checked for all relationships at once, before the more costly family checks.
+        """
+        relationships = self.filter_values(relationships)
+        if (
+            self.siblings
+            or self.mates
+            or self.not_mates
+            or self.parent_child
+            or self.child_parent
+        ):
+            relationships = [
+                rel for rel in relationships if self.family_fulfilled_by(rel)
+            ]
+        return relationships
+
+
+_parsed_constraints: Dict[Tuple[str, ...], RelationshipConstraint] = {}
+
+
+def get_relationship_constraint(
+    constraint: Optional[Iterable[str]], source: str = None
+) -> RelationshipConstraint:
+    """
+    Returns the parsed constraint, for constraints that aren't parsed when they are loaded.
+    Every list of tags is only parsed (and reported if malformed) the first time it is seen.
+
+    :param constraint: The constraint tags, can be empty
+    :param source: What the constraint belongs to, used when reporting a malformed constraint
+    """
+    key = tuple(constraint) if constraint else ()
+    parsed = _parsed_constraints.get(key)
+    if parsed is None:
+        parsed = _parsed_constraints[key] = RelationshipConstraint(key, source)
+    return parsed
@@ -0,0 +1,157 @@
+"""
+Sparse storage for the relationships of one cat.
+
+Most relationships never leave their default values, so these are not kept as
+``Relationship`` objects. Such a default entry only remembers the other cat, and
+a ``Relationship`` is made when it is looked up. As soon as that relationship
+is changed (a stat, a flag or a new log entry), it is stored in the map like
+any other relationship.
+
+While a looked up default relationship is still referenced somewhere, the map
+hands out the same object again, so changes to it are never lost.
+"""
+
+import weakref
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, Optional, Tuple
+
+from scripts.cat_relations.relationship import Relationship
+
+
+class _DefaultLog(list):
+    """Log of a default relationship, adding an entry stores the relationship."""
+
+    def __init__(
+        self,
+        relationship_map: "RelationshipMap",
+        cat_id: str,
+        relationship: Relationship,
+    ):
+        super().__init__()
+        self.relationship_map = relationship_map
+        self.cat_id = cat_id
+        self.relationship = weakref.ref(relationship)
+
+    def _changed(self):
+        if self.relationship_map is not None:
+            self.relationship_map.log_changed(self)
+
+    def append(self, item):
+        self._changed()
+        super().append(item)
+
+    def extend(self, items):
+        self._changed()
+        super().extend(items)
+
+    def insert(self, index, item):
+        self._changed()
+        super().insert(index, item)
+
+    def __iadd__(self, items):
+        self._changed()
+        return super().__iadd__(items)
+
+
+class RelationshipMap(MutableMapping):
+    """The relationships of a cat, keyed by the ID of the other cat."""
+
+    def __init__(self, cat_from):
+        self.cat_from = cat_from
+        self._entries: Dict[str, object] = {}
+        """cat ID: Relationship, or the other cat for a default relationship"""
+        self._looked_up = weakref.WeakValueDictionary()
+        """default relationships handed out, which are not changed yet"""
+        self.keys_dirty = True
+        """Set when relationships were added or removed since the last save"""
+
+    def __getitem__(self, cat_id: str) -> Relationship:
+        entry = self._entries[cat_id]
+        if isinstance(entry, Relationship):
+            return entry
+
+        relationship = self._looked_up.get(cat_id)
+        if relationship is None:
+            relationship = Relationship(self.cat_from, entry)
+            relationship.mark_saved()
+            self._make_default(cat_id, relationship)
+        return relationship
+
+    def __setitem__(self, cat_id: str, relationship: Relationship):
+        self.keys_dirty = True
+        self._looked_up.pop(cat_id, None)
+        if relationship.is_default():
+            self._entries[cat_id] = relationship.cat_to
+            self._make_default(cat_id, relationship)
+        else:
+            relationship.virtual_in = None
+            self._entries[cat_id] = relationship
+
+    def __delitem__(self, cat_id: str):
+        del self._entries[cat_id]
+        self._looked_up.pop(cat_id, None)
+        self.keys_dirty = True
+
+    def __contains__(self, cat_id) -> bool:
+        return cat_id in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return f"RelationshipMap({self.cat_from.ID}: {len(self)} relationships, {self.stored_count()} stored)"
+
+    def set_default(self, cat_to):
+        """Adds a default relationship to the other cat, without making a Relationship for it."""
+        self.keys_dirty = True
+        if cat_to.ID in self._looked_up:
+            del self._looked_up[cat_to.ID]
+        self._entries[cat_to.ID] = cat_to
+
+    def materialize(self, relationship: Relationship):
+        """Stores a default relationship that was changed. Called by the relationship itself."""
+        relationship.virtual_in = None
+        cat_id = relationship.cat_to.ID
+        if self._looked_up.get(cat_id) is not relationship:
+            # replaced in the meantime, this one is not part of the map anymore
+            return
+        del self._looked_up[cat_id]
+        self._entries[cat_id] = relationship
+
+    def log_changed(self, log: _DefaultLog):
+        """Stores the relationship of a default log that gets its first entry. The relationship
+        itself may not be referenced anymore (``rels[cat_id].log.append(...)``)."""
+        log.relationship_map = None
+        relationship = log.relationship()
+        if relationship is None:
+            cat_to = self._entries.get(log.cat_id)
+            if cat_to is None or isinstance(cat_to, Relationship):
+                return
+            relationship = Relationship(self.cat_from, cat_to)
+            relationship.log = log
+            self._looked_up[log.cat_id] = relationship
+            relationship.virtual_in = self
+        if relationship.virtual_in is not None:
+            relationship.changed()
+
+    def stored(self) -> Iterator[Relationship]:
+        """All relationships that are not default ones."""
+        return (
+            entry for entry in self._entries.values() if isinstance(entry, Relationship)
+        )
+
+    def stored_count(self) -> int:
+        return sum(1 for _ in self.stored())
+
+    def sparse_items(self) -> Iterator[Tuple[str, Optional[Relationship]]]:
+        """All entries as (cat ID, relationship), the relationship is None for default ones."""
+        for cat_id, entry in self._entries.items():
+            yield cat_id, entry if isinstance(entry, Relationship) else None
+
+    def _make_default(self, cat_id: str, relationship: Relationship):
+        relationship.virtual_in = self
+        relationship.log = _DefaultLog(self, cat_id, relationship)
+        self._looked_up[cat_id] = relationship
@@ -0,0 +1,236 @@
+"""
+Single-file storage for the relationships of a whole Clan.
+
+Older saves keep one indented ``{ID}_relations.json`` per living cat inside the
+``relationships`` folder. The relationships are now packed into one compact
+``clan_relations.json`` instead:
+
+- ``cats``: table of every cat ID referenced, relations point into it by index
+- ``saved``: indices of the cats whose relationships were saved
+- ``relations``: flat list with ``RELATION_WIDTH`` entries per relationship,
+  (from, to, *stats, flags)
+- ``logs``: relationship logs, keyed by the row of their relationship
+
+Old saves are migrated transparently: if there is no store file, the per-cat
+files are read as before, and the next save replaces them with the store.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import ujson
+
+from scripts.game_structure.game.save_load import safe_save
+from scripts.housekeeping.datadir import get_save_dir
+
+STORE_FILE_NAME = "clan_relations.json"
+STORE_VERSION = 1
+
+STAT_FIELDS = (
+    "romantic_love",
+    "platonic_like",
+    "dislike",
+    "admiration",
+    "comfortable",
+    "jealousy",
+    "trust",
+)
+RELATION_WIDTH = 2 + len(STAT_FIELDS) + 1
+"""from index, to index, the stats and the flags"""
+
+FLAG_MATES = 1
+FLAG_FAMILY = 2
+
+DEFAULT_ROW = (0,) * (len(STAT_FIELDS) + 1)
+"""stats and flags of a relationship that was never changed"""
+
+_loaded_store = None
+"""(clan name, store) of the last store read from disk"""
+
+_packer = None
+"""(clan name, packer) used for the saves of the current Clan"""
+
+
+class RelationshipStore:
+    """Packed relationships of every saved cat of a Clan."""
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data if data else {}
+        self.cats: List[str] = data.get("cats", [])
+        self.saved: List[int] = data.get("saved", [])
+        self.relations: List = data.get("relations", [])
+        self.logs: Dict[str, List] = data.get("logs", {})
+
+        self._rows_by_cat: Optional[Dict[str, List[int]]] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": STORE_VERSION,
+            "cats": self.cats,
+            "saved": self.saved,
+            "relations": self.relations,
+            "logs": self.logs,
+        }
+
+    def get_relations_of(self, cat_id: str) -> Optional[List[Dict]]:
+        """Returns the relationships of the given cat in the same format as the old per-cat files,
+        or None if the cat's relationships were not saved."""
+        rows = self._get_rows_by_cat().get(cat_id)
+        if rows is None:
+            return None
+
+        rel_data = []
+        for row in rows:
+            start = row * RELATION_WIDTH
+            packed = self.relations[start : start + RELATION_WIDTH]
+            flags = packed[-1]
+            rel = {
+                "cat_from_id": cat_id,
+                "cat_to_id": self.cats[packed[1]],
+                "mates": bool(flags & FLAG_MATES),
+                "family": bool(flags & FLAG_FAMILY),
+                "log": self.logs.get(str(row), []),
+            }
+            rel.update(zip(STAT_FIELDS, packed[2:-1]))
+            rel_data.append(rel)
+        return rel_data
+
+    def _get_rows_by_cat(self) -> Dict[str, List[int]]:
+        """Indexes the rows of each saved cat, only done once per store."""
+        if self._rows_by_cat is None:
+            self._rows_by_cat = {self.cats[i]: [] for i in self.saved}
+            for row in range(len(self.relations) // RELATION_WIDTH):
+                cat_id = self.cats[self.relations[row * RELATION_WIDTH]]
+                self._rows_by_cat[cat_id].append(row)
+        return self._rows_by_cat
+
+
+class RelationshipPacker:
+    """Keeps the packed relationships of each cat between saves, so only the cats with
+    relationships that changed since the last save have to be packed again."""
+
+    def __init__(self):
+        self.cats: List[str] = []
+        self._cat_index: Dict[str, int] = {}
+        self._packed: Dict[str, Tuple[List, Dict[int, List]]] = {}
+        """cat ID: (packed relations, logs by row)"""
+        self.last_saved_ids: List[str] = []
+
+    def index_of(self, cat_id: str) -> int:
+        if cat_id not in self._cat_index:
+            self._cat_index[cat_id] = len(self.cats)
+            self.cats.append(cat_id)
+        return self._cat_index[cat_id]
+
+    def pack_cat(self, cat) -> bool:
+        """Packs the relationships of the cat. Returns False if none of them changed since
+        they were last packed, in which case the old packed relations are kept."""
+        relationships = cat.relationships
+        packed = self._packed.get(cat.ID)
+        if (
+            packed is not None
+            and not relationships.keys_dirty
+            and len(packed[0]) == len(relationships) * RELATION_WIDTH
+            and not any(rel.needs_save() for rel in relationships.stored())
+        ):
+            return False
+
+        from_index = self.index_of(cat.ID)
+        relations = []
+        logs = {}
+        for row, (cat_to_id, rel) in enumerate(relationships.sparse_items()):
+            relations.append(from_index)
+            relations.append(self.index_of(cat_to_id))
+            if rel is None:
+                # default relationship, only the other cat is known
+                relations.extend(DEFAULT_ROW)
+                continue
+            flags = (FLAG_MATES if rel.mates else 0) | (
+                FLAG_FAMILY if rel.family else 0
+            )
+            if rel.log:
+                logs[row] = rel.log
+            relations.extend(getattr(rel, stat) for stat in STAT_FIELDS)
+            relations.append(flags)
+            rel.mark_saved()
+        relationships.keys_dirty = False
+
+        self._packed[cat.ID] = (relations, logs)
+        return True
+
+    def make_store(self, cat_ids: List[str]) -> RelationshipStore:
+        """Joins the packed relations of the given cats into one store."""
+        store = RelationshipStore()
+        store.cats = self.cats
+        for cat_id in cat_ids:
+            relations, logs = self._packed[cat_id]
+            offset = len(store.relations) // RELATION_WIDTH
+            store.saved.append(self._cat_index[cat_id])
+            store.logs.update((str(offset + row), log) for row, log in logs.items())
+            store.relations.extend(relations)
+        return store
+
+
+def get_store_path(clanname: str) -> str:
+    return f"{get_save_dir()}/{clanname}/relationships/{STORE_FILE_NAME}"
+
+
+def save_relationships(clanname: str, cats: Iterable, full_save=False) -> int:
+    """Saves the relationships of all given cats into the single store file. Only cats
+    with changed relationships are packed again, unless full_save is True.
+
+    :return: the amount of cats whose relationships were unchanged
+    """
+    global _loaded_store, _packer
+
+    if full_save or _packer is None or _packer[0] != clanname:
+        _packer = (clanname, RelationshipPacker())
+    packer = _packer[1]
+
+    cat_ids = []
+    skipped = 0
+    for cat in cats:
+        cat_ids.append(cat.ID)
+        if not packer.pack_cat(cat):
+            skipped += 1
+
+    # nothing changed at all, the store on disk is still correct
+    if skipped == len(cat_ids) and cat_ids == packer.last_saved_ids:
+        return skipped
+
+    store = packer.make_store(cat_ids)
+    safe_save(get_store_path(clanname), ujson.dumps(store.to_dict()))
+    packer.last_saved_ids = cat_ids
+    _loaded_store = None
+    return skipped
+
+
+def get_clan_store(clanname: str) -> Optional[RelationshipStore]:
+    """Returns the relationship store of the Clan, reading it from disk only once.
+    Returns None if the Clan was not saved with a store yet (old save)."""
+    global _loaded_store
+
+    if _loaded_store is not None and _loaded_store[0] == clanname:
+        return _loaded_store[1]
+
+    store_path = get_store_path(clanname)
+    if not os.path.exists(store_path):
+        return None
+
+    try:
+        with open(store_path, "r", encoding="utf-8") as read_file:
+            store = RelationshipStore(ujson.loads(read_file.read()))
+    except (IOError, ujson.JSONDecodeError):
+        print(
+            f"WARNING: There was an error reading the relationship store {store_path}."
+        )
+        return None
+
+    _loaded_store = (clanname, store)
+    return store
+
+
+def clear_loaded_store():
+    """Drops the store read from disk, should be called once all cats are loaded."""
+    global _loaded_store
+    _loaded_store = None
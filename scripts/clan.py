@@ -10,7 +10,6 @@ TODO: Docs
 
 import os
 import statistics
-from random import choice, randint
 
 import pygame
 import ujson
@@ -20,6 +19,7 @@ from scripts.cat.enums import CatRank, CatGroup
 from scripts.cat.names import names
 from scripts.cat.save_load import save_cats
 from scripts.cat.sprites import sprites
+from scripts.cat_relations.family_clusters import family_clusters
 from scripts.clan_package.settings import save_clan_settings, load_clan_settings
 from scripts.clan_package.settings.clan_settings import reset_loaded_clan_settings
 from scripts.clan_resources.freshkill import FreshkillPile, Nutrition
@@ -27,13 +27,21 @@ from scripts.clan_resources.herb.herb_supply import HerbSupply
 from scripts.events_module.future.future_event import FutureEvent
 from scripts.events_module.generate_events import OngoingEvent
 from scripts.game_structure import constants
-from scripts.game_structure.game.save_load import safe_save, save_clanlist, read_clans
+from scripts.game_structure.game.save_load import (
+    safe_save,
+    safe_delete,
+    save_clanlist,
+    read_clans,
+    wait_for_save,
+)
 from scripts.game_structure.game.switches import (
     switch_set_value,
     switch_get_value,
     Switch,
 )
 from scripts.game_structure.game_essentials import game
+from scripts.game_structure.rng import random_streams
+from scripts.game_structure.rng.events import choice, randint
 from scripts.housekeeping.datadir import get_save_dir
 from scripts.housekeeping.version import get_version_info, SAVE_VERSION_NUMBER
 from scripts.utility import (
@@ -138,6 +146,9 @@ class Clan:
         self.faded_ids = []
         """Stores ID's of faded cats, to ensure these IDs aren't reused."""
 
+        self.rng_seed = random_streams.new_seed()
+        """Seeds the random number streams of the moon skips, see scripts/game_structure/rng"""
+
         if self_run_init_functions:
             self.post_initialization_functions()
 
@@ -291,7 +302,8 @@ class Clan:
             Cat.all_cats_list.remove(Cat.all_cats[ID])
 
         if ID in Cat.all_cats:
-            Cat.all_cats.pop(ID)
+            Cat.all_cats.pop(ID).drop_from_status_index()
+            family_clusters.remove_cat(ID)
 
         if ID in self.clan_cats:
             self.clan_cats.remove(ID)
@@ -397,6 +409,7 @@ class Clan:
             "version_commit": get_version_info().version_number,
             "source_build": get_version_info().is_source_build,
             "custom_pronouns": self.custom_pronouns,
+            "rng_seed": self.rng_seed,
         }
 
         # LEADER DATA
@@ -448,15 +461,15 @@ class Clan:
 
         safe_save(f"{get_save_dir()}/{self.name}clan.json", clan_data)
 
-        if os.path.exists(get_save_dir() + f"/{self.name}clan.txt") & (
-            self.name != "current"
-        ):
-            os.remove(get_save_dir() + f"/{self.name}clan.txt")
+        if self.name != "current":
+            safe_delete(get_save_dir() + f"/{self.name}clan.txt")
 
     def load_clan(self):
         """
         TODO: DOCS
         """
+        # don't read a save that is still being written
+        wait_for_save()
 
         version_info = None
         if os.path.exists(
@@ -712,6 +725,8 @@ class Clan:
         game.clan.reputation = max(0, min(100, int(clan_data["reputation"])))
 
         game.clan.age = clan_data["clanage"]
+        if "rng_seed" in clan_data:
+            game.clan.rng_seed = clan_data["rng_seed"]
         game.clan.starting_season = (
             clan_data["starting_season"]
             if "starting_season" in clan_data
@@ -1078,8 +1093,7 @@ class Clan:
         )
 
         # delete old herb save file if it exists
-        if os.path.exists(get_save_dir() + f"/{game.clan.name}/herbs.json"):
-            os.remove(get_save_dir() + f"/{game.clan.name}/herbs.json")
+        safe_delete(get_save_dir() + f"/{game.clan.name}/herbs.json")
 
     def load_freshkill_pile(self, clan):
         """
@@ -1269,8 +1283,9 @@ class OtherClan:
     )
 
     def __init__(self, name="", relations=0, temperament="", chosen_symbol=""):
-        clan_names = names.names_dict["normal_prefixes"]
-        clan_names.extend(names.names_dict["clan_prefixes"])
+        clan_names = (
+            names.names_dict["normal_prefixes"] + names.names_dict["clan_prefixes"]
+        )
         self.name = name or choice(clan_names)
         self.relations = relations or randint(8, 12)
         self.temperament = temperament or choice(self.temperament_list)
@@ -1,4 +1,4 @@
-import random
+from scripts.game_structure.rng import events as random
 from copy import deepcopy
 from typing import List
 
@@ -85,8 +85,10 @@ class FreshkillPile:
             self.total_amount = game.prey_config["start_amount"]
         self.nutrition_info = {}
         self.living_cats = []
-        self.already_fed = []
+        self.already_fed = set()
         self.needed_prey = 0
+        self._round_needed_prey = None
+        """the prey the clan needs, while feed_cats is feeding it"""
 
     def add_freshkill(self, amount) -> None:
         """
@@ -193,9 +195,9 @@ class FreshkillPile:
                 event_list.append(i18n.t("hardcoded.expired_prey", count=amount))
         self.total_amount = sum(self.pile.values())
         value_diff = self.total_amount
-        self.already_fed = []
+        self.already_fed = set()
         self.feed_cats(living_cats)
-        self.already_fed = []
+        self.already_fed = set()
         value_diff -= sum(self.pile.values())
         event_list.append(i18n.t("hardcoded.consumed_prey", count=value_diff))
         self._update_needed_food(living_cats)
@@ -211,6 +213,14 @@ class FreshkillPile:
             :param additional_food_round: Whether this is a manual feeding from the freshkill pile, default False
         """
         self.update_nutrition(living_cats)
+        # feeding the cats doesn't change how much prey the clan needs, so it is only counted once
+        self._round_needed_prey = self.amount_food_needed()
+        try:
+            self._feed_by_tactic(living_cats, additional_food_round)
+        finally:
+            self._round_needed_prey = None
+
+    def _feed_by_tactic(self, living_cats: list, additional_food_round=False) -> None:
         # NOTE: this is for testing purposes
         if not game.clan:
             self.tactic_status(living_cats, additional_food_round)
@@ -243,6 +253,12 @@ class FreshkillPile:
         self._update_needed_food(living_cats)
         return self.needed_prey
 
+    def _get_needed_prey(self):
+        """Like amount_food_needed, but only counted once while feed_cats is feeding the clan."""
+        if self._round_needed_prey is None:
+            return self.amount_food_needed()
+        return self._round_needed_prey
+
     def clan_has_enough_food(self) -> bool:
         """Check if the amount of the prey is enough for one moon
 
@@ -278,19 +294,21 @@ class FreshkillPile:
             for cat in living_cats
             if "pregnant" in cat.injuries and cat.ID not in queen_dict.keys()
         ]
+        fed_kit_set = set(fed_kits)
+        queens_and_pregnant = set(relevant_queens).union(pregnant_cats)
 
         for feeding_status in FEEDING_ORDER:
             if feeding_status == CatRank.NEWBORN:
                 relevant_group = [
                     cat
                     for cat in living_cats
-                    if cat.status.rank == CatRank.NEWBORN and cat not in fed_kits
+                    if cat.status.rank == CatRank.NEWBORN and cat not in fed_kit_set
                 ]
             elif feeding_status == CatRank.KITTEN:
                 relevant_group = [
                     cat
                     for cat in living_cats
-                    if cat.status.rank == CatRank.KITTEN and cat not in fed_kits
+                    if cat.status.rank == CatRank.KITTEN and cat not in fed_kit_set
                 ]
             elif feeding_status == "queen/pregnant":
                 relevant_group = relevant_queens + pregnant_cats
@@ -300,9 +318,7 @@ class FreshkillPile:
                 ]
                 # remove all cats, which are also queens / pregnant
                 relevant_group = [
-                    cat
-                    for cat in relevant_group
-                    if cat not in relevant_queens and cat not in pregnant_cats
+                    cat for cat in relevant_group if cat not in queens_and_pregnant
                 ]
 
             if len(relevant_group) == 0:
@@ -377,38 +393,34 @@ class FreshkillPile:
         # use living_cats to fetch cat for testing
         fetch_cat = living_cats[0]
 
-        # first feed the cats with the lowest nutrition
-        for cat_id, v in sorted_nutrition.items():
+        # plan how much each cat gets, then feed them with the lowest nutrition first
+        fed_kit_set = set(fed_kits)
+        pregnant_set = set(pregnant_cats)
+        cruel_season = game.clan and game.clan.game_mode == "cruel season"
+        plan = []
+        for cat_id, nutrition in sorted_nutrition.items():
             cat = Cat.all_cats[cat_id]
             rank = cat.status.rank
             # check if this is a kit: if so, check if they are fed by the mother
-            if rank.is_baby() and cat in fed_kits:
+            if rank.is_baby() and cat in fed_kit_set:
                 continue
 
             # check for queens / pregnant
-            if cat.ID in queen_dict.keys() or cat in pregnant_cats:
+            if cat.ID in queen_dict or cat in pregnant_set:
                 rank = "queen/pregnant"
-            feeding_amount = PREY_REQUIREMENT[rank]
-            needed_amount = feeding_amount
-
-            # check for condition
-            if "pregnant" not in cat.injuries and cat.not_working():
-                if game.clan and game.clan.game_mode == "cruel season":
-                    feeding_amount += CONDITION_INCREASE
-                needed_amount = feeding_amount
-            else:
-                if ration_prey and rank == CatRank.WARRIOR:
-                    feeding_amount = feeding_amount / 2
+            plan.append(
+                (
+                    cat,
+                    *self._get_feeding_amounts(cat, rank, ration_prey, cruel_season),
+                    nutrition.percentage,
+                )
+            )
 
-            if (
-                self.amount_food_needed() < self.total_amount * 1.2
-                and self.nutrition_info[cat.ID].percentage < 100
-            ):
+        needed_prey = self._get_needed_prey() if plan else 0
+        for cat, feeding_amount, needed_amount, percentage in plan:
+            if needed_prey < self.total_amount * 1.2 and percentage < 100:
                 feeding_amount += 1
-            elif (
-                self.amount_food_needed() < self.total_amount
-                and self.nutrition_info[cat.ID].percentage < 100
-            ):
+            elif needed_prey < self.total_amount and percentage < 100:
                 feeding_amount += 0.5
 
             if additional_food_round:
@@ -494,58 +506,75 @@ class FreshkillPile:
         if len(group) == 0:
             return
 
-        # first split nutrition information into low nutrition and satisfied
+        # plan how much each cat gets, then feed them in the order of the group
         ration_prey = get_clan_setting("ration prey")
-
-        # first feed the cats with the lowest nutrition
+        cruel_season = game.clan and game.clan.game_mode == "cruel season"
+        fed_kit_set = set(fed_kits) if fed_kits else set()
+        plan = []
         for cat in group:
             if cat in self.already_fed:
                 continue
             rank = cat.status.rank
             # check if this is a kit: if so, check if they are fed by the mother
-            if rank.is_baby() and fed_kits and cat in fed_kits:
+            if rank.is_baby() and cat in fed_kit_set:
                 continue
 
             # check for queens / pregnant
             if queens_only:
                 rank = "queen/pregnant"
-            feeding_amount = PREY_REQUIREMENT[rank]
-            needed_amount = feeding_amount
+            plan.append(
+                (
+                    cat,
+                    *self._get_feeding_amounts(cat, rank, ration_prey, cruel_season),
+                    self.nutrition_info[cat.ID].percentage,
+                )
+            )
+        if not plan:
+            return
 
-            # check for condition
-            if "pregnant" not in cat.injuries and cat.not_working():
-                if game.clan and game.clan.game_mode == "cruel season":
-                    feeding_amount += CONDITION_INCREASE
-                needed_amount = feeding_amount
-            else:
-                if ration_prey and rank == CatRank.WARRIOR:
-                    feeding_amount = feeding_amount / 2
-
-            if (
-                self.total_amount * 2 > self.amount_food_needed()
-                and self.nutrition_info[cat.ID].percentage < 100
-            ):
-                feeding_amount += 2
-            if (
-                self.total_amount * 1.8 > self.amount_food_needed()
-                and self.nutrition_info[cat.ID].percentage < 100
-            ):
-                feeding_amount += 1.5
-            elif (
-                self.total_amount * 1.2 > self.amount_food_needed()
-                and self.nutrition_info[cat.ID].percentage < 100
-            ):
-                feeding_amount += 1
-            elif (
-                self.total_amount > self.amount_food_needed()
-                and self.nutrition_info[cat.ID].percentage < 100
-            ):
-                feeding_amount += 0.5
+        needed_prey = self._get_needed_prey()
+        for cat, feeding_amount, needed_amount, percentage in plan:
+            # a cat can be in the group twice
+            if cat in self.already_fed:
+                continue
+
+            # the pile shrinks with every cat, so the bonus can too
+            if percentage < 100:
+                if self.total_amount * 2 > needed_prey:
+                    feeding_amount += 2
+                if self.total_amount * 1.8 > needed_prey:
+                    feeding_amount += 1.5
+                elif self.total_amount * 1.2 > needed_prey:
+                    feeding_amount += 1
+                elif self.total_amount > needed_prey:
+                    feeding_amount += 0.5
 
             if additional_food_round:
                 needed_amount = 0
             self.feed_cat(cat, feeding_amount, needed_amount)
 
+    @staticmethod
+    def _get_feeding_amounts(cat: Cat, rank, ration_prey, cruel_season) -> tuple:
+        """Returns how much prey the cat is given and how much it needs, before any bonus for a
+        well stocked pile.
+
+        :param Cat cat: Cat to feed
+        :param rank: Rank the requirement is looked up for, can be "queen/pregnant"
+        :param bool ration_prey: If the "ration prey" setting is on
+        :param bool cruel_season: If the clan plays in cruel season mode
+        """
+        feeding_amount = PREY_REQUIREMENT[rank]
+        needed_amount = feeding_amount
+
+        # check for condition
+        if "pregnant" not in cat.injuries and cat.not_working():
+            if cruel_season:
+                feeding_amount += CONDITION_INCREASE
+            needed_amount = feeding_amount
+        elif ration_prey and rank == CatRank.WARRIOR:
+            feeding_amount = feeding_amount / 2
+        return feeding_amount, needed_amount
+
     def feed_cat(self, cat: Cat, amount, actual_needed) -> None:
         """
         Handle the feeding process.
@@ -565,7 +594,7 @@ class FreshkillPile:
         order = ["expires_in_1", "expires_in_2", "expires_in_3", "expires_in_4"]
         for key in order:
             remaining_amount = self.take_from_pile(key, remaining_amount)
-        self.already_fed.append(cat)
+        self.already_fed.add(cat)
 
         if remaining_amount > 0 and amount_difference == 0:
             self.nutrition_info[cat.ID].current_score -= remaining_amount
@@ -1,4 +1,4 @@
-from random import choice, randint, choices
+from scripts.game_structure.rng.events import choice, randint, choices
 
 import i18n
 
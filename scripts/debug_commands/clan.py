@@ -4,6 +4,7 @@ from scripts.cat.cats import Cat
 from scripts.cat.save_load import save_cats
 from scripts.debug_commands.command import Command
 from scripts.debug_commands.utils import add_output_line_to_log
+from scripts.game_structure.game.save_load import save_transaction
 from scripts.game_structure.game.settings import game_settings_save
 from scripts.game_structure.game.switches import (
     switch_set_value,
@@ -25,11 +26,12 @@ class ReloadClanCommand(Command):
             switch_set_value(Switch.switch_clan, True)
             add_output_line_to_log("Reload successful!")
         elif len(args) > 0 and args[0] == "save":
-            save_cats(switch_get_value(Switch.clan_name), Cat, game)
-            game.clan.save_clan()
-            game.clan.save_pregnancy(game.clan)
-            game.save_events()
-            game_settings_save(game.current_screen)
+            with save_transaction(wait=True):
+                save_cats(switch_get_value(Switch.clan_name), Cat, game, full_save=True)
+                game.clan.save_clan()
+                game.clan.save_pregnancy(game.clan)
+                game.save_events()
+                game_settings_save(game.current_screen)
             game.all_screens[game.current_screen].change_screen(game.current_screen)
             switch_set_value(Switch.switch_clan, True)
             add_output_line_to_log("Reload successful!")
@@ -0,0 +1,95 @@
+import os
+from typing import List
+
+from scripts.debug_commands.command import Command
+from scripts.debug_commands.utils import add_output_line_to_log
+from scripts.events_module.moon_profiler import moon_profiler, REPORT_SORT_KEYS
+from scripts.housekeeping.datadir import get_log_dir
+
+
+class ProfileOnCommand(Command):
+    name = "on"
+    description = "Start recording the timings of moon skips"
+
+    def callback(self, args: List[str]):
+        moon_profiler.enabled = True
+        add_output_line_to_log("Moon skips will be profiled")
+
+
+class ProfileOffCommand(Command):
+    name = "off"
+    description = "Stop recording the timings of moon skips, keeping what was recorded"
+
+    def callback(self, args: List[str]):
+        moon_profiler.enabled = False
+        add_output_line_to_log("Moon skips will not be profiled anymore")
+
+
+class ProfileResetCommand(Command):
+    name = "reset"
+    description = "Forget the recorded timings"
+
+    def callback(self, args: List[str]):
+        moon_profiler.reset()
+        add_output_line_to_log("Recorded timings cleared")
+
+
+class ProfileReportCommand(Command):
+    name = "report"
+    description = "Show the recorded timings of the phases and the slowest cats"
+    aliases = ["r"]
+    usage = f"[{'|'.join(REPORT_SORT_KEYS)}] [count]"
+
+    def callback(self, args: List[str]):
+        if not moon_profiler.moons:
+            add_output_line_to_log("No moon skips recorded, use 'profile on' first")
+            return
+        sort = args[0].lower() if len(args) > 0 else "total"
+        if sort not in REPORT_SORT_KEYS:
+            add_output_line_to_log(f"Invalid sort, {sort}")
+            return
+        if len(args) > 1 and not args[1].isnumeric():
+            add_output_line_to_log(f"Invalid count, {args[1]}")
+            return
+        limit = int(args[1]) if len(args) > 1 else 20
+        for line in moon_profiler.report(sort, limit):
+            add_output_line_to_log(line)
+
+
+class ProfileSaveCommand(Command):
+    name = "save"
+    description = "Save the recorded timings as collapsed stacks for flamegraph tools"
+    aliases = ["s"]
+    usage = "[path]"
+
+    def callback(self, args: List[str]):
+        if not moon_profiler.moons:
+            add_output_line_to_log("No moon skips recorded, use 'profile on' first")
+            return
+        path = args[0] if args else os.path.join(get_log_dir(), "moon_profile.folded")
+        try:
+            moon_profiler.write_collapsed_stacks(path)
+        except OSError as e:
+            add_output_line_to_log(f"Unable to save timings: {e}")
+            return
+        add_output_line_to_log(f"Saved timings to {path}")
+
+
+class ProfileCommand(Command):
+    name = "profile"
+    description = "Profile moon skips"
+    aliases = ["prof"]
+
+    sub_commands = [
+        ProfileOnCommand(),
+        ProfileOffCommand(),
+        ProfileResetCommand(),
+        ProfileReportCommand(),
+        ProfileSaveCommand(),
+    ]
+
+    def callback(self, args: List[str]):
+        add_output_line_to_log(
+            f"Profiling is {'on' if moon_profiler.enabled else 'off'}, "
+            f"{moon_profiler.moons} moon skip(s) recorded"
+        )
@@ -6,8 +6,6 @@ TODO: Docs
 
 """
 
-import random
-
 # pylint: enable=line-too-long
 import traceback
 
@@ -16,8 +14,10 @@ import i18n
 from scripts.cat import save_load
 from scripts.cat.cats import Cat, cat_class, BACKSTORIES
 from scripts.cat.enums import CatAge, CatRank, CatGroup, CatStanding, CatSocial
-from scripts.cat.names import Name
+from scripts.cat.infections import infection_tracker
+from scripts.cat.names import Name, names
 from scripts.cat.save_load import save_cats
+from scripts.cat_relations.relationship import Relationship
 from scripts.clan_package.settings import get_clan_setting, set_clan_setting
 from scripts.clan_resources.freshkill import FRESHKILL_EVENT_ACTIVE
 from scripts.conditions import (
@@ -26,6 +26,7 @@ from scripts.conditions import (
 )
 from scripts.event_class import Single_Event
 from scripts.events_module.generate_events import GenerateEvents, generate_events
+from scripts.events_module.moon_profiler import moon_profiler, profiled
 from scripts.events_module.outsider_events import OutsiderEvents
 from scripts.events_module.patrol.patrol import Patrol
 from scripts.events_module.relationship.pregnancy_events import Pregnancy_Events
@@ -33,6 +34,7 @@ from scripts.events_module.relationship.relation_events import Relation_Events
 from scripts.events_module.short.condition_events import Condition_Events
 from scripts.events_module.short.handle_short_events import handle_short_events
 from scripts.game_structure import constants
+from scripts.game_structure.game.save_load import save_transaction, wait_for_save
 from scripts.game_structure.game.switches import (
     Switch,
     switch_get_value,
@@ -40,6 +42,8 @@ from scripts.game_structure.game.switches import (
 )
 from scripts.game_structure.game_essentials import game
 from scripts.game_structure.localization import load_lang_resource
+from scripts.game_structure.rng import events as random
+from scripts.game_structure.rng import random_streams
 from scripts.game_structure.windows import SaveError
 from scripts.utility import (
     change_clan_relations,
@@ -78,6 +82,13 @@ class Events:
         """
         Handles the moon skipping of the whole Clan.
         """
+        # the Clan's files shouldn't change while the last save is still moving them into place
+        wait_for_save(raise_error=False)
+        with moon_profiler.moon():
+            self._one_moon()
+
+    def _one_moon(self):
+        random_streams.seed_streams(game.clan.rng_seed, game.clan.age)
         game.cur_events_list = []
         game.herb_events_list = []
         game.freshkill_events_list = []
@@ -85,13 +96,16 @@ class Events:
         switch_set_value(Switch.saved_clan, False)
         self.new_cat_invited = False
         Relation_Events.clear_trigger_dict()
+        # these aren't saved, so they can't carry over into the next moon either
+        Relationship.used_interaction_ids.clear()
+        names.prefix_history.clear()
         Patrol.used_patrols.clear()
         game.patrolled.clear()
         game.just_died.clear()
 
         if any(
-            cat.status.rank.is_active_clan_rank() and cat.status.alive_in_player_clan
-            for cat in Cat.all_cats.values()
+            cat.status.rank.is_active_clan_rank()
+            for cat in Cat.fetch_living_clan_cats()
         ):
             # todo: this links nowhere, can it be removed?
             switch_set_value(Switch.no_able_left, False)
@@ -100,145 +114,154 @@ class Events:
         game.clan.age += 1
         get_current_season()
         Pregnancy_Events.handle_pregnancy_age(game.clan)
-        self.check_war()
+        with moon_profiler.phase("war"):
+            self.check_war()
 
         if (
             game.clan.game_mode in ("expanded", "cruel season")
             and game.clan.freshkill_pile
         ):
-            # feed the cats and update the nutrient status
-            relevant_cats = list(
-                filter(
-                    lambda _cat: _cat.status.alive_in_player_clan,
-                    Cat.all_cats.values(),
+            with moon_profiler.phase("freshkill"):
+                # feed the cats and update the nutrient status
+                relevant_cats = Cat.fetch_living_clan_cats()
+                game.clan.freshkill_pile.time_skip(
+                    relevant_cats, game.freshkill_event_list
                 )
-            )
-            game.clan.freshkill_pile.time_skip(relevant_cats, game.freshkill_event_list)
-            # get the moonskip freshkill
-            self.get_moon_freshkill()
+                # get the moonskip freshkill
+                self.get_moon_freshkill()
 
         # Adding in any potential lead den events that have been saved
         if get_clan_setting("lead_den_interaction"):
-            self.handle_lead_den_event()
+            with moon_profiler.phase("lead_den_events"):
+                self.handle_lead_den_event()
 
         # checking if a lost cat returns on their own
         rejoin_upperbound = constants.CONFIG["lost_cat"]["rejoin_chance"]
         if random.randint(1, rejoin_upperbound) == 1:
-            self.handle_lost_cats_return()
+            with moon_profiler.phase("lost_cats_return"):
+                self.handle_lost_cats_return()
 
-        self.handle_future_events()
+        with moon_profiler.phase("future_events"):
+            self.handle_future_events()
 
         # Calling of "one_moon" functions.
-        for cat in Cat.all_cats.copy().values():
-            if not cat.status.group:
-                self.one_moon_outside_cat(cat)
-            elif cat.status.alive_in_player_clan or cat.status.group.is_afterlife():
-                self.one_moon_cat(cat)
+        with moon_profiler.phase("cats"):
+            for cat in Cat.all_cats.copy().values():
+                if not cat.status.group:
+                    with moon_profiler.phase("one_moon_outside_cat", cat):
+                        self.one_moon_outside_cat(cat)
+                elif cat.status.alive_in_player_clan or cat.status.group.is_afterlife():
+                    with moon_profiler.phase("one_moon_cat", cat):
+                        self.one_moon_cat(cat)
 
         # keeping this commented out till disasters are more polished
         # self.disaster_events.handle_disasters()
 
         # Handle grief events.
-        if Cat.grief_strings:
-            # Grab all the dead or outside cats, who should not have grief text
-            for ID in Cat.grief_strings.copy():
-                check_cat = Cat.all_cats.get(ID)
-                if isinstance(check_cat, Cat):
-                    if check_cat.dead or not check_cat.status.alive_in_player_clan:
-                        Cat.grief_strings.pop(ID)
-
-            # Generate events
-
-            for cat_id, values in Cat.grief_strings.items():
-                for _val in values:
-                    if _val[2] == "minor":
-                        # Apply the grief message as a thought to the cat
-                        text = event_text_adjust(
-                            Cat,
-                            _val[0],
-                            main_cat=Cat.fetch_cat(cat_id),
-                            random_cat=Cat.fetch_cat(_val[1][0]),
-                        )
+        with moon_profiler.phase("grief"):
+            if Cat.grief_strings:
+                # Grab all the dead or outside cats, who should not have grief text
+                for ID in Cat.grief_strings.copy():
+                    check_cat = Cat.all_cats.get(ID)
+                    if isinstance(check_cat, Cat):
+                        if check_cat.dead or not check_cat.status.alive_in_player_clan:
+                            Cat.grief_strings.pop(ID)
+
+                # Generate events
+
+                for cat_id, values in Cat.grief_strings.items():
+                    for _val in values:
+                        if _val[2] == "minor":
+                            # Apply the grief message as a thought to the cat
+                            text = event_text_adjust(
+                                Cat,
+                                _val[0],
+                                main_cat=Cat.fetch_cat(cat_id),
+                                random_cat=Cat.fetch_cat(_val[1][0]),
+                            )
 
-                        Cat.fetch_cat(cat_id).thought = text
-                    else:
-                        game.cur_events_list.append(
-                            Single_Event(_val[0], ["birth_death", "relation"], _val[1])
-                        )
+                            Cat.fetch_cat(cat_id).thought = text
+                        else:
+                            game.cur_events_list.append(
+                                Single_Event(
+                                    _val[0], ["birth_death", "relation"], _val[1]
+                                )
+                            )
 
-            Cat.grief_strings.clear()
+                Cat.grief_strings.clear()
 
-        if Cat.dead_cats:
-            ghost_names = []
-            shaken_cats = []
-            extra_event = None
-            for ghost in Cat.dead_cats:
-                ghost_names.append(str(ghost.name))
-            insert = adjust_list_text(ghost_names)
+        with moon_profiler.phase("death_notices"):
+            if Cat.dead_cats:
+                ghost_names = []
+                shaken_cats = []
+                extra_event = None
+                for ghost in Cat.dead_cats:
+                    ghost_names.append(str(ghost.name))
+                insert = adjust_list_text(ghost_names)
 
-            if len(Cat.dead_cats) > 1:
-                event = i18n.t(
-                    "hardcoded.event_deaths", count=len(Cat.dead_cats), insert=insert
-                )
+                if len(Cat.dead_cats) > 1:
+                    event = i18n.t(
+                        "hardcoded.event_deaths",
+                        count=len(Cat.dead_cats),
+                        insert=insert,
+                    )
 
-                if len(ghost_names) > 2:
-                    alive_cats = [
-                        kitty
-                        for kitty in Cat.all_cats.values()
-                        if kitty.status.alive_in_player_clan
-                    ]
+                    if len(ghost_names) > 2:
+                        alive_cats = Cat.fetch_living_clan_cats()
 
-                    # finds a percentage of the living Clan to become shaken
+                        # finds a percentage of the living Clan to become shaken
 
-                    if len(alive_cats) == 0:
-                        return
-                    else:
-                        shaken_cats = random.sample(
-                            alive_cats,
-                            k=max(
-                                int((len(alive_cats) * random.randint(4, 6)) / 100),
-                                1,
-                            ),
-                        )
+                        if len(alive_cats) == 0:
+                            return
+                        else:
+                            shaken_cats = random.sample(
+                                alive_cats,
+                                k=max(
+                                    int((len(alive_cats) * random.randint(4, 6)) / 100),
+                                    1,
+                                ),
+                            )
 
-                    shaken_cat_names = []
-                    for cat in shaken_cats:
-                        shaken_cat_names.append(str(cat.name))
-                        cat.get_injured(
-                            "shock",
-                            event_triggered=False,
-                            lethal=False,
-                            severity="minor",
-                        )
+                        shaken_cat_names = []
+                        for cat in shaken_cats:
+                            shaken_cat_names.append(str(cat.name))
+                            cat.get_injured(
+                                "shock",
+                                event_triggered=False,
+                                lethal=False,
+                                severity="minor",
+                            )
 
-                    insert = adjust_list_text(shaken_cat_names)
+                        insert = adjust_list_text(shaken_cat_names)
 
-                    extra_event = i18n.t(
-                        "hardcoded.event_shaken_grief",
-                        count=len(shaken_cat_names),
-                        insert=insert,
-                    )
+                        extra_event = i18n.t(
+                            "hardcoded.event_shaken_grief",
+                            count=len(shaken_cat_names),
+                            insert=insert,
+                        )
+
+                else:
+                    event = i18n.t("hardcoded.event_deaths", count=1)
 
-            else:
-                event = i18n.t("hardcoded.event_deaths", count=1)
-
-            game.cur_events_list.append(
-                Single_Event(
-                    event,
-                    ["birth_death"],
-                    [i.ID for i in Cat.dead_cats],
-                    cat_dict=(
-                        {"m_c": Cat.dead_cats[0]} if len(Cat.dead_cats) == 1 else None
-                    ),
-                )
-            )
-            if extra_event:
                 game.cur_events_list.append(
                     Single_Event(
-                        extra_event, ["birth_death"], [i.ID for i in shaken_cats]
+                        event,
+                        ["birth_death"],
+                        [i.ID for i in Cat.dead_cats],
+                        cat_dict=(
+                            {"m_c": Cat.dead_cats[0]}
+                            if len(Cat.dead_cats) == 1
+                            else None
+                        ),
                     )
                 )
-            Cat.dead_cats.clear()
+                if extra_event:
+                    game.cur_events_list.append(
+                        Single_Event(
+                            extra_event, ["birth_death"], [i.ID for i in shaken_cats]
+                        )
+                    )
+                Cat.dead_cats.clear()
 
         if (
             game.clan.game_mode in ("expanded", "cruel season")
@@ -253,18 +276,20 @@ class Events:
                 game.cur_events_list.insert(0, Single_Event(event_string))
                 game.freshkill_event_list.append(event_string)
 
-        self.handle_focus()
+        with moon_profiler.phase("focus"):
+            self.handle_focus()
 
         # handle the herb supply for the moon
-        game.clan.herb_supply.handle_moon(
-            clan_size=get_living_clan_cat_count(Cat),
-            clan_cats=Cat.all_cats_list,
-            med_cats=find_alive_cats_with_rank(
-                Cat,
-                ranks=[CatRank.MEDICINE_CAT, CatRank.MEDICINE_APPRENTICE],
-                working=True,
-            ),
-        )
+        with moon_profiler.phase("herb_supply"):
+            game.clan.herb_supply.handle_moon(
+                clan_size=get_living_clan_cat_count(Cat),
+                clan_cats=Cat.all_cats_list,
+                med_cats=find_alive_cats_with_rank(
+                    Cat,
+                    ranks=[CatRank.MEDICINE_CAT, CatRank.MEDICINE_APPRENTICE],
+                    working=True,
+                ),
+            )
 
         if game.clan.game_mode in ("expanded", "cruel season"):
             amount_per_med = get_amount_cat_for_one_medic(game.clan)
@@ -278,8 +303,7 @@ class Events:
         else:
             has_med = any(
                 cat.status.rank.is_any_medicine_rank()
-                and cat.status.alive_in_player_clan
-                for cat in Cat.all_cats.values()
+                for cat in Cat.fetch_living_clan_cats()
             )
             if not has_med:
                 string = i18n.t("defaults.warn_no_medcats")
@@ -289,25 +313,30 @@ class Events:
         game.just_died.clear()
 
         # Promote leader and deputy, if needed.
-        self.check_and_promote_leader()
-        self.check_and_promote_deputy()
+        with moon_profiler.phase("promotions"):
+            self.check_and_promote_leader()
+            self.check_and_promote_deputy()
 
         # Resort
         if switch_get_value(Switch.sort_type) != "id":
-            Cat.sort_cats()
+            with moon_profiler.phase("sort"):
+                Cat.sort_cats()
 
         # Clear all the loaded event dicts.
         GenerateEvents.clear_loaded_events()
 
         # autosave
         if get_clan_setting("autosave") and game.clan.age % 5 == 0:
-            try:
-                save_cats(switch_get_value(Switch.clan_name), Cat, game)
-                game.clan.save_clan()
-                game.clan.save_pregnancy(game.clan)
-                game.save_events()
-            except:
-                SaveError(traceback.format_exc())
+            with moon_profiler.phase("autosave"):
+                try:
+                    # already off the main thread, so wait for the files to be written
+                    with save_transaction(wait=True):
+                        save_cats(switch_get_value(Switch.clan_name), Cat, game)
+                        game.clan.save_clan()
+                        game.clan.save_pregnancy(game.clan)
+                        game.save_events()
+                except:
+                    SaveError(traceback.format_exc())
 
     def handle_future_events(self):
         """
@@ -517,6 +546,7 @@ class Events:
 
         set_clan_setting("lead_den_interaction", False)
 
+    @profiled("Events.mediator_events")
     def mediator_events(self, cat):
         """Check for mediator events"""
         if get_clan_setting("become_mediator"):
@@ -539,11 +569,15 @@ class Events:
         """Adding auto freshkill for the current moon."""
         healthy_hunter = list(
             filter(
-                lambda c: c.status.rank
-                in (CatRank.WARRIOR, CatRank.APPRENTICE, CatRank.LEADER, CatRank.DEPUTY)
-                and c.status.alive_in_player_clan
-                and not c.not_working(),
-                Cat.all_cats.values(),
+                lambda c: not c.not_working(),
+                Cat.fetch_living_clan_cats(
+                    (
+                        CatRank.WARRIOR,
+                        CatRank.APPRENTICE,
+                        CatRank.LEADER,
+                        CatRank.DEPUTY,
+                    )
+                ),
             )
         )
 
@@ -668,9 +702,8 @@ class Events:
             healthy_warriors = list(
                 filter(
                     lambda c: c.status.rank.is_any_adult_warrior_like_rank()
-                    and c.status.alive_in_player_clan
                     and not c.not_working(),
-                    Cat.all_cats.values(),
+                    Cat.fetch_living_clan_cats(),
                 )
             )
             warrior_amount = len(healthy_warriors) * info_dict["prey_warrior"]
@@ -682,10 +715,8 @@ class Events:
             # handle herbs
             healthy_meds = list(
                 filter(
-                    lambda c: c.status.rank == CatRank.MEDICINE_CAT
-                    and c.status.alive_in_player_clan
-                    and not c.not_working(),
-                    Cat.all_cats.values(),
+                    lambda c: not c.not_working(),
+                    Cat.fetch_living_clan_cats([CatRank.MEDICINE_CAT]),
                 )
             )
 
@@ -820,6 +851,7 @@ class Events:
                 elif not x.status.rank.is_any_apprentice_rank() and x.moons >= 6:
                     self.ceremony(x, CatRank.APPRENTICE)
 
+    @profiled("Events.handle_fading")
     def handle_fading(self, cat):
         """
         TODO: DOCS
@@ -1132,6 +1164,7 @@ class Events:
         )
         game.cur_events_list.append(Single_Event(event, "other_clans"))
 
+    @profiled("Events.perform_ceremonies")
     def perform_ceremonies(self, cat):
         """
         ceremonies
@@ -1659,6 +1692,7 @@ class Events:
         )
         # game.ceremony_events_list.append(f'{cat.name}{ceremony_text}')
 
+    @profiled("Events.gain_accessories")
     def gain_accessories(self, cat):
         """
         accessories
@@ -1766,6 +1800,7 @@ class Events:
 
             cat.experience += max(exp * role_modifier, 1)
 
+    @profiled("Events.handle_apprentice_EX")
     def handle_apprentice_EX(self, cat):
         """
         TODO: DOCS
@@ -1798,6 +1833,7 @@ class Events:
 
             cat.experience += max(exp * mentor_modifier, 1)
 
+    @profiled("Events.invite_new_cats")
     def invite_new_cats(self, cat):
         """
         new cats
@@ -1806,11 +1842,8 @@ class Events:
 
         alive_cats = list(
             filter(
-                lambda kitty: (
-                    kitty.status.rank != CatRank.LEADER
-                    and kitty.status.alive_in_player_clan
-                ),
-                Cat.all_cats.values(),
+                lambda kitty: kitty.status.rank != CatRank.LEADER,
+                Cat.fetch_living_clan_cats(),
             )
         )
 
@@ -1865,6 +1898,7 @@ class Events:
                 freshkill_pile=game.clan.freshkill_pile,
             )
 
+    @profiled("Events.other_interactions")
     def other_interactions(self, cat):
         """
         TODO: DOCS
@@ -1887,6 +1921,7 @@ class Events:
             freshkill_pile=game.clan.freshkill_pile,
         )
 
+    @profiled("Events.handle_injuries_or_general_death")
     def handle_injuries_or_general_death(self, cat):
         """
         decide if cat dies
@@ -1976,6 +2011,7 @@ class Events:
 
             return triggered_death
 
+    @profiled("Events.handle_murder")
     def handle_murder(self, cat):
         """Handles murder"""
         relationships = cat.relationships.values()
@@ -2098,6 +2134,7 @@ class Events:
                     freshkill_pile=game.clan.freshkill_pile,
                 )
 
+    @profiled("Events.handle_illnesses_or_illness_deaths")
     def handle_illnesses_or_illness_deaths(self, cat):
         """
         This function will handle:
@@ -2115,6 +2152,7 @@ class Events:
         )
         return triggered_death
 
+    @profiled("Events.handle_outbreaks")
     def handle_outbreaks(self, cat):
         """Try to infect some cats."""
         # check if the cat is ill,
@@ -2122,41 +2160,25 @@ class Events:
         if not cat.is_ill():
             return
 
-        # check how many kitties are already ill
-        already_sick = list(
-            filter(
-                lambda kitty: (kitty.status.alive_in_player_clan and kitty.is_ill()),
-                Cat.all_cats.values(),
-            )
-        )
-        already_sick_count = len(already_sick)
-
-        # round up the living kitties
-        alive_cats = list(
-            filter(
-                lambda kitty: (
-                    kitty.status.alive_in_player_clan and not kitty.is_ill()
-                ),
-                Cat.all_cats.values(),
-            )
-        )
-        alive_count = len(alive_cats)
+        # check how many kitties are already ill, without going through every cat
+        already_sick_count = infection_tracker.count_living_clan_ill_cats(Cat.all_cats)
+        alive_count = len(Cat.living_clan_pool) - already_sick_count
 
         # if large amount of the population is already sick, stop spreading
         if already_sick_count >= alive_count * 0.25:
             return
 
-        meds = find_alive_cats_with_rank(
-            Cat,
-            [CatRank.MEDICINE_CAT, CatRank.MEDICINE_APPRENTICE],
-            working=True,
-            sort=True,
-        )
-
+        meds = None
         for illness in cat.illnesses:
             # check if illness can infect other cats
             if cat.illnesses[illness]["infectiousness"] == 0:
                 continue
+            if meds is None:
+                meds = find_alive_cats_with_rank(
+                    Cat,
+                    [CatRank.MEDICINE_CAT, CatRank.MEDICINE_APPRENTICE],
+                    working=True,
+                )
             chance = cat.illnesses[illness]["infectiousness"]
             chance += len(meds) * 7
             if not int(random.random() * chance):  # 1/chance to infect
@@ -2174,18 +2196,21 @@ class Events:
                     if not int(random.random() * stopping_chance):
                         continue
 
+                # round up the living kitties, only needed once the illness spreads
                 if illness == "kittencough":
                     # adjust alive cats list to only include kittens
-                    alive_cats = list(
-                        filter(
-                            lambda kitty: (
-                                kitty.status.rank.is_baby()
-                                and kitty.status.alive_in_player_clan
-                            ),
-                            Cat.all_cats.values(),
-                        )
-                    )
-                    alive_count = len(alive_cats)
+                    alive_cats = [
+                        kitty
+                        for kitty in Cat.fetch_living_clan_cats()
+                        if kitty.status.rank.is_baby()
+                    ]
+                else:
+                    alive_cats = [
+                        kitty
+                        for kitty in Cat.fetch_living_clan_cats()
+                        if not kitty.is_ill()
+                    ]
+                alive_count = len(alive_cats)
 
                 max_infected = int(alive_count / 2)  # 1/2 of alive cats
                 # If there are less than two cat to infect,
@@ -2245,6 +2270,7 @@ class Events:
                 # game.health_events_list.append(event)
                 break
 
+    @profiled("Events.coming_out")
     def coming_out(self, cat):
         """turnin' the kitties trans..."""
 
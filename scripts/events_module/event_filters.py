@@ -1,5 +1,5 @@
 import re
-from random import choice
+from scripts.game_structure.rng.events import choice
 
 import ujson
 
@@ -519,6 +519,8 @@ def cat_for_event(
 
 
 def _get_cats_with_rel_status(cat_list: list, cat, rel_status_list: list) -> list:
+    # the list belongs to the event, so don't remove the handled statuses from it
+    rel_status_list = list(rel_status_list)
     # theoretically none of these should ever be used together
     if "siblings" in rel_status_list:
         cat_list = [c for c in cat_list if c.ID in cat.get_siblings()]
@@ -1,4 +1,4 @@
-from random import randint
+from scripts.game_structure.rng.events import randint
 
 from scripts.cat.cats import Cat
 from scripts.events_module.event_filters import cat_for_event
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 # -*- coding: ascii -*-
-import random
+from scripts.game_structure.rng import events as random
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 import i18n
 import ujson
@@ -31,6 +32,177 @@ def get_resource_directory(fallback=False):
     return f"resources/lang/{i18n.config.get('locale') if not fallback else i18n.config.get('fallback')}/events/"
 
 
+def parse_short_event(event: dict) -> ShortEvent:
+    """Creates the ShortEvent of an event dict from the event files."""
+    event_text = event["event_text"] if "event_text" in event else None
+    if not event_text:
+        event_text = event["death_text"] if "death_text" in event else None
+
+    if not event_text:
+        print(
+            f"WARNING: some events resources which are used in generate_events have no 'event_text'."
+        )
+
+    short_event = ShortEvent(
+        event_id=event["event_id"] if "event_id" in event else "",
+        location=event["location"] if "location" in event else ["any"],
+        season=event["season"] if "season" in event else ["any"],
+        sub_type=event["sub_type"] if "sub_type" in event else [],
+        tags=event["tags"] if "tags" in event else [],
+        text=event_text,
+        new_accessory=(event["new_accessory"] if "new_accessory" in event else []),
+        m_c=event["m_c"] if "m_c" in event else {},
+        r_c=event["r_c"] if "r_c" in event else {},
+        new_cat=event["new_cat"] if "new_cat" in event else [],
+        injury=event["injury"] if "injury" in event else [],
+        exclude_involved=(
+            event["exclude_involved"] if "exclude_involved" in event else []
+        ),
+        history=event["history"] if "history" in event else [],
+        relationships=(event["relationships"] if "relationships" in event else []),
+        outsider=event["outsider"] if "outsider" in event else {},
+        other_clan=event["other_clan"] if "other_clan" in event else {},
+        supplies=event["supplies"] if "supplies" in event else [],
+        new_gender=event["new_gender"] if "new_gender" in event else [],
+        future_event=event["future_event"] if "future_event" in event else {},
+    )
+
+    if short_event.history and (
+        not isinstance(short_event.history, list)
+        or "cats" not in short_event.history[0]
+    ):
+        print(f"{short_event.event_id} history formatted incorrectly")
+    if short_event.injury and (
+        not isinstance(short_event.injury, list) or "cats" not in short_event.injury[0]
+    ):
+        print(f"{short_event.event_id} injury formatted incorrectly")
+
+    return short_event
+
+
+def event_for_clan(event: ShortEvent) -> bool:
+    """
+    checks the requirements of the event that only depend on the clan, not on the cats
+    """
+    if not event_for_location(event.location):
+        return False
+
+    if not event_for_season(event.season):
+        return False
+
+    # check if outsider event is allowed
+    if event.outsider and not event_for_reputation(event.outsider["current_rep"]):
+        return False
+
+    # clans below a certain age can't have their supplies messed with
+    if game.clan.age < 5 and event.supplies:
+        return False
+
+    return True
+
+
+class ShortEventCatalog:
+    """
+    The short events of each event file, parsed once and kept for the whole session.
+
+    Events are grouped by frequency and by their set of sub_types. The events that fit
+    the current clan (location, season, reputation, clan age) are filtered once and
+    reused until one of these changes, so usually once per moon.
+    """
+
+    def __init__(self):
+        self.files: Dict[
+            Tuple[str, str, str],
+            Dict[int, Tuple[List[ShortEvent], Dict[FrozenSet[str], List[ShortEvent]]]],
+        ] = {}
+        """(locale, fallback, file path): frequency: (all events, events by sub_types)"""
+        self.clan_events: Dict[tuple, Tuple[tuple, List[ShortEvent]]] = {}
+        """(file key, frequency, sub_types): (clan state, events fitting that state)"""
+
+    @staticmethod
+    def file_key(file_path: str) -> Tuple[str, str, str]:
+        return i18n.config.get("locale"), i18n.config.get("fallback"), file_path
+
+    @staticmethod
+    def clan_state() -> tuple:
+        """Everything the clan requirements of an event depend on."""
+        clan = game.clan
+        return (
+            clan.biome,
+            clan.override_biome,
+            clan.camp_bg,
+            clan.current_season,
+            clan.reputation,
+            clan.age < 5,
+        )
+
+    def load_file(self, file_path: str):
+        """Parses the event file of the current language, if that wasn't done yet."""
+        key = self.file_key(file_path)
+        if key in self.files:
+            return self.files[key]
+
+        by_frequency = {}
+        events_dict = GenerateEvents.get_short_event_dicts(file_path)
+        for event in events_dict if events_dict else []:
+            frequency = event["frequency"] if "frequency" in event else 4
+            short_event = parse_short_event(event)
+
+            all_events, by_sub_types = by_frequency.setdefault(frequency, ([], {}))
+            all_events.append(short_event)
+            by_sub_types.setdefault(frozenset(short_event.sub_type), []).append(
+                short_event
+            )
+
+        self.files[key] = by_frequency
+        return by_frequency
+
+    def get_events(
+        self, file_path: str, frequency: int, sub_types: Optional[List[str]] = None
+    ) -> List[ShortEvent]:
+        """
+        Returns the events of the file with the given frequency, in file order.
+
+        :param file_path: the event file, relative to the events folder
+        :param frequency: the frequency of the events
+        :param sub_types: only return events with exactly these sub_types, default None for all
+        """
+        events = self.load_file(file_path).get(frequency)
+        if not events:
+            return []
+        if sub_types is None:
+            return events[0]
+        return events[1].get(frozenset(sub_types), [])
+
+    def get_clan_events(
+        self, file_path: str, frequency: int, sub_types: Optional[List[str]] = None
+    ) -> List[ShortEvent]:
+        """
+        Like get_events, but only returns the events that fit the current clan.
+        """
+        key = (
+            self.file_key(file_path),
+            frequency,
+            None if sub_types is None else frozenset(sub_types),
+        )
+        state = self.clan_state()
+        cached = self.clan_events.get(key)
+        if cached is not None and cached[0] == state:
+            return cached[1]
+
+        events = [
+            event
+            for event in self.get_events(file_path, frequency, sub_types)
+            if event_for_clan(event)
+        ]
+        self.clan_events[key] = (state, events)
+        return events
+
+    def clear(self):
+        self.files.clear()
+        self.clan_events.clear()
+
+
 # ---------------------------------------------------------------------------- #
 #                Tagging Guidelines can be found at the bottom                 #
 # ---------------------------------------------------------------------------- #
@@ -38,6 +210,7 @@ def get_resource_directory(fallback=False):
 
 class GenerateEvents:
     loaded_events = {}
+    short_event_catalog = ShortEventCatalog()
 
     with open(
         f"resources/dicts/conditions/injuries.json", "r", encoding="utf-8"
@@ -98,77 +271,9 @@ class GenerateEvents:
 
     @staticmethod
     def clear_loaded_events():
+        """Clears the loaded event dicts. Parsed short events are kept in the catalog."""
         GenerateEvents.loaded_events = {}
 
-    @staticmethod
-    def generate_short_events(event_triggered, biome, frequency):
-        file_path = f"{event_triggered}/{biome}.json"
-        load_name = f"{file_path}_{frequency}"
-
-        try:
-            if load_name in GenerateEvents.loaded_events:
-                return GenerateEvents.loaded_events[load_name]
-            else:
-                events_dict = GenerateEvents.get_short_event_dicts(file_path)
-
-                event_list = []
-                if not events_dict:
-                    return event_list
-                for event in events_dict:
-                    event_text = event["event_text"] if "event_text" in event else None
-                    event_frequency = event["frequency"] if "frequency" in event else 4
-                    if not event_text:
-                        event_text = (
-                            event["death_text"] if "death_text" in event else None
-                        )
-
-                    if not event_text:
-                        print(
-                            f"WARNING: some events resources which are used in generate_events have no 'event_text'."
-                        )
-
-                    if frequency != event_frequency:
-                        continue
-
-                    event = ShortEvent(
-                        event_id=event["event_id"] if "event_id" in event else "",
-                        location=event["location"] if "location" in event else ["any"],
-                        season=event["season"] if "season" in event else ["any"],
-                        sub_type=event["sub_type"] if "sub_type" in event else [],
-                        tags=event["tags"] if "tags" in event else [],
-                        text=event_text,
-                        new_accessory=(
-                            event["new_accessory"] if "new_accessory" in event else []
-                        ),
-                        m_c=event["m_c"] if "m_c" in event else {},
-                        r_c=event["r_c"] if "r_c" in event else {},
-                        new_cat=event["new_cat"] if "new_cat" in event else [],
-                        injury=event["injury"] if "injury" in event else [],
-                        exclude_involved=(
-                            event["exclude_involved"]
-                            if "exclude_involved" in event
-                            else []
-                        ),
-                        history=event["history"] if "history" in event else [],
-                        relationships=(
-                            event["relationships"] if "relationships" in event else []
-                        ),
-                        outsider=event["outsider"] if "outsider" in event else {},
-                        other_clan=event["other_clan"] if "other_clan" in event else {},
-                        supplies=event["supplies"] if "supplies" in event else [],
-                        new_gender=event["new_gender"] if "new_gender" in event else [],
-                        future_event=event["future_event"]
-                        if "future_event" in event
-                        else {},
-                    )
-                    event_list.append(event)
-
-                # Add to loaded events.
-                GenerateEvents.loaded_events[load_name] = event_list
-                return event_list
-        except:
-            print(f"WARNING: {file_path} was not found, check short event generation")
-
     @staticmethod
     def generate_ongoing_events(event_type, biome, specific_event=None):
         file_path = f"{get_resource_directory()}/{event_type}/{biome}.json"
@@ -219,10 +324,15 @@ class GenerateEvents:
                 return event
 
     @staticmethod
-    def possible_short_events(
-        frequency,
-        event_type=None,
-    ):
+    def possible_short_events(frequency, event_type=None, sub_types=None):
+        """
+        Returns the short events of the given type and frequency that fit the current clan,
+        biome specific events first.
+
+        :param frequency: the frequency of the events
+        :param event_type: the type of event, which is also the event folder
+        :param sub_types: only return events with exactly these sub_types, default None for all
+        """
         event_list = []
 
         # skip the rest of the loading if there is an unrecognised biome
@@ -239,14 +349,22 @@ class GenerateEvents:
 
         biome = temp_biome.lower()
 
+        catalog = GenerateEvents.short_event_catalog
+        # if requirements are overridden, allow every event through
+        if constants.CONFIG["event_generation"]["debug_override_requirements"]:
+            get_events = catalog.get_events
+            sub_types = None
+        else:
+            get_events = catalog.get_clan_events
+
         # biome specific events
         event_list.extend(
-            GenerateEvents.generate_short_events(event_type, biome, frequency)
+            get_events(f"{event_type}/{biome}.json", frequency, sub_types)
         )
 
         # any biome events
         event_list.extend(
-            GenerateEvents.generate_short_events(event_type, "general", frequency)
+            get_events(f"{event_type}/general.json", frequency, sub_types)
         )
 
         return event_list
@@ -260,37 +378,17 @@ class GenerateEvents:
         freshkill_active,
         freshkill_trigger_factor,
         random_cat=None,
-        sub_types=None,
         allowed_events=None,
         excluded_events=None,
-        ignore_subtyping=False,
     ):
+        """
+        Chooses one of the possible events and the random cat for it. possible_events should
+        come from possible_short_events, the requirements that only depend on the clan and the
+        sub_types are already checked there, only the cat requirements are checked here.
+        """
         final_events = []
-        incorrect_format = []
 
         for event in possible_events:
-            if event.history:
-                if (
-                    not isinstance(event.history, list)
-                    or "cats" not in event.history[0]
-                ):
-                    if (
-                        f"{event.event_id} history formatted incorrectly"
-                        not in incorrect_format
-                    ):
-                        incorrect_format.append(
-                            f"{event.event_id} history formatted incorrectly"
-                        )
-            if event.injury:
-                if not isinstance(event.injury, list) or "cats" not in event.injury[0]:
-                    if (
-                        f"{event.event_id} injury formatted incorrectly"
-                        not in incorrect_format
-                    ):
-                        incorrect_format.append(
-                            f"{event.event_id} injury formatted incorrectly"
-                        )
-
             # check if event is in allowed or excluded
             if allowed_events and event.event_id not in allowed_events:
                 continue
@@ -302,17 +400,6 @@ class GenerateEvents:
                 final_events.append(event)
                 continue
 
-            # check for event sub_type
-            if not ignore_subtyping:
-                if set(event.sub_type) != set(sub_types):
-                    continue
-
-            if not event_for_location(event.location):
-                continue
-
-            if not event_for_season(event.season):
-                continue
-
             # check tags
             if not event_for_tags(event.tags, cat, random_cat):
                 continue
@@ -374,11 +461,6 @@ class GenerateEvents:
                 ):
                     continue
 
-            # check if outsider event is allowed
-            if event.outsider:
-                if not event_for_reputation(event.outsider["current_rep"]):
-                    continue
-
             # other Clan related checks
             if event.other_clan:
                 if not other_clan:
@@ -399,11 +481,7 @@ class GenerateEvents:
                     ):
                         continue
 
-            # clans below a certain age can't have their supplies messed with
-            if game.clan.age < 5 and event.supplies:
-                continue
-
-            elif event.supplies:
+            if event.supplies:
                 clan_size = get_living_clan_cat_count(Cat_class)
                 discard = False
                 for supply in event.supplies:
@@ -508,9 +586,6 @@ class GenerateEvents:
             else:
                 break
 
-        for notice in incorrect_format:
-            print(notice)
-
         return chosen_event, chosen_cat
 
     @staticmethod
@@ -0,0 +1,174 @@
+"""
+Times where a moon skip spends its time.
+
+The profiler is off by default and is turned on from the debug console
+(``profile on``). While it is on, every moon skip records the wall time and
+the number of calls of its phases, of the event handlers called for each cat
+and of each cat as a whole. Phases are kept by their full stack, so the
+results can be shown as a report sorted by any column, or written as collapsed
+stacks (``one_moon;cats;Relation_Events.handle_relationships 1234``, in
+microseconds) that flamegraph tools such as ``flamegraph.pl`` or speedscope read.
+
+Phases are only recorded on the thread that runs the moon skip and only while
+it runs, so handlers that are also used by the screens don't show up.
+"""
+
+import threading
+from contextlib import nullcontext
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+_NOT_RECORDING = nullcontext()
+
+REPORT_SORT_KEYS = {
+    "total": lambda entry: -entry[1],
+    "self": lambda entry: -entry[2],
+    "calls": lambda entry: -entry[3],
+    "avg": lambda entry: -entry[1] / entry[3],
+    "name": lambda entry: entry[0],
+}
+"""sort key name: key for a report entry (name, total time, self time, calls)"""
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "cat", "start")
+
+    def __init__(self, profiler: "MoonProfiler", name: str, cat=None):
+        self.profiler = profiler
+        self.name = name
+        self.cat = cat
+        self.start = 0.0
+
+    def __enter__(self):
+        self.profiler._stack.append(self.name)
+        self.profiler._child_time.append(0.0)
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = perf_counter() - self.start
+        profiler = self.profiler
+        path = tuple(profiler._stack)
+        child_time = profiler._child_time.pop()
+        profiler._stack.pop()
+        if profiler._child_time:
+            profiler._child_time[-1] += elapsed
+
+        timing = profiler.phases.setdefault(path, [0.0, 0.0, 0])
+        timing[0] += elapsed
+        timing[1] += elapsed - child_time
+        timing[2] += 1
+
+        if self.cat is not None:
+            cat_timing = profiler.cats.setdefault(
+                self.cat.ID, [str(self.cat.name), 0.0, 0]
+            )
+            cat_timing[1] += elapsed
+            cat_timing[2] += 1
+        return False
+
+
+class MoonProfiler:
+    """Collects the timings of moon skips while enabled."""
+
+    def __init__(self):
+        self.enabled = False
+        self.moons = 0
+        """amount of moon skips recorded"""
+        self.phases: Dict[Tuple[str, ...], List] = {}
+        """stack of phase names: [total seconds, self seconds, calls]"""
+        self.cats: Dict[str, List] = {}
+        """cat ID: [cat name, total seconds, calls]"""
+        self._stack: List[str] = []
+        self._child_time: List[float] = []
+        """time spent in the phases called by each phase of the stack"""
+        self._thread: Optional[int] = None
+
+    def reset(self):
+        self.moons = 0
+        self.phases.clear()
+        self.cats.clear()
+
+    def moon(self):
+        """Times a whole moon skip, all other phases are recorded inside of it."""
+        if not self.enabled or self._stack:
+            return _NOT_RECORDING
+        self._thread = threading.get_ident()
+        self.moons += 1
+        return _Phase(self, "one_moon")
+
+    def phase(self, name: str, cat=None):
+        """
+        Times a part of the moon skip. Does nothing if no moon skip is being recorded.
+
+        :param name: Name of the phase, used in the report and the stacks
+        :param cat: The cat this phase is for, to add the time to that cat, default None
+        """
+        if not self._stack or threading.get_ident() != self._thread:
+            return _NOT_RECORDING
+        return _Phase(self, name, cat)
+
+    def report(self, sort: str = "total", limit: int = 20) -> List[str]:
+        """
+        Returns the lines of a report of the recorded phases and the slowest cats.
+
+        :param sort: Column to sort the phases by: total, self, calls, avg or name, default total
+        :param limit: Amount of phases and cats to show, default 20
+        """
+        if sort not in REPORT_SORT_KEYS:
+            raise ValueError(
+                f"Unknown sort {sort}, expected one of {', '.join(REPORT_SORT_KEYS)}"
+            )
+        entries = [
+            (" > ".join(path), total, self_time, calls)
+            for path, (total, self_time, calls) in self.phases.items()
+        ]
+        entries.sort(key=REPORT_SORT_KEYS[sort])
+
+        lines = [
+            f"{self.moons} moon(s) recorded, phases by {sort}:",
+            f"{'total ms':>10} {'self ms':>10} {'calls':>7} {'avg ms':>9}  phase",
+        ]
+        for name, total, self_time, calls in entries[:limit]:
+            lines.append(
+                f"{total * 1000:10.1f} {self_time * 1000:10.1f} {calls:7d} "
+                f"{total * 1000 / calls:9.3f}  {name}"
+            )
+
+        if self.cats:
+            lines.append("slowest cats:")
+            slowest = sorted(self.cats.items(), key=lambda item: -item[1][1])
+            for cat_id, (cat_name, total, calls) in slowest[:limit]:
+                lines.append(f"{total * 1000:10.1f} {calls:7d}  {cat_name} ({cat_id})")
+        return lines
+
+    def collapsed_stacks(self) -> List[str]:
+        """Returns the recorded phases as collapsed stacks, with their self time in microseconds."""
+        return [
+            f"{';'.join(path)} {round(self_time * 1_000_000)}"
+            for path, (total, self_time, calls) in sorted(self.phases.items())
+        ]
+
+    def write_collapsed_stacks(self, path: str):
+        with open(path, "w", encoding="utf-8") as write_file:
+            write_file.write("\n".join(self.collapsed_stacks()) + "\n")
+
+
+moon_profiler = MoonProfiler()
+
+
+def profiled(name: str) -> Callable:
+    """Decorator recording each call of the function as a phase of the moon skip."""
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not moon_profiler._stack:
+                return func(*args, **kwargs)
+            with moon_profiler.phase(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
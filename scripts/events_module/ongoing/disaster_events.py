@@ -1,4 +1,4 @@
-import random
+from scripts.game_structure.rng import events as random
 
 from scripts.cat.cats import Cat
 from scripts.cat.enums import CatRank
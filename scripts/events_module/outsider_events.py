@@ -1,4 +1,4 @@
-import random
+from scripts.game_structure.rng import events as random
 
 from typing import TYPE_CHECKING
 
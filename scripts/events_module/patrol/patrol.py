@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 # -*- coding: ascii -*-
 import logging
-import random
+from scripts.game_structure.rng import patrols as random
 from copy import deepcopy
 from itertools import repeat
 from os.path import exists as path_exists
-from random import choice, randint, choices
+from scripts.game_structure.rng.patrols import choice, randint, choices
 from typing import List, Tuple, Optional, Union
 
 import pygame
@@ -15,12 +15,18 @@ from scripts.cat.enums import CatAge, CatRank
 from scripts.clan import Clan
 from scripts.clan_package.settings import get_clan_setting
 from scripts.events_module.event_filters import event_for_tags
+from scripts.events_module.patrol.patrol_catalog import (
+    PATROL_SEASONS,
+    fits_setting,
+    generate_patrol_events,
+    get_patrol_files,
+    patrol_catalog,
+)
 from scripts.events_module.patrol.patrol_event import PatrolEvent
 from scripts.events_module.patrol.patrol_outcome import PatrolOutcome
 from scripts.game_structure import localization, constants
 from scripts.game_structure.game.settings import game_setting_get
 from scripts.game_structure.game_essentials import game
-from scripts.game_structure.localization import load_lang_resource
 from scripts.utility import (
     get_personality_compatibility,
     check_relationship_value,
@@ -64,27 +70,6 @@ class Patrol:
         # False if no debug patrol set, value if one is set
         self.debug_patrol: Union[bool, str] = False
 
-        # the patrols
-        self.HUNTING_SZN = None
-        self.HUNTING = None
-        self.TRAINING_SZN = None
-        self.TRAINING = None
-        self.BORDER_SZN = None
-        self.BORDER = None
-        self.MEDCAT_SZN = None
-        self.MEDCAT = None
-        self.NEW_CAT = None
-        self.NEW_CAT_HOSTILE = None
-        self.NEW_CAT_WELCOMING = None
-        self.OTHER_CLAN = None
-        self.OTHER_CLAN_HOSTILE = None
-        self.OTHER_CLAN_ALLIES = None
-        self.HUNTING_GEN = None
-        self.BORDER_GEN = None
-        self.TRAINING_GEN = None
-        self.MEDCAT_GEN = None
-        self.DISASTER = None
-
     def setup_patrol(self, patrol_cats: List[Cat], patrol_type: str) -> str:
         # Add cats
 
@@ -284,64 +269,39 @@ class Patrol:
             else get_clan_setting("disasters")
         )
         season = current_season.lower()
-        leaf = f"{season}"
-        biome_dir = f"{biome}/"
-        self.update_resources(biome_dir, leaf)
+        patrol_files = get_patrol_files(biome, season)
 
-        possible_patrols = []
-        # This is for debugging purposes, load-in *ALL* the possible patrols when debug_override_patrol_stat_requirements is true. (May require longer loading time)
+        possible_files = []
+        # This is for debugging purposes, load-in *ALL* the possible patrols when debug_override_patrol_stat_requirements is true.
         if constants.CONFIG["patrol_generation"][
             "debug_override_patrol_stat_requirements"
         ]:
-            leaves = ["greenleaf", "leaf-bare", "leaf-fall", "newleaf", "any"]
-            for biome in constants.BIOME_TYPES:
-                for leaf in leaves:
-                    biome_dir = f"{biome.lower()}/"
-                    self.update_resources(biome_dir, leaf)
-                    possible_patrols.extend(self.generate_patrol_events(self.HUNTING))
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.HUNTING_SZN)
-                    )
-                    possible_patrols.extend(self.generate_patrol_events(self.BORDER))
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.BORDER_SZN)
-                    )
-                    possible_patrols.extend(self.generate_patrol_events(self.TRAINING))
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.TRAINING_SZN)
-                    )
-                    possible_patrols.extend(self.generate_patrol_events(self.MEDCAT))
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.MEDCAT_SZN)
-                    )
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.HUNTING_GEN)
-                    )
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.BORDER_GEN)
-                    )
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.TRAINING_GEN)
-                    )
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.MEDCAT_GEN)
-                    )
-                    possible_patrols.extend(self.generate_patrol_events(self.DISASTER))
-                    possible_patrols.extend(self.generate_patrol_events(self.NEW_CAT))
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.NEW_CAT_WELCOMING)
-                    )
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.NEW_CAT_HOSTILE)
-                    )
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.OTHER_CLAN)
-                    )
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.OTHER_CLAN_ALLIES)
-                    )
-                    possible_patrols.extend(
-                        self.generate_patrol_events(self.OTHER_CLAN_HOSTILE)
+            for debug_biome in constants.BIOME_TYPES:
+                for leaf in PATROL_SEASONS:
+                    debug_files = get_patrol_files(debug_biome.lower(), leaf)
+                    possible_files.extend(
+                        debug_files[name]
+                        for name in (
+                            "HUNTING",
+                            "HUNTING_SZN",
+                            "BORDER",
+                            "BORDER_SZN",
+                            "TRAINING",
+                            "TRAINING_SZN",
+                            "MEDCAT",
+                            "MEDCAT_SZN",
+                            "HUNTING_GEN",
+                            "BORDER_GEN",
+                            "TRAINING_GEN",
+                            "MEDCAT_GEN",
+                            "DISASTER",
+                            "NEW_CAT",
+                            "NEW_CAT_WELCOMING",
+                            "NEW_CAT_HOSTILE",
+                            "OTHER_CLAN",
+                            "OTHER_CLAN_ALLIES",
+                            "OTHER_CLAN_HOSTILE",
+                        )
                     )
 
         # this next one is needed for Classic specifically
@@ -397,64 +357,68 @@ class Patrol:
             welcoming_rep = True
             chance = welcoming_chance
 
-        possible_patrols.extend(self.generate_patrol_events(self.HUNTING))
-        possible_patrols.extend(self.generate_patrol_events(self.HUNTING_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.BORDER))
-        possible_patrols.extend(self.generate_patrol_events(self.BORDER_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.TRAINING))
-        possible_patrols.extend(self.generate_patrol_events(self.TRAINING_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.MEDCAT))
-        possible_patrols.extend(self.generate_patrol_events(self.MEDCAT_SZN))
-        possible_patrols.extend(self.generate_patrol_events(self.HUNTING_GEN))
-        possible_patrols.extend(self.generate_patrol_events(self.BORDER_GEN))
-        possible_patrols.extend(self.generate_patrol_events(self.TRAINING_GEN))
-        possible_patrols.extend(self.generate_patrol_events(self.MEDCAT_GEN))
+        possible_files.extend(
+            patrol_files[name]
+            for name in (
+                "HUNTING",
+                "HUNTING_SZN",
+                "BORDER",
+                "BORDER_SZN",
+                "TRAINING",
+                "TRAINING_SZN",
+                "MEDCAT",
+                "MEDCAT_SZN",
+                "HUNTING_GEN",
+                "BORDER_GEN",
+                "TRAINING_GEN",
+                "MEDCAT_GEN",
+            )
+        )
 
         if game_setting_disaster:
             dis_chance = int(random.getrandbits(3))  # disaster patrol chance
             if dis_chance == 1:
-                possible_patrols.extend(self.generate_patrol_events(self.DISASTER))
+                possible_files.append(patrol_files["DISASTER"])
 
         # new cat patrols
         if chance == 1:
             if welcoming_rep:
-                possible_patrols.extend(
-                    self.generate_patrol_events(self.NEW_CAT_WELCOMING)
-                )
+                possible_files.append(patrol_files["NEW_CAT_WELCOMING"])
             elif neutral_rep:
-                possible_patrols.extend(self.generate_patrol_events(self.NEW_CAT))
+                possible_files.append(patrol_files["NEW_CAT"])
             elif hostile_rep:
-                possible_patrols.extend(
-                    self.generate_patrol_events(self.NEW_CAT_HOSTILE)
-                )
+                possible_files.append(patrol_files["NEW_CAT_HOSTILE"])
 
         # other Clan patrols
         if other_clan_chance == 1:
             if clan_neutral:
-                possible_patrols.extend(self.generate_patrol_events(self.OTHER_CLAN))
+                possible_files.append(patrol_files["OTHER_CLAN"])
             elif clan_allies:
-                possible_patrols.extend(
-                    self.generate_patrol_events(self.OTHER_CLAN_ALLIES)
-                )
+                possible_files.append(patrol_files["OTHER_CLAN_ALLIES"])
             elif clan_hostile:
-                possible_patrols.extend(
-                    self.generate_patrol_events(self.OTHER_CLAN_HOSTILE)
-                )
-        patrol_ids = [patrol.patrol_id for patrol in possible_patrols]
-        if self.debug_patrol and self.debug_patrol not in patrol_ids:
+                possible_files.append(patrol_files["OTHER_CLAN_HOSTILE"])
+        if self.debug_patrol and not any(
+            patrol.patrol_id == self.debug_patrol
+            for file_path in possible_files
+            for patrol in patrol_catalog.get_patrols(file_path)
+        ):
             print(
                 "DEBUG: requested patrol not present (check spelling/mismatched season, biome, patrol type, new cat flag, other clan relations, disaster setting)"
             )
 
         final_patrols, final_romance_patrols = self.get_filtered_patrols(
-            possible_patrols, biome, camp, current_season, patrol_type
+            possible_files, biome, camp, current_season, patrol_type
         )
 
         # This is a debug option, this allows you to remove any constraints of a patrol regarding location, session, biomes, etc.
         if constants.CONFIG["patrol_generation"][
             "debug_override_patrol_stat_requirements"
         ]:
-            final_patrols = final_romance_patrols = possible_patrols
+            final_patrols = final_romance_patrols = [
+                patrol
+                for file_path in possible_files
+                for patrol in patrol_catalog.get_patrols(file_path)
+            ]
             # Logging
             print(
                 "All patrol filters regarding location, session, etc. have been removed."
@@ -580,7 +544,7 @@ class Patrol:
 
     def _filter_patrols(
         self,
-        possible_patrols: List[PatrolEvent],
+        possible_files: List[str],
         biome: str,
         camp: str,
         current_season: str,
@@ -593,102 +557,92 @@ class Patrol:
         if patrol_type == "general":
             patrol_type = random.choice(["hunting", "border", "training"])
 
-        # makes sure that it grabs patrols in the correct biomes, season, with the correct number of cats
-        for patrol in possible_patrols:
-            if not self._check_constraints(patrol):
-                continue
-
-            # Don't check for repeat patrols if ensure_patrol_id is being used.
-            if (
-                not isinstance(
-                    constants.CONFIG["patrol_generation"]["debug_ensure_patrol_id"], str
+        # the catalog already sorted out the patrols with the wrong biomes, season or number of cats
+        patrol_size = len(self.patrol_cats)
+        for file_path in possible_files:
+            normal, romantic = patrol_catalog.get_bucket(
+                file_path, biome, camp, current_season, patrol_type, patrol_size
+            )
+            if self.debug_patrol:
+                self._debug_setting(
+                    file_path, biome, camp, current_season, patrol_type, patrol_size
                 )
-                and patrol.patrol_id in self.used_patrols
-            ):
-                continue
+            filtered_patrols.extend(filter(self._fits_patrol_cats, normal))
+            romantic_patrols.extend(filter(self._fits_patrol_cats, romantic))
 
-            if not (patrol.min_cats <= len(self.patrol_cats) <= patrol.max_cats):
-                if self.debug_patrol and self.debug_patrol == patrol.patrol_id:
-                    print(
-                        "DEBUG: requested patrol does not meet constraints (min or max cats range)"
-                    )
-                continue
+        # make sure the hunting patrols are balanced
+        if patrol_type == "hunting":
+            filtered_patrols = self.balance_hunting(filtered_patrols)
 
-            flag = False
-            for sta, num in patrol.min_max_status.items():
-                if len(num) != 2:
-                    print(f"Issue with status limits: {patrol.patrol_id}")
-                    continue
+        return filtered_patrols, romantic_patrols
 
-                if not (num[0] <= self.patrol_statuses.get(sta, -1) <= num[1]):
-                    flag = True
-                    break
-            if flag:
-                if self.debug_patrol and self.debug_patrol == patrol.patrol_id:
-                    print(
-                        "DEBUG: requested patrol does not meet constraints (min max status)"
-                    )
-                continue
+    def _fits_patrol_cats(self, patrol: PatrolEvent) -> bool:
+        """Checks the requirements of a patrol that depend on the patrol cats and the Clan."""
+        if not self._check_constraints(patrol):
+            return False
 
-            if not event_for_tags(patrol.tags, Cat):
-                if self.debug_patrol and self.debug_patrol == patrol.patrol_id:
-                    print("DEBUG: requested patrol does not meet constraints (tags)")
-                continue
+        # Don't check for repeat patrols if ensure_patrol_id is being used.
+        if (
+            not isinstance(
+                constants.CONFIG["patrol_generation"]["debug_ensure_patrol_id"], str
+            )
+            and patrol.patrol_id in self.used_patrols
+        ):
+            return False
 
-            if biome not in patrol.biome and "any" not in patrol.biome:
-                if self.debug_patrol and self.debug_patrol == patrol.patrol_id:
-                    print("DEBUG: requested patrol does not meet constraints (biome)")
-                continue
-            if camp not in patrol.camp and "any" not in patrol.camp:
-                if self.debug_patrol and self.debug_patrol == patrol.patrol_id:
-                    print("DEBUG: requested patrol does not meet constraints (camp)")
-                continue
-            if current_season not in patrol.season and "any" not in patrol.season:
-                if self.debug_patrol and self.debug_patrol == patrol.patrol_id:
-                    print("DEBUG: requested patrol does not meet constraints (season)")
+        for sta, num in patrol.min_max_status.items():
+            if len(num) != 2:
+                print(f"Issue with status limits: {patrol.patrol_id}")
                 continue
 
-            if "hunting" not in patrol.types and patrol_type == "hunting":
+            if not (num[0] <= self.patrol_statuses.get(sta, -1) <= num[1]):
                 if self.debug_patrol and self.debug_patrol == patrol.patrol_id:
                     print(
-                        "DEBUG: requested patrol does not meet constraints (patrol type)"
-                    )
-                continue
-            elif "border" not in patrol.types and patrol_type == "border":
-                if self.debug_patrol and self.debug_patrol == patrol.patrol_id:
-                    print(
-                        "DEBUG: requested patrol does not meet constraints (patrol type)"
-                    )
-                continue
-            elif "training" not in patrol.types and patrol_type == "training":
-                if self.debug_patrol and self.debug_patrol == patrol.patrol_id:
-                    print(
-                        "DEBUG: requested patrol does not meet constraints (patrol type)"
-                    )
-                continue
-            elif "herb_gathering" not in patrol.types and patrol_type == "med":
-                if self.debug_patrol and self.debug_patrol == patrol.patrol_id:
-                    print(
-                        "DEBUG: requested patrol does not meet constraints (patrol type)"
+                        "DEBUG: requested patrol does not meet constraints (min max status)"
                     )
-                continue
+                return False
 
-            if "romantic" in patrol.tags:
-                romantic_patrols.append(patrol)
-            else:
-                filtered_patrols.append(patrol)
+        if not event_for_tags(patrol.tags, Cat):
+            if self.debug_patrol and self.debug_patrol == patrol.patrol_id:
+                print("DEBUG: requested patrol does not meet constraints (tags)")
+            return False
 
-        # make sure the hunting patrols are balanced
-        if patrol_type == "hunting":
-            filtered_patrols = self.balance_hunting(filtered_patrols)
+        return True
 
-        return filtered_patrols, romantic_patrols
+    def _debug_setting(
+        self,
+        file_path: str,
+        biome: str,
+        camp: str,
+        current_season: str,
+        patrol_type: str,
+        patrol_size: int,
+    ):
+        """Prints why the requested debug patrol was left out of the catalog bucket, if it was."""
+        for patrol in patrol_catalog.get_patrols(file_path):
+            if patrol.patrol_id != self.debug_patrol:
+                continue
+
+            if not (patrol.min_cats <= patrol_size <= patrol.max_cats):
+                print(
+                    "DEBUG: requested patrol does not meet constraints (min or max cats range)"
+                )
+            elif biome not in patrol.biome and "any" not in patrol.biome:
+                print("DEBUG: requested patrol does not meet constraints (biome)")
+            elif camp not in patrol.camp and "any" not in patrol.camp:
+                print("DEBUG: requested patrol does not meet constraints (camp)")
+            elif current_season not in patrol.season and "any" not in patrol.season:
+                print("DEBUG: requested patrol does not meet constraints (season)")
+            elif not fits_setting(
+                patrol, biome, camp, current_season, patrol_type, patrol_size
+            ):
+                print("DEBUG: requested patrol does not meet constraints (patrol type)")
 
     def get_filtered_patrols(
-        self, possible_patrols, biome, camp, current_season, patrol_type
+        self, possible_files, biome, camp, current_season, patrol_type
     ):
         filtered_patrols, romantic_patrols = self._filter_patrols(
-            possible_patrols, biome, camp, current_season, patrol_type
+            possible_files, biome, camp, current_season, patrol_type
         )
 
         if patrol_type == "herb_gathering":
@@ -730,7 +684,7 @@ class Patrol:
             self.used_patrols.clear()
             print("used patrols cleared", self.used_patrols)
             filtered_patrols, romantic_patrols = self._filter_patrols(
-                possible_patrols, biome, camp, current_season, patrol_type
+                possible_files, biome, camp, current_season, patrol_type
             )
 
             if not filtered_patrols:
@@ -740,45 +694,9 @@ class Patrol:
 
         return filtered_patrols, romantic_patrols
 
-    def generate_patrol_events(self, patrol_dict):
-        all_patrol_events = []
-        for patrol in patrol_dict:
-            patrol_event = PatrolEvent(
-                patrol_id=patrol.get("patrol_id"),
-                biome=patrol.get("biome"),
-                camp=patrol.get("camp"),
-                season=patrol.get("season"),
-                tags=patrol.get("tags"),
-                weight=patrol.get("weight", 20),
-                types=patrol.get("types"),
-                intro_text=patrol.get("intro_text"),
-                patrol_art=patrol.get("patrol_art"),
-                patrol_art_clean=patrol.get("patrol_art_clean"),
-                success_outcomes=PatrolOutcome.generate_from_info(
-                    patrol.get("success_outcomes")
-                ),
-                fail_outcomes=PatrolOutcome.generate_from_info(
-                    patrol.get("fail_outcomes"), success=False
-                ),
-                decline_text=patrol.get("decline_text"),
-                chance_of_success=patrol.get("chance_of_success"),
-                min_cats=patrol.get("min_cats", 1),
-                max_cats=patrol.get("max_cats", 6),
-                min_max_status=patrol.get("min_max_status"),
-                antag_success_outcomes=PatrolOutcome.generate_from_info(
-                    patrol.get("antag_success_outcomes"), antagonize=True
-                ),
-                antag_fail_outcomes=PatrolOutcome.generate_from_info(
-                    patrol.get("antag_fail_outcomes"), success=False, antagonize=True
-                ),
-                relationship_constraints=patrol.get("relationship_constraint"),
-                pl_skill_constraints=patrol.get("pl_skill_constraint"),
-                pl_trait_constraints=patrol.get("pl_trait_constraints"),
-            )
-
-            all_patrol_events.append(patrol_event)
-
-        return all_patrol_events
+    @staticmethod
+    def generate_patrol_events(patrol_dict):
+        return generate_patrol_events(patrol_dict)
 
     def determine_outcome(self, antagonize=False) -> Tuple[str, str, Optional[str]]:
         if self.patrol_event is None:
@@ -890,36 +808,6 @@ class Patrol:
 
         return (success_outcome if success else fail_outcome, success)
 
-    def update_resources(self, biome_dir, leaf):
-        resources = [
-            ("HUNTING_SZN", f"{biome_dir}hunting/{leaf}.json"),
-            ("HUNTING", f"{biome_dir}hunting/any.json"),
-            ("BORDER_SZN", f"{biome_dir}border/{leaf}.json"),
-            ("BORDER", f"{biome_dir}border/any.json"),
-            ("TRAINING_SZN", f"{biome_dir}training/{leaf}.json"),
-            ("TRAINING", f"{biome_dir}training/any.json"),
-            ("MEDCAT_SZN", f"{biome_dir}med/{leaf}.json"),
-            ("MEDCAT", f"{biome_dir}med/any.json"),
-            ("NEW_CAT", "new_cat.json"),
-            ("NEW_CAT_HOSTILE", "new_cat_hostile.json"),
-            ("NEW_CAT_WELCOMING", "new_cat_welcoming.json"),
-            ("OTHER_CLAN", "other_clan.json"),
-            ("OTHER_CLAN_HOSTILE", "other_clan_hostile.json"),
-            ("OTHER_CLAN_ALLIES", "other_clan_allies.json"),
-            ("HUNTING_GEN", "general/hunting.json"),
-            ("BORDER_GEN", "general/border.json"),
-            ("MEDCAT_GEN", "general/medcat.json"),
-            ("TRAINING_GEN", "general/training.json"),
-            ("DISASTER", "disaster.json"),
-        ]
-        for patrol_property, location in resources:
-            try:
-                setattr(
-                    self, patrol_property, load_lang_resource(f"patrols/{location}")
-                )
-            except:
-                raise Exception("Something went wrong loading patrols!")
-
     def balance_hunting(self, possible_patrols: list):
         """Filter the incoming hunting patrol list to balance the different kinds of hunting patrols.
         With this filtering, there should be more prey possible patrols.
@@ -0,0 +1,184 @@
+"""
+The patrols of each patrol file, parsed once per language and kept for the whole session.
+
+Starting a patrol used to read every patrol file of the biome and season again
+and build new PatrolEvents from it. The catalog parses each file only once, and
+also keeps the patrols of a file that fit a setting (biome, camp, season, patrol
+type and amount of cats) in buckets, split into normal and romantic patrols.
+Only the checks that depend on the cats of the patrol are left for patrol setup.
+"""
+
+from typing import Dict, List, Tuple
+
+import i18n
+
+from scripts.events_module.patrol.patrol_event import PatrolEvent
+from scripts.events_module.patrol.patrol_outcome import PatrolOutcome
+from scripts.game_structure.localization import load_lang_resource
+
+PATROL_SEASONS = ["greenleaf", "leaf-bare", "leaf-fall", "newleaf", "any"]
+
+PATROL_TYPE_TAGS = {
+    "hunting": "hunting",
+    "border": "border",
+    "training": "training",
+    "med": "herb_gathering",
+}
+"""patrol type: type a patrol needs to be picked for that patrol type"""
+
+
+def get_patrol_files(biome: str, season: str) -> Dict[str, str]:
+    """Returns the patrol files used for the biome and season, by the name of the patrol list."""
+    biome_dir = f"{biome}/"
+    return {
+        "HUNTING_SZN": f"{biome_dir}hunting/{season}.json",
+        "HUNTING": f"{biome_dir}hunting/any.json",
+        "BORDER_SZN": f"{biome_dir}border/{season}.json",
+        "BORDER": f"{biome_dir}border/any.json",
+        "TRAINING_SZN": f"{biome_dir}training/{season}.json",
+        "TRAINING": f"{biome_dir}training/any.json",
+        "MEDCAT_SZN": f"{biome_dir}med/{season}.json",
+        "MEDCAT": f"{biome_dir}med/any.json",
+        "NEW_CAT": "new_cat.json",
+        "NEW_CAT_HOSTILE": "new_cat_hostile.json",
+        "NEW_CAT_WELCOMING": "new_cat_welcoming.json",
+        "OTHER_CLAN": "other_clan.json",
+        "OTHER_CLAN_HOSTILE": "other_clan_hostile.json",
+        "OTHER_CLAN_ALLIES": "other_clan_allies.json",
+        "HUNTING_GEN": "general/hunting.json",
+        "BORDER_GEN": "general/border.json",
+        "MEDCAT_GEN": "general/medcat.json",
+        "TRAINING_GEN": "general/training.json",
+        "DISASTER": "disaster.json",
+    }
+
+
+def generate_patrol_events(patrol_dicts: List[Dict]) -> List[PatrolEvent]:
+    """Builds the PatrolEvents of the patrols in a patrol file."""
+    all_patrol_events = []
+    for patrol in patrol_dicts:
+        patrol_event = PatrolEvent(
+            patrol_id=patrol.get("patrol_id"),
+            biome=patrol.get("biome"),
+            camp=patrol.get("camp"),
+            season=patrol.get("season"),
+            tags=patrol.get("tags"),
+            weight=patrol.get("weight", 20),
+            types=patrol.get("types"),
+            intro_text=patrol.get("intro_text"),
+            patrol_art=patrol.get("patrol_art"),
+            patrol_art_clean=patrol.get("patrol_art_clean"),
+            success_outcomes=PatrolOutcome.generate_from_info(
+                patrol.get("success_outcomes")
+            ),
+            fail_outcomes=PatrolOutcome.generate_from_info(
+                patrol.get("fail_outcomes"), success=False
+            ),
+            decline_text=patrol.get("decline_text"),
+            chance_of_success=patrol.get("chance_of_success"),
+            min_cats=patrol.get("min_cats", 1),
+            max_cats=patrol.get("max_cats", 6),
+            min_max_status=patrol.get("min_max_status"),
+            antag_success_outcomes=PatrolOutcome.generate_from_info(
+                patrol.get("antag_success_outcomes"), antagonize=True
+            ),
+            antag_fail_outcomes=PatrolOutcome.generate_from_info(
+                patrol.get("antag_fail_outcomes"), success=False, antagonize=True
+            ),
+            relationship_constraints=patrol.get("relationship_constraint"),
+            pl_skill_constraints=patrol.get("pl_skill_constraint"),
+            pl_trait_constraints=patrol.get("pl_trait_constraints"),
+        )
+
+        all_patrol_events.append(patrol_event)
+
+    return all_patrol_events
+
+
+def fits_setting(
+    patrol: PatrolEvent,
+    biome: str,
+    camp: str,
+    season: str,
+    patrol_type: str,
+    patrol_size: int,
+) -> bool:
+    """Checks everything about a patrol that doesn't depend on the cats of the patrol or the Clan."""
+    if not patrol.min_cats <= patrol_size <= patrol.max_cats:
+        return False
+    if biome not in patrol.biome and "any" not in patrol.biome:
+        return False
+    if camp not in patrol.camp and "any" not in patrol.camp:
+        return False
+    if season not in patrol.season and "any" not in patrol.season:
+        return False
+    type_tag = PATROL_TYPE_TAGS.get(patrol_type)
+    return type_tag is None or type_tag in patrol.types
+
+
+class PatrolCatalog:
+    """The parsed patrols of each patrol file, and their buckets by setting."""
+
+    def __init__(self):
+        self.files: Dict[Tuple[str, str, str], List[PatrolEvent]] = {}
+        """(locale, fallback, file path): patrols of the file, in file order"""
+        self.buckets: Dict[tuple, Tuple[List[PatrolEvent], List[PatrolEvent]]] = {}
+        """(file key, biome, camp, season, patrol type, patrol size): (normal, romantic) patrols"""
+
+    @staticmethod
+    def file_key(file_path: str) -> Tuple[str, str, str]:
+        return i18n.config.get("locale"), i18n.config.get("fallback"), file_path
+
+    def get_patrols(self, file_path: str) -> List[PatrolEvent]:
+        """Returns the patrols of the file in the current language, parsing it if that wasn't done yet."""
+        key = self.file_key(file_path)
+        if key not in self.files:
+            try:
+                patrol_dicts = load_lang_resource(f"patrols/{file_path}")
+            except:
+                raise Exception("Something went wrong loading patrols!")
+            self.files[key] = generate_patrol_events(patrol_dicts)
+        return self.files[key]
+
+    def get_bucket(
+        self,
+        file_path: str,
+        biome: str,
+        camp: str,
+        season: str,
+        patrol_type: str,
+        patrol_size: int,
+    ) -> Tuple[List[PatrolEvent], List[PatrolEvent]]:
+        """
+        Returns the patrols of the file that fit the setting, as (normal patrols, romantic patrols),
+        both in file order.
+        """
+        key = (
+            self.file_key(file_path),
+            biome,
+            camp,
+            season,
+            patrol_type,
+            patrol_size,
+        )
+        if key not in self.buckets:
+            normal = []
+            romantic = []
+            for patrol in self.get_patrols(file_path):
+                if not fits_setting(
+                    patrol, biome, camp, season, patrol_type, patrol_size
+                ):
+                    continue
+                if "romantic" in patrol.tags:
+                    romantic.append(patrol)
+                else:
+                    normal.append(patrol)
+            self.buckets[key] = (normal, romantic)
+        return self.buckets[key]
+
+    def clear(self):
+        self.files.clear()
+        self.buckets.clear()
+
+
+patrol_catalog = PatrolCatalog()
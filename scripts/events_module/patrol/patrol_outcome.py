@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: ascii -*-
-import random
+from scripts.game_structure.rng import patrols as random
 from os.path import exists as path_exists
-from random import choice, choices
+from scripts.game_structure.rng.patrols import choice, choices
 from typing import List, Dict, Union, TYPE_CHECKING, Optional, Tuple
 
 import i18n
@@ -370,6 +370,9 @@ class PatrolOutcome:
         )
         print(f"Can Have Stat: {self.can_have_stat}")
 
+        # outcomes are shared between patrols, forget the stat cat of the last one
+        self.stat_cat = None
+
         # Grab any specfic stat cat requirements:
         allowed_specific = [
             x
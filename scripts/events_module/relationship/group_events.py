@@ -1,6 +1,6 @@
 import os
-from copy import deepcopy
-from random import choice, shuffle
+from collections import Counter, defaultdict
+from scripts.game_structure.rng.relationships import choice, shuffle
 
 import i18n.config
 
@@ -301,83 +301,33 @@ class GroupEvents:
             the amount of cats for the current interaction
         interact_cats : list
             a list of cats, which are open to interact with the main cat
+
+        Returns
+        -------
+        tuple
+            the set of possible cat ids for each abbreviation of each interaction, and how often
+            each cat is possible for each abbreviation
         """
-        cat_abbreviations_counter = {}
-        possibilities = {}
-        # prepare how the base dictionary should look,
-        # this depends on the chosen cat amount -> which abbreviation are needed
-        base_dictionary = {}
-        for integer in range(amount):
-            new_key = "r_c" + str(integer + 1)
-            base_dictionary[new_key] = []
+        cat_index = InteractionCatIndex(interact_cats)
+        abbreviations = ["r_c" + str(integer + 1) for integer in range(amount)]
+        counts = {abbreviation: Counter() for abbreviation in abbreviations}
 
         # iterate over all interactions and checks for each abbreviation, which cat is possible
+        possibilities = {}
         for interact in interactions:
-            dictionary = deepcopy(base_dictionary)
-
-            for abbreviation in dictionary:
-                dictionary[abbreviation] = []
-                status_ids = []
-                skill_ids = []
-                trait_ids = []
-
-                # if the abbreviation has a status constraint, check in details
-                if abbreviation in interact.status_constraint:
-                    # if the cat status is in the status constraint, add the id to the list
-                    status_ids = [
-                        cat.ID
-                        for cat in interact_cats
-                        if cat.status.rank in interact.status_constraint[abbreviation]
-                    ]
-                else:
-                    # if there is no constraint, add all ids to the list
-                    status_ids = [cat.ID for cat in interact_cats]
-
-                # same as status
-                if abbreviation in interact.skill_constraint:
-                    skill_ids = [
-                        cat.ID
-                        for cat in interact_cats
-                        if cat.skill in interact.skill_constraint[abbreviation]
-                    ]
-                else:
-                    skill_ids = [cat.ID for cat in interact_cats]
-
-                if abbreviation in interact.trait_constraint:
-                    trait_ids = [
-                        cat.ID
-                        for cat in interact_cats
-                        if cat.personality.trait
-                        in interact.trait_constraint[abbreviation]
-                    ]
-                else:
-                    trait_ids = [cat.ID for cat in interact_cats]
-
-                # only add the id if it is in all other lists
-                for cat_id in (cat.ID for cat in interact_cats):
-                    if (
-                        cat_id in status_ids
-                        and cat_id in skill_ids
-                        and cat_id in trait_ids
-                    ):
-                        dictionary[abbreviation].append(cat_id)
-
-                        if (
-                            cat_id in cat_abbreviations_counter
-                            and abbreviation in cat_abbreviations_counter[cat_id]
-                        ):
-                            cat_abbreviations_counter[cat_id][abbreviation] += 1
-                        elif (
-                            cat_id in cat_abbreviations_counter
-                            and abbreviation not in cat_abbreviations_counter[cat_id]
-                        ):
-                            cat_abbreviations_counter[cat_id][abbreviation] = 1
-                        else:
-                            cat_abbreviations_counter[cat_id] = {}
-                            cat_abbreviations_counter[cat_id][abbreviation] = 1
-
+            dictionary = {}
+            for abbreviation in abbreviations:
+                dictionary[abbreviation] = cat_index.matching_ids(
+                    interact, abbreviation
+                )
+                counts[abbreviation].update(dictionary[abbreviation])
             possibilities[interact.id] = dictionary
-        return possibilities, cat_abbreviations_counter
+
+        cat_abbreviations_counter = defaultdict(dict)
+        for abbreviation, counter in counts.items():
+            for cat_id, count in counter.items():
+                cat_abbreviations_counter[cat_id][abbreviation] = count
+        return possibilities, dict(cat_abbreviations_counter)
 
     @staticmethod
     def remove_abbreviations_missing_cats(abbreviations_per_interaction: dict):
@@ -385,16 +335,12 @@ class GroupEvents:
         Check which combinations of abbreviations are allowed and possible and which are not, only return a dictionary,
         with possible combinations together with the id for the interaction.
         """
-        filtered_abbreviations = {}
-        for interaction_id, dictionary in abbreviations_per_interaction.items():
-            # check if there is any abbreviation, which is empty
-            abbr_length = [len(val) for abr, val in dictionary.items()]
-            # if one length is 0 the all function returns false
-            if not all(abbr_length):
-                continue
-
-            filtered_abbreviations[interaction_id] = dictionary
-        return filtered_abbreviations
+        return {
+            interaction_id: dictionary
+            for interaction_id, dictionary in abbreviations_per_interaction.items()
+            # an abbreviation without any possible cat can't be filled
+            if all(dictionary.values())
+        }
 
     @staticmethod
     def set_abbreviations_cats(
@@ -413,20 +359,13 @@ class GroupEvents:
 
             # gets the cat id which fits the abbreviations most of the time
             for cat_id in free_to_choose:
-                # first set some values if there are none
-                if cat_id not in cat_abbreviations_counter:
-                    cat_abbreviations_counter[cat_id] = {}
-                if abbr_key not in cat_abbreviations_counter[cat_id]:
-                    cat_abbreviations_counter[cat_id][abbr_key] = 0
-
-                # find the highest value
-                curr_value = cat_abbreviations_counter[cat_id][abbr_key]
+                curr_value = cat_abbreviations_counter.get(cat_id, {}).get(abbr_key, 0)
                 if highest_value < curr_value:
                     highest_value = curr_value
                     highest_id = cat_id
 
             abbreviations_cat_id[abbr_key] = highest_id
-            if highest_id in free_to_choose:
+            if highest_id is not None:
                 free_to_choose.remove(highest_id)
         return abbreviations_cat_id
 
@@ -441,7 +380,8 @@ class GroupEvents:
         """Check if the interaction is allowed with the current chosen cats."""
         fulfilled_list = []
 
-        for name, rel_constraint in interaction.relationship_constraint.items():
+        constraints = interaction.compiled_relationship_constraint
+        for name, rel_constraint in constraints.items():
             abbre_from = name.split("_to_")[0]
             abbre_to = name.split("_to_")[1]
 
@@ -717,3 +657,63 @@ class GroupEvents:
             )
 
         return process_text(text, replace_dict)
+
+
+class InteractionCatIndex:
+    """The cats open to a group interaction, indexed by their rank and trait, to find the cats
+    which fit an abbreviation of an interaction with set intersections."""
+
+    def __init__(self, interact_cats: list):
+        self.cats = {cat.ID: cat for cat in interact_cats}
+        self.all_ids = frozenset(self.cats)
+        self.ids_by_rank = defaultdict(set)
+        self.ids_by_trait = defaultdict(set)
+        for cat in interact_cats:
+            self.ids_by_rank[cat.status.rank].add(cat.ID)
+            self.ids_by_trait[cat.personality.trait].add(cat.ID)
+        self._matches = {}
+        """(constraint type, constraint): ids of the cats fulfilling it"""
+
+    def matching_ids(
+        self, interaction: GroupInteraction, abbreviation: str
+    ) -> frozenset:
+        """Returns the ids of the cats fulfilling the status, skill and trait constraints of the
+        abbreviation in the interaction."""
+        ids = self.all_ids
+        if abbreviation in interaction.status_constraint:
+            ids = ids & self._get_matches(
+                "status", interaction.status_constraint[abbreviation]
+            )
+        if abbreviation in interaction.trait_constraint:
+            ids = ids & self._get_matches(
+                "trait", interaction.trait_constraint[abbreviation]
+            )
+        if ids and abbreviation in interaction.skill_constraint:
+            ids = ids & self._get_matches(
+                "skill", interaction.skill_constraint[abbreviation]
+            )
+        return ids
+
+    def _get_matches(self, constraint_type: str, constraint: list) -> frozenset:
+        """Returns the ids of the cats fulfilling the constraint, which is only worked out once
+        for all interactions with the same constraint."""
+        key = (constraint_type, tuple(constraint))
+        if key in self._matches:
+            return self._matches[key]
+
+        if constraint_type == "status":
+            ids = frozenset().union(
+                *(self.ids_by_rank.get(rank, ()) for rank in constraint)
+            )
+        elif constraint_type == "trait":
+            ids = frozenset().union(
+                *(self.ids_by_trait.get(trait, ()) for trait in constraint)
+            )
+        else:
+            ids = frozenset(
+                cat_id
+                for cat_id, cat in self.cats.items()
+                if cat.skills.check_skill_requirement_list(constraint)
+            )
+        self._matches[key] = ids
+        return ids
@@ -1,5 +1,5 @@
-import random
-from random import choice, randint
+from scripts.game_structure.rng import relationships as random
+from scripts.game_structure.rng.relationships import choice, randint
 from typing import Dict, List, Union, Optional
 
 import i18n
@@ -8,9 +8,12 @@ from scripts.cat.cats import Cat
 from scripts.cat.enums import CatAge, CatGroup, CatRank, CatSocial
 from scripts.cat.history import History
 from scripts.cat.names import names, Name
+from scripts.cat_relations.family_clusters import family_clusters
 from scripts.cat_relations.relationship import Relationship
+from scripts.cat_relations.relationship_map import RelationshipMap
 from scripts.clan_package.settings import get_clan_setting
 from scripts.event_class import Single_Event
+from scripts.events_module.moon_profiler import profiled
 from scripts.events_module.short.condition_events import Condition_Events
 from scripts.game_structure import constants
 from scripts.game_structure.game_essentials import game
@@ -29,7 +32,6 @@ from scripts.utility import (
 class Pregnancy_Events:
     """All events which are related to pregnancy such as kitting and defining who are the parents."""
 
-    biggest_family = {}
     PREGNANT_STRINGS: Optional[Dict[str, Union[List, Dict[str, List]]]] = {}
     currently_loaded_lang: str = None
 
@@ -42,44 +44,27 @@ class Pregnancy_Events:
         )
         Pregnancy_Events.currently_loaded_lang = i18n.config.get("locale")
 
-    @staticmethod
-    def set_biggest_family():
-        """Gets the biggest family of the clan."""
-        biggest_family = None
-        for cat in Cat.all_cats.values():
-            ancestors = cat.get_relatives()
-            if not biggest_family:
-                biggest_family = ancestors
-                biggest_family.append(cat.ID)
-            elif len(biggest_family) < len(ancestors) + 1:
-                biggest_family = ancestors
-                biggest_family.append(cat.ID)
-        Pregnancy_Events.biggest_family = biggest_family
-
     @staticmethod
     def biggest_family_is_big():
         """Returns if the current biggest family is big enough to 'activates' additional inbreeding counters."""
 
-        living_cats = len(
-            [i for i in Cat.all_cats.values() if i.status.alive_in_player_clan]
-        )
-        return len(Pregnancy_Events.biggest_family) > (living_cats / 10)
+        living_cats = len(Cat.living_clan_pool)
+        return family_clusters.biggest_family_size() > (living_cats / 10)
 
     @staticmethod
+    @profiled("Pregnancy_Events.handle_pregnancy_age")
     def handle_pregnancy_age(clan):
         """Increase the moon for each pregnancy in the pregnancy dictionary"""
         for pregnancy_key in clan.pregnancy_data.keys():
             clan.pregnancy_data[pregnancy_key]["moons"] += 1
 
     @staticmethod
+    @profiled("Pregnancy_Events.handle_having_kits")
     def handle_having_kits(cat, clan):
         """Handles pregnancy of a cat."""
         if not clan:
             return
 
-        if not Pregnancy_Events.biggest_family:
-            Pregnancy_Events.set_biggest_family()
-
         # Handles if a cat is already pregnant
         if cat.ID in clan.pregnancy_data:
             moons = clan.pregnancy_data[cat.ID]["moons"]
@@ -391,7 +376,6 @@ class Pregnancy_Events:
 
         kits = Pregnancy_Events.get_kits(kits_amount, cat, other_cat, clan)
         kits_amount = len(kits)
-        Pregnancy_Events.set_biggest_family()
 
         # delete the cat out of the pregnancy dictionary
         del clan.pregnancy_data[cat.ID]
@@ -414,7 +398,7 @@ class Pregnancy_Events:
                     CatGroup.PLAYER_CLAN
                 ):
                     kit.backstory = "outsider3"
-                kit.relationships = {}
+                kit.relationships = RelationshipMap(kit)
                 kit.create_one_relationship(cat)
 
         insert = i18n.t("conditions.pregnancy.kit_amount", count=kits_amount)
@@ -710,12 +694,9 @@ class Pregnancy_Events:
             special_affair = True
 
         # 'buff' affairs if the current biggest family is big + this cat doesn't belong there
-        if not Pregnancy_Events.biggest_family:
-            Pregnancy_Events.set_biggest_family()
-
         if (
             Pregnancy_Events.biggest_family_is_big()
-            and cat.ID not in Pregnancy_Events.biggest_family
+            and not family_clusters.in_biggest_family(cat.ID)
         ):
             chance = int(chance * 0.8)
 
@@ -949,8 +930,8 @@ class Pregnancy_Events:
                     start_relation.trust = kit_to_parent["trust"] + y
                     kit.relationships[the_cat.ID] = start_relation
                 else:
-                    the_cat.relationships[kit.ID] = Relationship(the_cat, kit)
-                    kit.relationships[the_cat.ID] = Relationship(kit, the_cat)
+                    the_cat.relationships.set_default(kit)
+                    kit.relationships.set_default(the_cat)
 
             #### REMOVE ACCESSORY ######
             kit.pelt.accessory = []
@@ -1229,13 +1210,10 @@ class Pregnancy_Events:
 
         # 'INBREED' counter
         # - increase inverse chance if one of the current cats belongs in the biggest family
-        if not Pregnancy_Events.biggest_family:  # set the family if not already
-            Pregnancy_Events.set_biggest_family()
-
         if (
-            first_parent.ID in Pregnancy_Events.biggest_family
+            family_clusters.in_biggest_family(first_parent.ID)
             or second_parent
-            and second_parent.ID in Pregnancy_Events.biggest_family
+            and family_clusters.in_biggest_family(second_parent.ID)
         ):
             inverse_chance = int(inverse_chance * 1.7)
 
@@ -1,12 +1,17 @@
 import os
-import random
-from random import choice, randint
+from scripts.game_structure.rng import relationships as random
+from scripts.game_structure.rng.relationships import choice, randint
 
 import ujson
 
 from scripts.game_structure import constants
 from scripts.cat.cats import Cat
 from scripts.cat.enums import CatRank
+from scripts.cat_relations.relationship_constraint import (
+    RelationshipConstraint,
+    get_relationship_constraint,
+)
+from scripts.events_module.moon_profiler import profiled
 from scripts.events_module.relationship.group_events import GroupEvents
 from scripts.events_module.relationship.romantic_events import RomanticEvents
 from scripts.events_module.relationship.welcoming_events import Welcoming_Events
@@ -14,6 +19,7 @@ from scripts.utility import (
     get_cats_same_age,
     get_cats_of_romantic_interest,
     get_free_possible_mates,
+    is_same_age,
 )
 
 
@@ -29,8 +35,13 @@ class Relation_Events:
     with open(types_path, "r", encoding="utf-8") as read_file:
         GROUP_TYPES = ujson.load(read_file)
     del base_path
+    GROUP_CONSTRAINTS = {
+        name: RelationshipConstraint(group_type.get("constraint"), f"group type {name}")
+        for name, group_type in GROUP_TYPES.items()
+    }
 
     @staticmethod
+    @profiled("Relation_Events.handle_relationships")
     def handle_relationships(cat: Cat):
         """Checks the relationships of the cat and trigger additional events if possible.
 
@@ -148,18 +159,16 @@ class Relation_Events:
         if not Relation_Events.can_trigger_events(cat):
             return
 
-        same_age_cats = get_cats_same_age(
-            Cat, cat, constants.CONFIG["mates"]["age_range"]
+        age_range = constants.CONFIG["mates"]["age_range"]
+        random_cat = Cat.fetch_random_living_clan_cat(
+            exclude=cat,
+            predicate=lambda inter_cat: inter_cat.ID in cat.relationships
+            and is_same_age(cat, inter_cat, age_range),
         )
-        if len(same_age_cats) > 0:
-            random_cat = choice(same_age_cats)
-            if (
-                Relation_Events.can_trigger_events(random_cat)
-                and random_cat.ID in cat.relationships
-            ):
-                cat.relationships[random_cat.ID].start_interaction()
-                Relation_Events.trigger_event(cat)
-                Relation_Events.trigger_event(random_cat)
+        if random_cat and Relation_Events.can_trigger_events(random_cat):
+            cat.relationships[random_cat.ID].start_interaction()
+            Relation_Events.trigger_event(cat)
+            Relation_Events.trigger_event(random_cat)
 
     @staticmethod
     def group_events(cat):
@@ -182,19 +191,16 @@ class Relation_Events:
 
         if cat.status.is_leader:
             chosen_type = "all"
-        possible_interaction_cats = list(
-            filter(
-                lambda cat: (cat.status.alive_in_player_clan),
-                Cat.all_cats.values(),
-            )
-        )
-        if cat in possible_interaction_cats:
-            possible_interaction_cats.remove(cat)
-
-        if chosen_type != "all":
+        if chosen_type == "all":
+            possible_interaction_cats = [
+                inter_cat
+                for inter_cat in Cat.fetch_living_clan_cats()
+                if inter_cat is not cat
+            ]
+        else:
             possible_interaction_cats = (
                 Relation_Events.cats_with_relationship_constraints(
-                    cat, Relation_Events.GROUP_TYPES[chosen_type]["constraint"]
+                    cat, Relation_Events.GROUP_CONSTRAINTS[chosen_type]
                 )
             )
 
@@ -270,126 +276,28 @@ class Relation_Events:
 
     @staticmethod
     def cats_with_relationship_constraints(main_cat, constraint):
-        """Returns a list of cats, where the relationship from main_cat towards the cat fulfill the given constraints."""
-        cat_list = list(
-            filter(
-                lambda cat: cat.status.alive_in_player_clan,
-                Cat.all_cats.values(),
-            )
-        )
-        cat_list.remove(main_cat)
-        filtered_cat_list = []
-
-        for inter_cat in cat_list:
-            cat_from = main_cat
-            cat_to = inter_cat
-
-            if inter_cat.ID == main_cat.ID:
-                continue
-            if cat_to.ID not in cat_from.relationships:
-                cat_from.create_one_relationship(cat_to)
-                if cat_from.ID not in cat_to.relationships:
-                    cat_to.create_one_relationship(cat_from)
-                continue
+        """Returns a list of cats, where the relationship from main_cat towards the cat fulfill the given constraints.
 
-            relationship = cat_from.relationships[cat_to.ID]
-
-            if "siblings" in constraint and not cat_from.is_sibling(cat_to):
-                continue
-
-            if "mates" in constraint and not relationship.mates:
-                continue
-
-            if "not_mates" in constraint and relationship.mates:
-                continue
-
-            if "parent/child" in constraint and not cat_from.is_parent(cat_to):
-                continue
+        :param Cat main_cat: The cat whose relationships are checked
+        :param constraint: The constraint, either already compiled or a list of tags
+        """
+        if not isinstance(constraint, RelationshipConstraint):
+            constraint = get_relationship_constraint(constraint, "group type")
 
-            if "child/parent" in constraint and not cat_to.is_parent(cat_from):
+        relationships = []
+        for inter_cat in Cat.all_cats.values():
+            if not inter_cat.status.alive_in_player_clan or inter_cat.ID == main_cat.ID:
                 continue
-
-            value_types = [
-                "romantic",
-                "platonic",
-                "dislike",
-                "admiration",
-                "comfortable",
-                "jealousy",
-                "trust",
-            ]
-            fulfilled = True
-            for v_type in value_types:
-                tags = [i for i in constraint if v_type in i]
-                if len(tags) < 1:
-                    continue
-                threshold = 0
-                lower_than = False
-                # try to extract the value/threshold from the text
-                try:
-                    splitted = tags[0].split("_")
-                    threshold = int(splitted[1])
-                    if len(splitted) > 3:
-                        lower_than = True
-                except:
-                    print(
-                        f"ERROR: while creating a cat group, the relationship constraint for the value {v_type} follows not the formatting guidelines."
-                    )
-                    break
-
-                if threshold > 100:
-                    print(
-                        f"ERROR: while creating a cat group, the relationship constraints for the value {v_type}, which is higher than the max value of a relationship."
-                    )
-                    break
-
-                if threshold <= 0:
-                    print(
-                        f"ERROR: while creating a cat group, the relationship constraints for the value {v_type}, which is lower than the min value of a relationship or 0."
-                    )
-                    break
-
-                threshold_fulfilled = False
-                if v_type == "romantic":
-                    if not lower_than and relationship.romantic_love >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.romantic_love <= threshold:
-                        threshold_fulfilled = True
-                if v_type == "platonic":
-                    if not lower_than and relationship.platonic_like >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.platonic_like <= threshold:
-                        threshold_fulfilled = True
-                if v_type == "dislike":
-                    if not lower_than and relationship.dislike >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.dislike <= threshold:
-                        threshold_fulfilled = True
-                if v_type == "comfortable":
-                    if not lower_than and relationship.comfortable >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.comfortable <= threshold:
-                        threshold_fulfilled = True
-                if v_type == "jealousy":
-                    if not lower_than and relationship.jealousy >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.jealousy <= threshold:
-                        threshold_fulfilled = True
-                if v_type == "trust":
-                    if not lower_than and relationship.trust >= threshold:
-                        threshold_fulfilled = True
-                    elif lower_than and relationship.trust <= threshold:
-                        threshold_fulfilled = True
-
-                if not threshold_fulfilled:
-                    fulfilled = False
-                    continue
-
-            if not fulfilled:
+            if inter_cat.ID not in main_cat.relationships:
+                main_cat.create_one_relationship(inter_cat)
+                if main_cat.ID not in inter_cat.relationships:
+                    inter_cat.create_one_relationship(main_cat)
                 continue
+            relationships.append(main_cat.relationships[inter_cat.ID])
 
-            filtered_cat_list.append(inter_cat)
-        return filtered_cat_list
+        return [
+            relationship.cat_to for relationship in constraint.filter(relationships)
+        ]
 
     @staticmethod
     def trigger_event(cat):
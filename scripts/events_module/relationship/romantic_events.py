@@ -1,6 +1,6 @@
-import random
+from scripts.game_structure.rng import relationships as random
 from copy import deepcopy
-from random import choice
+from scripts.game_structure.rng.relationships import choice
 from typing import Dict, List
 
 import i18n
@@ -203,7 +203,9 @@ class RomanticEvents:
                 continue
 
             rel_fulfilled = rel_fulfill_rel_constraints(
-                relationship, interaction.relationship_constraint, interaction.id
+                relationship,
+                interaction.compiled_relationship_constraint,
+                interaction.id,
             )
             if not rel_fulfilled:
                 continue
@@ -1,6 +1,6 @@
 import os
 from copy import deepcopy
-from random import choice
+from scripts.game_structure.rng.relationships import choice
 
 import i18n
 
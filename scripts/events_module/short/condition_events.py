@@ -1,4 +1,4 @@
-import random
+from scripts.game_structure.rng import conditions as random
 from copy import deepcopy
 from typing import Dict, List
 
@@ -19,6 +19,7 @@ from scripts.conditions import (
     get_amount_cat_for_one_medic,
 )
 from scripts.event_class import Single_Event
+from scripts.events_module.moon_profiler import profiled
 from scripts.events_module.short.handle_short_events import handle_short_events
 from scripts.events_module.short.scar_events import Scar_Events
 from scripts.game_structure import constants
@@ -129,6 +130,7 @@ class Condition_Events:
         cls.current_loaded_lang = i18n.config.get("locale")
 
     @staticmethod
+    @profiled("Condition_Events.handle_nutrient")
     def handle_nutrient(cat: Cat, nutrition_info: dict) -> None:
         """
         Handles gaining conditions or death for cats with low nutrient.
@@ -254,6 +256,7 @@ class Condition_Events:
             )
 
     @staticmethod
+    @profiled("Condition_Events.handle_illnesses")
     def handle_illnesses(cat, season=None):
         """
         This function handles the illnesses overall by randomly making cat ill (or not).
@@ -347,6 +350,7 @@ class Condition_Events:
         return triggered
 
     @staticmethod
+    @profiled("Condition_Events.handle_injuries")
     def handle_injuries(cat, random_cat=None):
         """
         This function handles injuries overall by randomly injuring cat (or not).
@@ -845,6 +849,7 @@ class Condition_Events:
         return triggered
 
     @staticmethod
+    @profiled("Condition_Events.handle_already_disabled")
     def handle_already_disabled(cat):
         """
         this function handles what happens if the cat already has a permanent condition.
@@ -1,4 +1,11 @@
-from random import choice, choices, randrange, sample, randint
+from scripts.game_structure.rng.events import (
+    choice,
+    choices,
+    randrange,
+    sample,
+    randint,
+)
+from copy import copy
 from typing import List
 
 import i18n
@@ -151,6 +158,7 @@ class HandleShortEvents:
             possible_short_events = GenerateEvents.possible_short_events(
                 frequency,
                 event_type,
+                sub_types=None if ignore_subtyping else self.sub_types,
             )
 
             chosen_event, random_cat = GenerateEvents.filter_possible_short_events(
@@ -161,10 +169,8 @@ class HandleShortEvents:
                 other_clan=self.other_clan,
                 freshkill_active=FRESHKILL_EVENT_ACTIVE,
                 freshkill_trigger_factor=FRESHKILL_EVENT_TRIGGER_FACTOR,
-                sub_types=self.sub_types,
                 allowed_events=self.allowed_events,
                 excluded_events=self.excluded_events,
-                ignore_subtyping=ignore_subtyping,
             )
             if not chosen_event:
                 # we'll see if any more common events are available
@@ -174,7 +180,8 @@ class HandleShortEvents:
         #                               do the event                                   #
         # ---------------------------------------------------------------------------- #
         if chosen_event:
-            self.chosen_event = chosen_event
+            # the event is shared with the event catalog, its text is changed further down
+            self.chosen_event = copy(chosen_event)
             self.random_cat = random_cat
             self.future_event_failed = False
         else:
@@ -1,4 +1,4 @@
-import random
+from scripts.game_structure.rng import conditions as random
 
 import i18n
 
@@ -1,5 +1,9 @@
 from scripts.game_structure.game.save_load.save_load import (
     safe_save,
+    safe_delete,
     save_clanlist,
     read_clans,
+    save_transaction,
+    wait_for_save,
+    on_save_failed,
 )
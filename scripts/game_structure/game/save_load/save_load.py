@@ -1,12 +1,244 @@
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from shutil import move as shutil_move
-from typing import Union, List
+from typing import Callable, Dict, Optional, Union, List, Set, Tuple
 
 import ujson
 
+from scripts.game_structure.propagating_thread import PropagatingThread
 from scripts.housekeeping.datadir import get_temp_dir, get_save_dir
 
+JOURNAL_FILE_NAME = "save_journal.json"
+"""Lists the files of a save that are being moved into place, see recover_interrupted_save"""
+
+_transaction_state = threading.local()
+"""Holds the save transaction open on the current thread, if any"""
+
+_last_save_thread: Optional[PropagatingThread] = None
+"""Worker thread of the last committed save transaction"""
+
+
+class SaveTransaction:
+    """Collects the files written and deleted by safe_save and safe_delete while it is open,
+    and writes them all at once on a worker thread when committed.
+
+    The data is turned into text when it is added, so the worker thread never reads game
+    objects that the game might change while it writes. Every file is first written to a
+    temporary file next to it. Once all of them are written and synced to disk, they are
+    renamed into place, then the deleted files are removed. The renames and deletes are
+    recorded in a journal first, so a save interrupted at any point either keeps all the
+    old files or can be completed by recover_interrupted_save."""
+
+    def __init__(self):
+        self.writes: Dict[str, str] = {}
+        """path: text to write, later writes to the same path replace earlier ones"""
+        self.deletes: Set[str] = set()
+        """paths to delete once the files are written"""
+        self.failure_callbacks: List[Callable] = []
+        """called if the files can't be written, see on_save_failed"""
+        self.thread: Optional[PropagatingThread] = None
+
+    def add(self, path: Union[str, Path], write_data):
+        """Adds a file to write. If write_data is not a string, it is written in json format."""
+        if type(write_data) is not str:
+            write_data = ujson.dumps(write_data, indent=4)
+        path = os.path.normpath(path)
+        self.deletes.discard(path)
+        self.writes[path] = write_data
+
+    def delete(self, path: Union[str, Path]):
+        """Adds a file to delete, if it exists once the files are written."""
+        path = os.path.normpath(path)
+        self.writes.pop(path, None)
+        self.deletes.add(path)
+
+    def commit(self, wait=False) -> Optional[PropagatingThread]:
+        """Starts writing the collected files on a worker thread.
+
+        :param wait: Block until the files are written, raising any error, default False
+        :return: the worker thread, None if there was nothing to write
+        """
+        global _last_save_thread
+
+        if not self.writes and not self.deletes:
+            return None
+
+        self.thread = PropagatingThread(
+            target=self._write_or_fail,
+            args=(self.writes, sorted(self.deletes)),
+            name="save_thread",
+        )
+        self.thread.start()
+        _last_save_thread = self.thread
+        if wait:
+            # the error is raised here, not again by the next wait_for_save
+            wait_for_save()
+        return self.thread
+
+    def failed(self):
+        """Tells everything that counted on the files being written that they weren't."""
+        for callback in self.failure_callbacks:
+            callback()
+
+    def _write_or_fail(self, writes: Dict[str, str], deletes: List[str]):
+        try:
+            self._write_all(writes, deletes)
+        except BaseException:
+            self.failed()
+            raise
+
+    @staticmethod
+    def _write_all(writes: Dict[str, str], deletes: List[str]):
+        temp_paths = {}
+        try:
+            for path, write_data in writes.items():
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temp_path = path + ".tmp"
+                temp_paths[path] = temp_path
+                with open(temp_path, "w", encoding="utf-8") as write_file:
+                    write_file.write(write_data)
+                    write_file.flush()
+                    os.fsync(write_file.fileno())
+        except BaseException:
+            # nothing has been replaced yet, the old save is left as it was
+            for temp_path in temp_paths.values():
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            raise
+
+        journal_path = os.path.join(get_save_dir(), JOURNAL_FILE_NAME)
+        safe_save(
+            journal_path,
+            ujson.dumps({"renames": list(temp_paths.items()), "deletes": deletes}),
+        )
+        _sync_dir(os.path.dirname(journal_path))
+
+        _apply_journal(list(temp_paths.items()), deletes)
+
+        os.remove(journal_path)
+
+
+def _apply_journal(renames: List[Tuple[str, str]], deletes: List[str]):
+    """Moves the written files of a save into place, then removes its deleted files."""
+    for path, temp_path in renames:
+        if os.path.exists(temp_path):
+            os.replace(temp_path, path)
+    for path in deletes:
+        if os.path.exists(path):
+            os.remove(path)
+    for dir_name in {os.path.dirname(path) for path, _ in renames} | {
+        os.path.dirname(path) for path in deletes
+    }:
+        _sync_dir(dir_name)
+
+
+def _sync_dir(dir_name: str):
+    """Makes sure the renames inside the directory are on disk. Directories can't be
+    opened on Windows, where renames don't need this."""
+    try:
+        dir_fd = os.open(dir_name, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+@contextmanager
+def save_transaction(wait=False):
+    """Batches every safe_save call made on this thread inside the with block into one
+    SaveTransaction, which is committed when the block exits without an error.
+
+    :param wait: Block until the files are written, default False. Otherwise, use
+        transaction.thread or wait_for_save to know when the save is done.
+    """
+    wait_for_save()
+
+    transaction = SaveTransaction()
+    outer = getattr(_transaction_state, "transaction", None)
+    _transaction_state.transaction = transaction
+    try:
+        yield transaction
+    except BaseException:
+        transaction.failed()
+        raise
+    finally:
+        _transaction_state.transaction = outer
+    transaction.commit(wait)
+
+
+def on_save_failed(callback: Callable):
+    """Calls the callback if the files of the save transaction open on this thread can't be
+    written, which can happen on the worker thread after the transaction was committed.
+    Outside a transaction, safe_save raises any error itself and the callback isn't needed.
+    """
+    transaction = getattr(_transaction_state, "transaction", None)
+    if transaction is not None:
+        transaction.failure_callbacks.append(callback)
+
+
+def wait_for_save(raise_error=True):
+    """Blocks until the last committed save transaction is written to disk.
+
+    :param raise_error: Raise any error that happened while writing it, default True.
+        Otherwise, the error is kept to be raised by the next call that does.
+    """
+    global _last_save_thread
+
+    thread = _last_save_thread
+    if thread is None or thread is threading.current_thread():
+        return
+    try:
+        thread.join()
+    except BaseException:
+        if raise_error:
+            _last_save_thread = None
+            raise
+        return
+    _last_save_thread = None
+
+
+def recover_interrupted_save():
+    """Completes a save transaction that was interrupted while moving its files into place.
+    All of its files were already written, so they are moved like the save would have.
+    A save interrupted before its journal was written didn't replace anything, only the
+    temporary files it left behind are removed.
+    """
+    journal_path = os.path.join(get_save_dir(), JOURNAL_FILE_NAME)
+    if not os.path.exists(journal_path):
+        _remove_temp_files()
+        return
+
+    try:
+        with open(journal_path, "r", encoding="utf-8") as read_file:
+            journal = ujson.loads(read_file.read())
+        renames = journal["renames"]
+        deletes = journal["deletes"]
+    except (IOError, ujson.JSONDecodeError, KeyError, TypeError):
+        # the journal itself was not finished, so none of the files were moved yet
+        print("WARNING: Found an unfinished save journal, it was discarded.")
+        os.remove(journal_path)
+        _remove_temp_files()
+        return
+
+    _apply_journal(renames, deletes)
+    print(f"Completed an interrupted save of {len(renames) + len(deletes)} files.")
+    os.remove(journal_path)
+
+
+def _remove_temp_files():
+    """Removes the temporary files of saves that were interrupted before their journal
+    was written. Must not be called while a save is being written."""
+    for dir_name, _, file_names in os.walk(get_save_dir()):
+        for file_name in file_names:
+            if file_name.endswith(".tmp"):
+                os.remove(os.path.join(dir_name, file_name))
+
 
 def safe_save(
     path: Union[str, Path], write_data, check_integrity=False, max_attempts: int = 15
@@ -15,7 +247,15 @@ def safe_save(
     in json format. If check_integrity is true, it will read back the file
     to check that the correct data has been written to the file.
     If not, it will simply write the data to the file with no other
-    checks."""
+    checks.
+
+    Inside a save_transaction block, the write is added to the transaction instead.
+    """
+
+    transaction = getattr(_transaction_state, "transaction", None)
+    if transaction is not None and not check_integrity:
+        transaction.add(path, write_data)
+        return
 
     # If write_data is not a string,
     if type(write_data) is not str:
@@ -66,6 +306,21 @@ def safe_save(
             os.fsync(write_file.fileno())
 
 
+def safe_delete(path: Union[str, Path]):
+    """Deletes a file of the save, if it exists.
+
+    Inside a save_transaction block, the file is only deleted once the files of the
+    transaction are written, so a failed save doesn't lose it.
+    """
+    transaction = getattr(_transaction_state, "transaction", None)
+    if transaction is not None:
+        transaction.delete(path)
+        return
+
+    if os.path.exists(path):
+        os.remove(path)
+
+
 def save_clanlist(loaded_clan=None, only_switch=False):
     """
     Save clanlist to file
@@ -104,6 +359,13 @@ def read_clans():
         print("Created saves folder")
         return None
 
+    try:
+        # a save still being written would look interrupted
+        wait_for_save()
+    except (RuntimeError, OSError):
+        print("ERROR: The last save could not be written.")
+    recover_interrupted_save()
+
     # Now we can get a list of all the folders in the saves folder
     clan_list: List[str] = [d.name for d in save_dir.iterdir() if d.is_dir()]
     clan_list.sort()  # because iterdir doesn't guarantee an order, we guarantee alphabetical here
@@ -1,7 +1,8 @@
+import itertools
 import logging
 import os
 from math import floor
-from random import choice
+from scripts.game_structure.rng.events import choice
 
 import i18n
 import ujson
@@ -9,7 +10,12 @@ import ujson
 from scripts.cat.cats import Cat, BACKSTORIES
 from ..cat.enums import CatGroup, CatRank
 from scripts.cat.pelts import Pelt
+from scripts.cat.history_cache import history_cache
+from scripts.cat.infections import infection_tracker
+from scripts.cat_relations import relationship_store
+from scripts.cat_relations.family_clusters import family_clusters
 from scripts.cat_relations.inheritance import Inheritance
+from scripts.cat_relations.relationship_map import RelationshipMap
 from scripts.game_structure.game.switches import (
     switch_get_value,
     switch_set_value,
@@ -43,6 +49,14 @@ def json_load():
     Cat.all_cats.clear()
     Cat.all_cats_list.clear()
     Cat.dead_cats.clear()
+    Cat.status_index.clear()
+    Cat.living_clan_pool.clear()
+    Inheritance.possible_children.clear()
+    family_clusters.clear()
+    history_cache.clear()
+    infection_tracker.clear()
+    # new cats get the same IDs as they would right after starting the game
+    Cat.id_iter = itertools.count()
     all_cats = []
     clanname = switch_get_value(Switch.clan_list)[0]
     clan_cats_json_path = f"{get_save_dir()}/{clanname}/clan_cats.json"
@@ -310,7 +324,7 @@ def json_load():
                 if cat.relationships is not None and len(cat.relationships) < 1:
                     cat.init_all_relationships()
             else:
-                cat.relationships = {}
+                cat.relationships = RelationshipMap(cat)
         except Exception as e:
             logger.exception(
                 f"There was an error loading relationships for cat #{cat}."
@@ -342,6 +356,9 @@ def json_load():
         if constants.CONFIG["save_load"]["load_integrity_checks"]:
             save_check()
 
+    # all relationships are loaded, the store isn't needed anymore
+    relationship_store.clear_loaded_store()
+
 
 def csv_load(all_cats):
     if switch_get_value(Switch.clan_list)[0].strip() == "":
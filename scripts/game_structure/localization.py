@@ -1,5 +1,7 @@
 import os.path
-from typing import List, Dict, Union, Optional
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Tuple, Union, Optional
 
 import i18n
 import i18n.translations
@@ -14,6 +16,16 @@ _directory_changed: bool = False
 
 default_pronouns: Dict[str, Dict[str, Dict[str, Union[str, int]]]] = {}
 
+RESOURCE_CACHE_SIZE = 256
+"""Maximum amount of parsed lang resources kept in memory"""
+
+_resource_cache: "OrderedDict[Tuple[str, str, str, str], object]" = OrderedDict()
+"""(locale, fallback, root directory, location): parsed resource, least recently used first"""
+_resource_cache_locale: Optional[Tuple[str, str]] = None
+"""(locale, fallback) the cached resources were loaded for"""
+resource_cache_stats = {"hits": 0, "misses": 0}
+_resource_cache_lock = threading.Lock()
+
 
 def get_new_pronouns(genderalign: str) -> List[Dict[str, Union[str, int]]]:
     """
@@ -74,14 +86,44 @@ def load_lang_resource(location: str, *, root_directory=None):
     :param root_directory: for testing only.
     :return: Whatever resource was there, from either the locale or fallback
     :exception FileNotFoundError: If requested resource doesn't exist in selected locale or fallback
+
+    The parsed resources are cached, so the returned object is shared between callers
+    and must not be modified. Copy it first if you need to change it.
     """
+    global _resource_cache_locale
     location = os.path.normpath(location)
     locale, fallback = str(i18n.config.get("locale")), str(i18n.config.get("fallback"))
     if root_directory is None:
         root_directory = os.path.join("resources", "lang")
+    location = location.lstrip("\\/")  # just in case someone is an egg and does add it
+
+    key = (locale, fallback, root_directory, location)
+    with _resource_cache_lock:
+        if _resource_cache_locale != (locale, fallback):
+            _resource_cache.clear()
+            _resource_cache_locale = (locale, fallback)
+
+        try:
+            resource = _resource_cache[key]
+        except KeyError:
+            resource_cache_stats["misses"] += 1
+        else:
+            resource_cache_stats["hits"] += 1
+            _resource_cache.move_to_end(key)
+            return resource
+
+    resource = _read_lang_resource(location, locale, fallback, root_directory)
+
+    with _resource_cache_lock:
+        _resource_cache[key] = resource
+        if len(_resource_cache) > RESOURCE_CACHE_SIZE:
+            _resource_cache.popitem(last=False)
+    return resource
+
+
+def _read_lang_resource(location: str, locale: str, fallback: str, root_directory):
     resource_directory = os.path.join(root_directory, locale)
     fallback_directory = os.path.join(root_directory, fallback)
-    location = location.lstrip("\\/")  # just in case someone is an egg and does add it
     try:
         with open(
             os.path.join(resource_directory, location.replace("{lang}", locale)),
@@ -122,6 +164,13 @@ def set_lang_config_directory(directory: str):
     global _lang_config_directory, _directory_changed
     _lang_config_directory = directory
     _directory_changed = True
+    clear_lang_resource_cache()
+
+
+def clear_lang_resource_cache():
+    """Drops every cached lang resource, so they are read from disk again."""
+    with _resource_cache_lock:
+        _resource_cache.clear()
 
 
 def get_default_pronouns(lang=None):
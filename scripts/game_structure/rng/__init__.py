@@ -0,0 +1,69 @@
+"""
+Separate random number streams for the parts of a moon skip.
+
+Events, conditions, relationships, patrols and cat generation each draw from
+their own ``random.Random``, instead of sharing the global one of the
+``random`` module. At the start of every moon skip all streams are seeded from
+the seed of the clan (saved with it) and the moon, so skipping the same moon of
+the same save again gives the same moon, and a change to how often one part of
+the game rolls a dice doesn't change the rolls of the others.
+
+Modules use a stream by importing it in place of ``random``:
+
+    from scripts.game_structure.rng import conditions as random
+    from scripts.game_structure.rng.conditions import choice, randint
+
+Streams are only ever seeded again and never replaced, so the functions
+imported from them stay valid. The global ``random`` is left alone, it is used by
+the screens and audio and shouldn't repeat itself whenever a moon is skipped.
+"""
+
+import random
+import secrets
+from typing import Dict
+
+STREAM_NAMES = ("events", "conditions", "relationships", "patrols", "generation")
+
+
+class RandomStreams:
+    """The random number streams, by name."""
+
+    def __init__(self):
+        self.streams: Dict[str, random.Random] = {
+            name: random.Random() for name in STREAM_NAMES
+        }
+        self.seed = None
+        """clan seed the streams were last seeded with, None if they weren't"""
+        self.moon = None
+        """moon the streams were last seeded for"""
+
+    def __getitem__(self, name: str) -> random.Random:
+        return self.streams[name]
+
+    @staticmethod
+    def new_seed() -> int:
+        """Returns a seed for a new clan, which doesn't depend on the seeds of other clans."""
+        return secrets.randbits(64)
+
+    def seed_streams(self, clan_seed: int, moon: int):
+        """
+        Seeds every stream for a moon skip. The same clan seed and moon always give the same numbers.
+
+        :param clan_seed: The seed saved with the clan
+        :param moon: Age of the clan the moon skip starts from
+        """
+        self.seed = clan_seed
+        self.moon = moon
+        for name, stream in self.streams.items():
+            stream.seed(f"{clan_seed}:{moon}:{name}")
+
+    def getstate(self) -> Dict[str, tuple]:
+        """Returns the state of every stream, to be restored with setstate."""
+        return {name: stream.getstate() for name, stream in self.streams.items()}
+
+    def setstate(self, state: Dict[str, tuple]):
+        for name, stream in self.streams.items():
+            stream.setstate(state[name])
+
+
+random_streams = RandomStreams()
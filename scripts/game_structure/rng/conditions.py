@@ -0,0 +1,15 @@
+"""The random number stream of illnesses, injuries and scars, see scripts/game_structure/rng."""
+
+from scripts.game_structure.rng import random_streams
+
+_stream = random_streams["conditions"]
+
+random = _stream.random
+randint = _stream.randint
+randrange = _stream.randrange
+choice = _stream.choice
+choices = _stream.choices
+sample = _stream.sample
+shuffle = _stream.shuffle
+getrandbits = _stream.getrandbits
+uniform = _stream.uniform
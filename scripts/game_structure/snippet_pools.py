@@ -0,0 +1,124 @@
+"""
+The snippets of snippet_collections.json, which are put into prophecies, omens,
+clairvoyance, dreams and stories.
+
+A snippet list is a list of groups, and one snippet is drawn from each of a few
+different groups. The groups are stored once per language as tuples, put
+together by list, biome and sense when the snippets are loaded. Drawing
+snippets doesn't join or copy the lists, and nothing changes them, so they
+don't grow while the game is played.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import i18n
+
+from scripts.game_structure.localization import load_lang_resource
+from scripts.game_structure.rng.events import choice, sample
+
+SENSES = {
+    "prophecy_list": ("sight", "sound", "smell", "emotional", "touch"),
+    "omen_list": ("sight", "sound", "smell", "emotional", "touch"),
+    "clair_list": ("taste", "sound", "smell", "emotional", "touch"),
+}
+"""list with sense groups: the senses used if none are asked for"""
+
+Pool = Tuple[Tuple[str, ...], ...]
+
+
+class SnippetPools:
+    """The snippet groups of the current language, by list, biome and senses."""
+
+    def __init__(self):
+        self.locale = None
+        """language the snippets were loaded for"""
+        self.pools: Dict[Tuple[str, Optional[str], Tuple[str, ...]], Pool] = {}
+        """(list, biome or None, senses): groups of snippets"""
+
+    def load(self):
+        """Loads the snippets of the current language."""
+        snippets = load_lang_resource("snippet_collections.json")
+        pools = {}
+
+        pools[("dream_list", None, ())] = _freeze(snippets["dream_list"])
+
+        story_list = snippets["story_list"]
+        for biome, groups in story_list.items():
+            if biome == "general" or biome.startswith("comment"):
+                continue
+            pools[("story_list", biome, ())] = _freeze(story_list["general"], groups)
+
+        for list_name in SENSES:
+            for sense, sense_groups in snippets[list_name].items():
+                if not isinstance(sense_groups, dict):
+                    # a comment
+                    continue
+                for biome, groups in sense_groups.items():
+                    if biome == "general":
+                        continue
+                    pools[(list_name, biome, (sense,))] = _freeze(
+                        sense_groups["general"], groups
+                    )
+
+        self.pools = pools
+        self.locale = i18n.config.get("locale")
+
+    def get_pool(
+        self, list_name: str, biome: str, senses: Optional[Iterable[str]] = None
+    ) -> Pool:
+        """
+        Returns the groups of snippets of the list for the biome and senses.
+
+        :param list_name: The snippet list, e.g. "omen_list"
+        :param biome: The biome of the clan, casefolded
+        :param senses: The senses of the snippets, default None for all of them. Ignored for
+            lists without senses.
+        """
+        if self.locale != i18n.config.get("locale"):
+            self.load()
+
+        if list_name == "dream_list":
+            biome = None
+        if list_name in SENSES:
+            senses = tuple(senses) if senses else SENSES[list_name]
+        else:
+            senses = ()
+
+        key = (list_name, biome, senses)
+        pool = self.pools.get(key)
+        if pool is None:
+            # more than one sense, joined the first time it is asked for
+            pool = self.pools[key] = tuple(
+                group
+                for sense in senses
+                for group in self.pools[(list_name, biome, (sense,))]
+            )
+        return pool
+
+    def draw(
+        self,
+        list_name: str,
+        biome: str,
+        amount: int,
+        senses: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """
+        Returns one snippet of each of amount different groups of the list.
+
+        :param list_name: The snippet list, e.g. "omen_list"
+        :param biome: The biome of the clan, casefolded
+        :param amount: The amount of snippets
+        :param senses: The senses of the snippets, default None for all of them
+        """
+        return [
+            choice(group)
+            for group in sample(self.get_pool(list_name, biome, senses), k=amount)
+        ]
+
+
+def _freeze(*lists_of_groups: list) -> Pool:
+    """Joins the lists of groups into one tuple of tuples."""
+    return tuple(tuple(group) for groups in lists_of_groups for group in groups)
+
+
+snippet_pools = SnippetPools()
@@ -0,0 +1,202 @@
+"""
+Strings with cat abbreviations like "m_c" and pronoun tags like
+"{PRONOUN/m_c/subject}", as used by events, patrols, thoughts and histories,
+parsed once into templates.
+
+A template is a list of tokens: text, the name of a cat, or a pronoun tag with
+its parts already split. Filling it in for some cats only joins the tokens
+with their names and pronouns, instead of searching the string with regular
+expressions again. Templates are cached by the string and the abbreviations it
+is filled in with, so a string from the resources is only parsed once for each
+set of abbreviations.
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from scripts.game_structure import localization
+from scripts.game_structure.localization import determine_plural_pronouns
+from scripts.game_structure.rng.events import choice
+
+logger = logging.getLogger(__name__)
+
+PRONOUN_TAG = re.compile(r"(?<!%)\{(.*?)}")
+"""a pronoun, verb or adjective tag, unless the brace is escaped with %"""
+
+TEXT = 0
+NAME = 1
+PRONOUN = 2
+
+Token = Tuple[int, object]
+
+
+def render_pronoun_tag(
+    tag: str, details: Tuple[str, ...], cat_pronouns_dict: Dict, raise_exception=False
+) -> str:
+    """
+    Returns the word a pronoun tag stands for. If raise_exception is False, any error in
+    pronoun formatting will not raise an exception, and will use a simple replacement "error".
+
+    :param tag: The whole tag, including the braces
+    :param details: The parts of the tag between the braces, split at "/"
+    :param cat_pronouns_dict: abbreviation: (name, pronouns) of the cats
+    :param raise_exception: Raise an exception for a tag that isn't formatted correctly
+    """
+    # Add protection about the "insert" sometimes used
+    if tag == "{insert}":
+        return tag
+
+    inner_details = list(details)
+    out = None
+
+    try:
+        if inner_details[1].upper() == "PLURAL":
+            inner_details.pop(1)  # remove plural tag so it can be processed as normal
+            catlist = []
+            for cat in inner_details[1].split("+"):
+                try:
+                    catlist.append(cat_pronouns_dict[cat][1])
+                except KeyError:
+                    print(f"Missing pronouns for {cat}")
+                    continue
+            d = determine_plural_pronouns(catlist)
+        else:
+            try:
+                d = cat_pronouns_dict[inner_details[1]][1]
+            except KeyError:
+                if inner_details[0].upper() == "ADJ":
+                    # find the default - this is a semi-expected behaviour for the adj tag as it may be called when
+                    # there is no relevant cat
+                    return inner_details[localization.get_default_adj()]
+                else:
+                    logger.warning(
+                        f"Could not get pronouns for {inner_details[1]}. Using default."
+                    )
+                    print(
+                        f"Could not get pronouns for {inner_details[1]}. Using default."
+                    )
+                    d = choice(localization.get_new_pronouns("default"))
+
+        if inner_details[0].upper() == "PRONOUN":
+            out = d[inner_details[2]]
+        elif inner_details[0].upper() == "VERB":
+            out = inner_details[d["conju"] + 1]
+        elif inner_details[0].upper() == "ADJ":
+            out = inner_details[(d["gender"] + 2) if "gender" in d else 2]
+
+        if out is not None:
+            if inner_details[-1] == "CAP":
+                out = out.capitalize()
+            return out
+
+        if raise_exception:
+            raise KeyError(
+                f"Pronoun tag: {'/'.join(details)} is not properly"
+                "indicated as a PRONOUN or VERB tag."
+            )
+
+        print("Failed to find pronoun:", "/".join(details))
+        return "error1"
+    except (KeyError, IndexError) as e:
+        if raise_exception:
+            raise
+
+        logger.exception("Failed to find pronoun: " + "/".join(details))
+        print("Failed to find pronoun:", "/".join(details))
+        return "error2"
+
+
+class TextTemplate:
+    """A string parsed into text, names and pronoun tags."""
+
+    __slots__ = ("tokens",)
+
+    def __init__(self, text: str, abbreviations: Tuple[str, ...]):
+        """
+        :param text: The string to parse
+        :param abbreviations: The abbreviations of the cats that will be filled in, in the order
+            they are looked for
+        """
+        self.tokens: List[Token] = []
+        name_pattern = get_name_pattern(abbreviations)
+
+        # "{insert}" stays in the text, so names are looked for around it like in the rest of the text
+        plain_text = []
+        position = 0
+        for match in PRONOUN_TAG.finditer(text):
+            plain_text.append(text[position : match.start()])
+            position = match.end()
+            if match.group(0) == "{insert}":
+                plain_text.append(match.group(0))
+                continue
+            self._add_text("".join(plain_text), name_pattern)
+            plain_text = []
+            self.tokens.append(
+                (PRONOUN, (match.group(0), tuple(match.group(1).split("/"))))
+            )
+        plain_text.append(text[position:])
+        self._add_text("".join(plain_text), name_pattern)
+
+    def _add_text(self, text: str, name_pattern):
+        """Adds text without pronoun tags, split into the text and the names in it."""
+        position = 0
+        if name_pattern:
+            for match in name_pattern.finditer(text):
+                if match.start() > position:
+                    self.tokens.append((TEXT, text[position : match.start()]))
+                self.tokens.append((NAME, match.group(0)))
+                position = match.end()
+        if position < len(text):
+            self.tokens.append((TEXT, text[position:]))
+
+    def render(self, cat_dict: Dict, raise_exception=False) -> str:
+        """
+        Returns the text with the names and pronouns of the cats filled in.
+
+        :param cat_dict: abbreviation: (name, pronouns) of the cats, with the abbreviations the
+            template was parsed for
+        :param raise_exception: Raise an exception for a pronoun tag that isn't formatted correctly
+        """
+        parts = []
+        for kind, value in self.tokens:
+            if kind == TEXT:
+                parts.append(value)
+            elif kind == NAME:
+                parts.append(cat_dict[value][0])
+            else:
+                parts.append(
+                    render_pronoun_tag(value[0], value[1], cat_dict, raise_exception)
+                )
+        return "".join(parts)
+
+
+@lru_cache(maxsize=256)
+def get_name_pattern(abbreviations: Tuple[str, ...]):
+    """Returns the pattern finding the abbreviations in text, or None if there are none."""
+    if not abbreviations:
+        return None
+    return re.compile(
+        "|".join(
+            r"(?<!\{)" + re.escape(abbreviation) + r"(?!\})"
+            for abbreviation in abbreviations
+        )
+    )
+
+
+@lru_cache(maxsize=8192)
+def get_template(text: str, abbreviations: Tuple[str, ...]) -> TextTemplate:
+    """Returns the template of the text, parsed the first time it is used with these abbreviations."""
+    return TextTemplate(text, abbreviations)
+
+
+def fill_in_text(text: str, cat_dict: Dict, raise_exception=False) -> str:
+    """
+    Returns the text with the names and pronouns of the cats filled in.
+
+    :param text: The text with abbreviations and pronoun tags
+    :param cat_dict: abbreviation: (name, pronouns) of the cats
+    :param raise_exception: Raise an exception for a pronoun tag that isn't formatted correctly
+    """
+    return get_template(text, tuple(cat_dict)).render(cat_dict, raise_exception)
@@ -33,6 +33,7 @@ from scripts.utility import (
     shorten_text_to_fit,
     ui_scale_dimensions,
     ui_scale_value,
+    inflate_mask,
 )
 
 
@@ -364,23 +365,15 @@ class UIImageButton(pygame_gui.elements.UIButton):
             # set in utility.py:update_mask
             val = pygame.mask.from_surface(val, threshold=250)
 
-            inflated_mask = pygame.Mask(
+            self._mask = inflate_mask(
+                val,
+                self.mask_padding,
                 (
                     self.relative_rect[2] + self.mask_padding * 2,
                     self.relative_rect[3] + self.mask_padding * 2,
-                )
+                ),
+                (self.mask_padding, self.mask_padding),
             )
-            inflated_mask.draw(val, (self.mask_padding, self.mask_padding))
-            for _ in range(self.mask_padding):
-                outline = inflated_mask.outline()
-                for point in outline:
-                    for dx in range(-1, 2):
-                        for dy in range(-1, 2):
-                            try:
-                                inflated_mask.set_at((point[0] + dx, point[1] + dy), 1)
-                            except IndexError:
-                                continue
-            self._mask = inflated_mask
         self.mask_info[0] = (
             self.rect[0] - self.mask_padding,
             self.rect[1] - self.mask_padding,
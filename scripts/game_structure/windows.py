@@ -22,6 +22,7 @@ from scripts.cat.history import History
 from scripts.cat.names import Name
 from scripts.cat.save_load import save_cats
 from scripts.game_structure import image_cache
+from scripts.game_structure.game.save_load import save_transaction
 from scripts.game_structure.game.switches import (
     Switch,
     switch_get_value,
@@ -344,10 +345,11 @@ class SaveCheck(UIWindow):
                 if game.clan is not None:
                     self.save_button_saving_state.show()
                     self.save_button.disable()
-                    save_cats(switch_get_value(Switch.clan_name), Cat, game)
-                    game.clan.save_clan()
-                    game.clan.save_pregnancy(game.clan)
-                    game.save_events()
+                    with save_transaction(wait=True):
+                        save_cats(switch_get_value(Switch.clan_name), Cat, game)
+                        game.clan.save_clan()
+                        game.clan.save_pregnancy(game.clan)
+                        game.save_events()
                     self.save_button_saving_state.hide()
                     self.save_button_saved_state.show()
             elif event.ui_element == self.back_button:
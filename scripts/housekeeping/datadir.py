@@ -7,6 +7,9 @@ from scripts.housekeeping.version import get_version_info
 
 logger = logging.getLogger(__name__)
 
+_data_dir_override = None
+"""data directory used instead of the default one, see set_data_dir"""
+
 
 def setup_data_dir():
     os.makedirs(get_data_dir(), exist_ok=True)
@@ -22,14 +25,24 @@ def setup_data_dir():
 
     # Windows requires elevated permissions to create symlinks.
     # The OpenDataDirectory.bat can be used instead as "shortcut".
-    if platform.system() != "Windows":
+    if platform.system() != "Windows" and _data_dir_override is None:
         if os.path.exists("game_data"):
             os.remove("game_data")
         if not get_version_info().is_source_build:
             os.symlink(get_data_dir(), "game_data", target_is_directory=True)
 
 
+def set_data_dir(path):
+    """Uses another directory for the saves, logs and cache, e.g. to keep the clans of
+    simulate.py apart from the game's. None goes back to the default one."""
+    global _data_dir_override
+    _data_dir_override = path
+
+
 def get_data_dir():
+    if _data_dir_override is not None:
+        return _data_dir_override
+
     if get_version_info().is_source_build:
         return "."
 
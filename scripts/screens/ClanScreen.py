@@ -8,6 +8,7 @@ from pygame_gui.core import ObjectID
 
 from scripts.cat.cats import Cat
 from scripts.game_structure import image_cache, constants
+from scripts.game_structure.game.save_load import save_transaction, wait_for_save
 from scripts.game_structure.game.settings import game_settings_save, game_setting_get
 from scripts.game_structure.game_essentials import (
     game,
@@ -54,29 +55,20 @@ class ClanScreen(Screens):
         self.leader_den_label = None
         self.warrior_den_label = None
         self.layout = None
+        self.save_thread = None
 
     def on_use(self):
         if not get_clan_setting("backgrounds"):
             self.set_bg(None)
+        if self.save_thread is not None and not self.save_thread.is_alive():
+            self.finish_save()
         super().on_use()
 
     def handle_event(self, event):
         if event.type == pygame_gui.UI_BUTTON_START_PRESS:
             self.mute_button_pressed(event)
             if event.ui_element == self.save_button:
-                try:
-                    self.save_button_saving_state.show()
-                    self.save_button.disable()
-                    save_cats(switch_get_value(Switch.clan_name), Cat, game)
-                    game.clan.save_clan()
-                    game.clan.save_pregnancy(game.clan)
-                    game.save_events()
-                    game_settings_save(self)
-                    switch_set_value(Switch.saved_clan, True)
-                    self.update_buttons_and_text()
-                except RuntimeError:
-                    SaveError(traceback.format_exc())
-                    self.change_screen("start screen")
+                self.save_clan()
             if event.ui_element in self.cat_buttons:
                 switch_set_value(Switch.cat, event.ui_element.return_cat_id())
                 self.change_screen("profile screen")
@@ -102,15 +94,40 @@ class ClanScreen(Screens):
             elif event.key == pygame.K_LEFT:
                 self.change_screen("events screen")
             elif event.key == pygame.K_SPACE:
-                self.save_button_saving_state.show()
-                self.save_button.disable()
+                self.save_clan()
+
+    def save_clan(self):
+        """Starts saving the Clan. The files are written on a worker thread, on_use
+        finishes the save once they are all written."""
+        self.save_button_saving_state.show()
+        self.save_button.disable()
+        try:
+            with save_transaction() as transaction:
                 save_cats(switch_get_value(Switch.clan_name), Cat, game)
                 game.clan.save_clan()
                 game.clan.save_pregnancy(game.clan)
                 game.save_events()
                 game_settings_save(self)
-                switch_set_value(Switch.saved_clan, True)
-                self.update_buttons_and_text()
+        except RuntimeError:
+            SaveError(traceback.format_exc())
+            self.change_screen("start screen")
+            return
+
+        self.save_thread = transaction.thread
+        if self.save_thread is None:
+            self.finish_save()
+
+    def finish_save(self):
+        self.save_thread = None
+        try:
+            # raises any error from writing the files
+            wait_for_save()
+        except (RuntimeError, OSError):
+            SaveError(traceback.format_exc())
+            self.change_screen("start screen")
+            return
+        switch_set_value(Switch.saved_clan, True)
+        self.update_buttons_and_text()
 
     def screen_switches(self):
         super().screen_switches()
@@ -355,7 +372,8 @@ class ClanScreen(Screens):
         self.show_den_labels_text.kill()
         del self.show_den_labels_text
 
-        # reset save status
+        # reset save status, a save still being written is finished by the next save
+        self.save_thread = None
         switch_set_value(Switch.saved_clan, False)
 
     def update_camp_bg(self):
@@ -123,9 +123,9 @@ class ClearingScreen(Screens):
                     self.tactic_tab.enable()
                     self.handle_tab_toggles()
             elif event.ui_element == self.feed_all_button:
-                game.clan.freshkill_pile.already_fed = []
+                game.clan.freshkill_pile.already_fed = set()
                 game.clan.freshkill_pile.feed_cats(self.hungry_cats, True)
-                game.clan.freshkill_pile.already_fed = []
+                game.clan.freshkill_pile.already_fed = set()
                 self.update_cats_list()
                 self.update_nutrition_cats()
                 self.update_focus_cat()
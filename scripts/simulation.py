@@ -0,0 +1,280 @@
+"""
+Runs moon skips without the game's screens, to measure how fast they are.
+
+A clan is either generated from a seed or loaded from the saves. Generated
+clans are founded like a clan made in the game, then get the dead cats and
+outsiders a long-running save collects, so the amount of cats can be scaled up
+without every cat needing a relationship to every other cat. They are saved like
+any other clan, without changing which clan the game loads when it starts, so
+the exact same clan can be loaded again later.
+
+The entry point is ``simulate.py`` in the root of the repository, which sets
+up pygame without a display before this module is imported.
+"""
+
+import hashlib
+import os
+import platform
+import shutil
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import pygame
+import ujson
+
+from scripts.cat.cats import Cat, create_cat
+from scripts.cat.enums import CatRank
+from scripts.cat.save_load import save_cats
+from scripts.cat.sprites import sprites
+from scripts.clan import Clan, clan_class
+from scripts.clan_package.settings import set_clan_setting
+from scripts.events import events_class
+from scripts.events_module.moon_profiler import moon_profiler
+from scripts.game_structure.game.save_load import read_clans, save_clanlist
+from scripts.game_structure.game.switches import switch_set_value, Switch
+from scripts.game_structure.game_essentials import game
+from scripts.game_structure.load_cat import load_cats, version_convert
+from scripts.game_structure.rng import random_streams
+from scripts.game_structure.rng.generation import randint
+from scripts.housekeeping.datadir import get_save_dir
+from scripts.utility import create_new_cat
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+@dataclass
+class Scenario:
+    """A clan to generate and the amount of moons to skip with it."""
+
+    living: int
+    """cats living in the clan, including the leader, deputy and medicine cat"""
+    dead: int = 0
+    outside: int = 0
+    moons: int = 10
+    game_mode: str = "expanded"
+
+    @property
+    def cats(self) -> int:
+        return self.living + self.dead + self.outside
+
+
+BENCHMARK_SCENARIOS: Dict[str, Scenario] = {
+    "50": Scenario(living=50, moons=20),
+    "200": Scenario(living=150, dead=40, outside=10, moons=10),
+    "1000": Scenario(living=300, dead=600, outside=100, moons=5),
+    "5000": Scenario(living=400, dead=4400, outside=200, moons=3),
+}
+"""name: scenario, named by the amount of cats in the clan"""
+
+LIVING_RANKS = [CatRank.WARRIOR] * 5 + [
+    CatRank.APPRENTICE,
+    CatRank.KITTEN,
+    CatRank.ELDER,
+    CatRank.MEDIATOR,
+]
+"""ranks given in turn to the living cats after the leader, deputy and medicine cat"""
+
+
+def setup_headless():
+    """Opens the (hidden) display and loads the sprites, which are needed to generate cats."""
+    pygame.display.set_mode((800, 700))
+    sprites.load_all()
+
+
+def get_peak_rss() -> Optional[int]:
+    """Returns the peak resident memory of the process in bytes, or None if it isn't known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS gives bytes, Linux kilobytes
+    return peak if platform.system() == "Darwin" else peak * 1024
+
+
+def generate_clan(name: str, scenario: Scenario, seed: int):
+    """
+    Creates and saves a new clan for the scenario.
+
+    :param name: Name of the clan, also the name of its save
+    :param scenario: Amount and kinds of cats to generate
+    :param seed: Seed for everything that is random about the clan
+    """
+    # new cats are drawn from the streams, which are otherwise only seeded by moon skips
+    random_streams.seed_streams(seed, 0)
+    loaded_clans = read_clans()
+
+    leader = create_cat(CatRank.LEADER)
+    deputy = create_cat(CatRank.DEPUTY)
+    medicine_cat = create_cat(CatRank.MEDICINE_CAT)
+    members = [
+        create_cat(LIVING_RANKS[i % len(LIVING_RANKS)])
+        for i in range(max(scenario.living - 3, 0))
+    ]
+    game.clan = Clan(
+        name=name,
+        leader=leader,
+        deputy=deputy,
+        medicine_cat=medicine_cat,
+        starting_members=members,
+        camp_bg="camp1",
+        game_mode=scenario.game_mode,
+    )
+    game.clan.rng_seed = seed
+    game.clan.create_clan()
+
+    for _ in range(scenario.dead):
+        dead_cat = create_new_cat(Cat, alive=False)[0]
+        dead_cat.dead_for = randint(1, 150)
+    for _ in range(scenario.outside):
+        create_new_cat(Cat, outside=True)
+    # these cats are from long before, nobody grieves them anymore
+    Cat.dead_cats.clear()
+    Cat.grief_strings.clear()
+
+    save_cats(name, Cat, game)
+    game.clan.save_clan()
+    # the game should still load the clan it had loaded before
+    save_clanlist(loaded_clans[0] if loaded_clans else None)
+
+
+def get_clan_name(scenario: Scenario, seed: int) -> str:
+    """Returns the name generated clans are saved under, which is the same for the same scenario and seed."""
+    return (
+        f"Sim{scenario.living}l{scenario.dead}d{scenario.outside}o"
+        f"{scenario.game_mode.replace(' ', '')}s{seed}"
+    )
+
+
+def prepare_clan(scenario: Scenario, seed: int, regenerate: bool = False) -> str:
+    """
+    Loads the clan of the scenario, generating it first if it wasn't saved before.
+    Returns the name of the clan.
+
+    :param scenario: Amount and kinds of cats of the clan
+    :param seed: Seed the clan is generated with
+    :param regenerate: Set True to generate the clan again even if it was saved before, default False
+    """
+    name = get_clan_name(scenario, seed)
+    save_path = os.path.join(get_save_dir(), name)
+    if regenerate and os.path.isdir(save_path):
+        shutil.rmtree(save_path)
+        if os.path.exists(save_path + "clan.json"):
+            os.remove(save_path + "clan.json")
+    if not os.path.isdir(save_path):
+        generate_clan(name, scenario, seed)
+    # load the saved clan even if it was just generated, so every run starts out the same
+    load_clan(name)
+    return name
+
+
+def load_clan(name: str):
+    """Loads a saved clan the way the game does when it starts."""
+    clan_list = read_clans() or []
+    if name not in clan_list:
+        raise ValueError(f"There is no saved clan called {name}")
+    clan_list.remove(name)
+    switch_set_value(Switch.clan_list, [name] + clan_list)
+    switch_set_value(Switch.clan_name, name)
+
+    load_cats()
+    version_convert(clan_class.load_clan())
+    game.load_events()
+
+
+def stock_freshkill_pile():
+    """Adds the prey the clan needs for the next moon, like the hunting patrols of a player would."""
+    pile = game.clan.freshkill_pile
+    if pile:
+        pile.add_freshkill(max(pile.amount_food_needed() - pile.total_amount, 0))
+
+
+def run_moons(moons: int, seed: Optional[int] = None, hunt: bool = True) -> Dict:
+    """
+    Skips moons with the loaded clan and returns what was measured.
+
+    :param moons: Amount of moon skips
+    :param seed: Seed of the clan's random number streams, default None to keep the clan's own seed
+    :param hunt: Stock the freshkill pile before each moon, so the clan doesn't starve without
+        patrols, default True
+    """
+    if seed is not None:
+        game.clan.rng_seed = seed
+    # saving is not what is being measured
+    set_clan_setting("autosave", False)
+
+    cats_before = len(Cat.all_cats)
+    moon_profiler.reset()
+    moon_profiler.enabled = True
+    moon_seconds: List[float] = []
+    digests: List[str] = []
+    try:
+        for _ in range(moons):
+            if hunt:
+                stock_freshkill_pile()
+            start = time.perf_counter()
+            events_class.one_moon()
+            moon_seconds.append(time.perf_counter() - start)
+            digests.append(get_moon_digest())
+    finally:
+        moon_profiler.enabled = False
+
+    total = sum(moon_seconds)
+    return {
+        "moons": moons,
+        "cats_before": cats_before,
+        "cats_after": len(Cat.all_cats),
+        "living_after": len(Cat.living_clan_pool),
+        "seconds": total,
+        "moons_per_second": moons / total if total else None,
+        "moon_seconds": moon_seconds,
+        "moon_digests": digests,
+        "peak_rss": get_peak_rss(),
+        "phases": {
+            ";".join(path): {"total": timing[0], "self": timing[1], "calls": timing[2]}
+            for path, timing in moon_profiler.phases.items()
+        },
+    }
+
+
+def get_moon_digest() -> str:
+    """
+    Returns a hash of the events of the last moon skip and the state of every cat after it.
+    Two moon skips with the same digest went the same way.
+    """
+    events = [
+        str(getattr(event, "text", event))
+        for event in game.cur_events_list
+        + game.herb_events_list
+        + game.freshkill_events_list
+    ]
+    cats = [
+        (cat.ID, str(cat.name), cat.moons, cat.dead, str(cat.status.rank))
+        for cat in sorted(Cat.all_cats.values(), key=lambda cat: int(cat.ID))
+    ]
+    data = ujson.dumps({"events": events, "cats": cats}, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def replay_moons(
+    name: str, moons: int, seed: Optional[int] = None, hunt: bool = True
+) -> Optional[int]:
+    """
+    Skips moons with a saved clan twice, loading it again in between, and returns the first
+    moon that went differently the second time, or None if every moon went the same way.
+
+    :param name: Name of the saved clan
+    :param moons: Amount of moon skips
+    :param seed: Seed of the clan's random number streams, default None to keep the clan's own seed
+    :param hunt: Stock the freshkill pile before each moon, default True
+    """
+    load_clan(name)
+    first = run_moons(moons, seed, hunt)["moon_digests"]
+    load_clan(name)
+    second = run_moons(moons, seed, hunt)["moon_digests"]
+    for moon, (first_digest, second_digest) in enumerate(zip(first, second), start=1):
+        if first_digest != second_digest:
+            return moon
+    return None
@@ -9,9 +9,19 @@ TODO: Docs
 import logging
 import os
 import re
+import weakref
+from functools import lru_cache
 from itertools import combinations
 from math import floor
-from random import choice, choices, randint, random, sample, randrange, getrandbits
+from scripts.game_structure.rng.events import (
+    choice,
+    choices,
+    randint,
+    random,
+    sample,
+    randrange,
+    getrandbits,
+)
 from sys import exit as sys_exit
 from typing import List, Tuple, TYPE_CHECKING, Type, Union
 
@@ -21,14 +31,12 @@ import ujson
 from pygame_gui.core import ObjectID
 
 from scripts.clan_package.settings import get_clan_setting
+from scripts.game_structure.game.save_load import wait_for_save
 from scripts.game_structure.game.settings import game_settings_save, game_setting_get
 from scripts.game_structure.game.switches import switch_get_value, Switch
 from scripts.cat.status import StatusDict
-from scripts.game_structure.localization import (
-    load_lang_resource,
-    determine_plural_pronouns,
-    get_lang_config,
-)
+from scripts.cat_relations.relationship_constraint import get_relationship_constraint
+from scripts.game_structure.localization import load_lang_resource, get_lang_config
 
 logger = logging.getLogger(__name__)
 from scripts.game_structure import image_cache, localization, constants
@@ -36,6 +44,8 @@ from scripts.cat.enums import CatAge, CatRank, CatSocial, CatGroup, CatStanding
 from scripts.cat.names import names
 from scripts.cat.sprites import sprites
 from scripts.game_structure.game_essentials import game
+from scripts.game_structure.snippet_pools import snippet_pools
+from scripts.game_structure.text_templates import fill_in_text, render_pronoun_tag
 import scripts.game_structure.screen_settings  # must be done like this to get updates when we change screen size etc
 
 if TYPE_CHECKING:
@@ -102,11 +112,7 @@ def find_alive_cats_with_rank(
     :param bool sort: default False, set to True if you would like list sorted by descending moon age
     """
 
-    alive_cats = [
-        i
-        for i in Cat.all_cats.values()
-        if i.status.rank in ranks and i.status.alive_in_player_clan
-    ]
+    alive_cats = Cat.fetch_living_clan_cats(ranks)
 
     if working:
         alive_cats = [i for i in alive_cats if not i.not_working()]
@@ -123,10 +129,10 @@ def get_living_cat_count(Cat):
     :param Cat: Cat class
     """
     count = 0
-    for the_cat in Cat.all_cats.values():
-        if the_cat.dead:
+    for group in (None, *CatGroup):
+        if group and group.is_afterlife():
             continue
-        count += 1
+        count += len(Cat.fetch_cats_in_group(group))
     return count
 
 
@@ -135,12 +141,7 @@ def get_living_clan_cat_count(Cat):
     Returns the int of all living cats within the Clan
     :param Cat: Cat class
     """
-    count = 0
-    for the_cat in Cat.all_cats.values():
-        if not the_cat.status.alive_in_player_clan:
-            continue
-        count += 1
-    return count
+    return len(Cat.fetch_living_clan_cats())
 
 
 def get_cats_same_age(Cat, cat, age_range=10):
@@ -151,9 +152,7 @@ def get_cats_same_age(Cat, cat, age_range=10):
     :param int age_range: The allowed age difference between the two cats, default 10
     """
     cats = []
-    for inter_cat in Cat.all_cats.values():
-        if not inter_cat.status.alive_in_player_clan:
-            continue
+    for inter_cat in Cat.fetch_living_clan_cats():
         if inter_cat.ID == cat.ID:
             continue
 
@@ -163,21 +162,29 @@ def get_cats_same_age(Cat, cat, age_range=10):
                 inter_cat.create_one_relationship(cat)
             continue
 
-        if (
-            inter_cat.moons <= cat.moons + age_range
-            and inter_cat.moons <= cat.moons - age_range
-        ):
+        if is_same_age(cat, inter_cat, age_range):
             cats.append(inter_cat)
 
     return cats
 
 
+def is_same_age(cat, other_cat, age_range=10) -> bool:
+    """
+    Returns if the other cat is in the same age range as the given cat, as used by get_cats_same_age.
+    :param cat: the given cat
+    :param other_cat: the cat to compare with
+    :param int age_range: The allowed age difference between the two cats, default 10
+    """
+    return (
+        other_cat.moons <= cat.moons + age_range
+        and other_cat.moons <= cat.moons - age_range
+    )
+
+
 def get_free_possible_mates(cat):
     """Returns a list of available cats, which are possible mates for the given cat."""
     cats = []
-    for inter_cat in cat.all_cats.values():
-        if not inter_cat.status.alive_in_player_clan:
-            continue
+    for inter_cat in cat.fetch_living_clan_cats():
         if inter_cat.ID == cat.ID:
             continue
 
@@ -1071,9 +1078,7 @@ def get_personality_compatibility(cat1, cat2):
 def get_cats_of_romantic_interest(cat):
     """Returns a list of cats, those cats are love interest of the given cat"""
     cats = []
-    for inter_cat in cat.all_cats.values():
-        if not inter_cat.status.alive_in_player_clan:
-            continue
+    for inter_cat in cat.fetch_living_clan_cats():
         if inter_cat.ID == cat.ID:
             continue
 
@@ -1150,7 +1155,7 @@ def filter_relationship_type(
     :param list[str] filter_types: the relationship types to check for. possible types: "siblings", "mates",
     "mates_with_pl" (PATROL ONLY), "not_mates", "parent/child", "child/parent", "mentor/app", "app/mentor",
     (following tags check if value is over given int) "romantic_int", "platonic_int", "dislike_int", "comfortable_int",
-    "jealousy_int", "trust_int"
+    "jealousy_int", "trust_int", "admiration_int", add "_lower" to check if the value is under it instead
     :param str event_id: if the event has an ID, include it here
     :param Cat patrol_leader: if you are testing a patrol, ensure you include the self.patrol_leader here
     """
@@ -1168,16 +1173,7 @@ def filter_relationship_type(
         "mentor/app",
         "app/mentor",
     ]
-
-    possible_value_types = [
-        "romantic",
-        "platonic",
-        "dislike",
-        "comfortable",
-        "jealousy",
-        "trust",
-        "admiration",
-    ]
+    # the value types are in scripts/cat_relations/relationship_constraint.py
 
     if "siblings" in filter_types:
         test_cat = group[0]
@@ -1272,104 +1268,24 @@ def filter_relationship_type(
             return False
 
     # Filtering relationship values
-    break_loop = False
-    for v_type in possible_value_types:
-        # first get all tags for current value types
-        tags = [constraint for constraint in filter_types if v_type in constraint]
-
-        # If there is not a tag for the current value type, check next one
-        if len(tags) == 0:
-            continue
-
-            # there should be only one value constraint for each value type
-        elif len(tags) > 1:
-            print(
-                f"ERROR: event {event_id} has multiple relationship constraints for the value {v_type}."
-            )
-            break_loop = True
-            break
-
-        # try to extract the value/threshold from the text
-        try:
-            threshold = int(tags[0].split("_")[1])
-        except:
-            print(
-                f"ERROR: event {event_id} with the relationship constraint for the value does not {v_type} follow the formatting guidelines."
-            )
-            break_loop = True
-            break
-
-        if threshold > 100:
-            print(
-                f"ERROR: event {event_id} has a relationship constraint for the value {v_type}, which is higher than the max value of a relationship."
-            )
-            break_loop = True
-            break
-
-        if threshold <= 0:
-            print(
-                f"ERROR: event {event_id} has a relationship constraint for the value {v_type}, which is lower than the min value of a relationship or 0."
-            )
-            break_loop = True
-            break
-
-        # each cat has to have relationships with this relationship value above the threshold
-        fulfilled = True
-        for inter_cat in group:
-            rel_above_threshold = []
-            group_ids = [cat.ID for cat in group]
-            relevant_relationships = list(
-                filter(
-                    lambda rel: rel.cat_to.ID in group_ids
-                    and rel.cat_to.ID != inter_cat.ID,
-                    list(inter_cat.relationships.values()),
-                )
-            )
-
-            # get the relationships depending on the current value type + threshold
-            if v_type == "romantic":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.romantic_love >= threshold
-                ]
-            elif v_type == "platonic":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.platonic_like >= threshold
-                ]
-            elif v_type == "dislike":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.dislike >= threshold
-                ]
-            elif v_type == "comfortable":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.comfortable >= threshold
-                ]
-            elif v_type == "jealousy":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.jealousy >= threshold
-                ]
-            elif v_type == "trust":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.trust >= threshold
-                ]
-            elif v_type == "admiration":
-                rel_above_threshold = [
-                    i for i in relevant_relationships if i.admiration >= threshold
-                ]
-
-            # if the lengths are not equal, one cat has not the relationship value which is needed to another cat of
-            # the event
-            if len(rel_above_threshold) + 1 != len(group):
-                fulfilled = False
-                break
-
-        if not fulfilled:
-            break_loop = True
-            break
-
-    # if break is used in the loop, the condition are not fulfilled
-    # and this event should not be added to the filtered list
-    if break_loop:
+    constraint = get_relationship_constraint(filter_types, f"event {event_id}")
+    if constraint.malformed:
         return False
+    if not constraint.thresholds:
+        return True
+
+    # each cat has to have relationships with this relationship value above the threshold
+    group_ids = {cat.ID for cat in group}
+    for inter_cat in group:
+        relevant_relationships = [
+            rel
+            for rel in inter_cat.relationships.values()
+            if rel.cat_to.ID in group_ids and rel.cat_to.ID != inter_cat.ID
+        ]
+        # if the lengths are not equal, one cat has not the relationship value which is needed to another cat of
+        # the event
+        if len(constraint.filter_values(relevant_relationships)) + 1 != len(group):
+            return False
 
     return True
 
@@ -1738,69 +1654,9 @@ def pronoun_repl(m, cat_pronouns_dict, raise_exception=False):
     """Helper function for add_pronouns. If raise_exception is
     False, any error in pronoun formatting will not raise an
     exception, and will use a simple replacement "error" """
-
-    # Add protection about the "insert" sometimes used
-    if m.group(0) == "{insert}":
-        return m.group(0)
-
-    inner_details = m.group(1).split("/")
-    out = None
-
-    try:
-        if inner_details[1].upper() == "PLURAL":
-            inner_details.pop(1)  # remove plural tag so it can be processed as normal
-            catlist = []
-            for cat in inner_details[1].split("+"):
-                try:
-                    catlist.append(cat_pronouns_dict[cat][1])
-                except KeyError:
-                    print(f"Missing pronouns for {cat}")
-                    continue
-            d = determine_plural_pronouns(catlist)
-        else:
-            try:
-                d = cat_pronouns_dict[inner_details[1]][1]
-            except KeyError:
-                if inner_details[0].upper() == "ADJ":
-                    # find the default - this is a semi-expected behaviour for the adj tag as it may be called when
-                    # there is no relevant cat
-                    return inner_details[localization.get_default_adj()]
-                else:
-                    logger.warning(
-                        f"Could not get pronouns for {inner_details[1]}. Using default."
-                    )
-                    print(
-                        f"Could not get pronouns for {inner_details[1]}. Using default."
-                    )
-                    d = choice(localization.get_new_pronouns("default"))
-
-        if inner_details[0].upper() == "PRONOUN":
-            out = d[inner_details[2]]
-        elif inner_details[0].upper() == "VERB":
-            out = inner_details[d["conju"] + 1]
-        elif inner_details[0].upper() == "ADJ":
-            out = inner_details[(d["gender"] + 2) if "gender" in d else 2]
-
-        if out is not None:
-            if inner_details[-1] == "CAP":
-                out = out.capitalize()
-            return out
-
-        if raise_exception:
-            raise KeyError(
-                f"Pronoun tag: {m.group(1)} is not properly"
-                "indicated as a PRONOUN or VERB tag."
-            )
-
-        print("Failed to find pronoun:", m.group(1))
-        return "error1"
-    except (KeyError, IndexError) as e:
-        if raise_exception:
-            raise
-
-        logger.exception("Failed to find pronoun: " + m.group(1))
-        print("Failed to find pronoun:", m.group(1))
-        return "error2"
+    return render_pronoun_tag(
+        m.group(0), tuple(m.group(1).split("/")), cat_pronouns_dict, raise_exception
+    )
 
 
 def name_repl(m, cat_dict):
@@ -1809,16 +1665,10 @@ def name_repl(m, cat_dict):
 
 
 def process_text(text, cat_dict, raise_exception=False):
-    """Add the correct name and pronouns into a string."""
-    adjust_text = re.sub(
-        r"(?<!%)\{(.*?)}", lambda x: pronoun_repl(x, cat_dict, raise_exception), text
-    )
-
-    name_patterns = [r"(?<!\{)" + re.escape(l) + r"(?!\})" for l in cat_dict]
-    adjust_text = re.sub(
-        "|".join(name_patterns), lambda x: name_repl(x, cat_dict), adjust_text
-    )
-    return adjust_text
+    """Add the correct name and pronouns into a string.
+    The string is parsed into a template the first time it is used with these abbreviations,
+    see scripts/game_structure/text_templates.py"""
+    return fill_in_text(text, cat_dict, raise_exception)
 
 
 def adjust_list_text(list_of_items: List) -> str:
@@ -1894,48 +1744,9 @@ def get_special_snippet_list(
     biome = (
         game.clan.biome if not game.clan.override_biome else game.clan.override_biome
     ).casefold()
-    global SNIPPETS
-    if langs["snippet"] != i18n.config.get("locale"):
-        langs["snippet"] = i18n.config.get("locale")
-        SNIPPETS = load_lang_resource("snippet_collections.json")
-
-    # these lists don't get sense specific snippets, so is handled first
-    if chosen_list in ["dream_list", "story_list"]:
-        if (
-            chosen_list == "story_list"
-        ):  # story list has some biome specific things to collect
-            snippets = SNIPPETS[chosen_list]["general"]
-            snippets.extend(SNIPPETS[chosen_list][biome])
-        elif (
-            chosen_list == "clair_list"
-        ):  # the clair list also pulls from the dream list
-            snippets = SNIPPETS[chosen_list]
-            snippets.extend(SNIPPETS["dream_list"])
-        else:  # the dream list just gets the one
-            snippets = SNIPPETS[chosen_list]
-
-    else:
-        # if no sense groups were specified, use all of them
-        if not sense_groups:
-            if chosen_list == "clair_list":
-                sense_groups = ["taste", "sound", "smell", "emotional", "touch"]
-            else:
-                sense_groups = ["sight", "sound", "smell", "emotional", "touch"]
 
-        # find the correct lists and compile them
-        snippets = []
-        for sense in sense_groups:
-            snippet_group = SNIPPETS[chosen_list][sense]
-            snippets.extend(snippet_group["general"])
-            snippets.extend(snippet_group[biome])
-
-    # now choose a unique snippet from each snip list
-    unique_snippets = []
-    for snip_list in snippets:
-        unique_snippets.append(choice(snip_list))
-
-    # pick out our final snippets
-    final_snippets = sample(unique_snippets, k=amount)
+    # choose a snippet from each of amount different snippet groups
+    final_snippets = snippet_pools.draw(chosen_list, biome, amount, sense_groups)
 
     if return_string:
         text = adjust_list_text(final_snippets)
@@ -1944,10 +1755,12 @@ def get_special_snippet_list(
         return final_snippets
 
 
+@lru_cache(maxsize=1024)
 def find_special_list_types(text):
     """
     purely to identify which senses are being called for by a snippet abbreviation
-    returns adjusted text, sense list, list type, and cat_tag
+    returns adjusted text, sense tuple, list type, and cat_tag
+    the result is cached, as the same event texts are checked again and again
     """
     senses = []
     list_text = None
@@ -2000,7 +1813,7 @@ def find_special_list_types(text):
 
     text = text.replace(list_text, list_type)
 
-    return text, senses, list_type, cat_tag
+    return text, tuple(senses), list_type, cat_tag
 
 
 def history_text_adjust(text, other_clan_name, clan, other_cat_rc=None):
@@ -2611,35 +2424,52 @@ def update_sprite(cat):
     cat.all_cats[cat.ID] = cat
 
 
+_sprite_masks: "weakref.WeakKeyDictionary[pygame.Surface, tuple]" = (
+    weakref.WeakKeyDictionary()
+)
+"""sprite: (scaled size, mask) of the sprites masks were made for"""
+
+
 def update_mask(cat):
     if cat.faded or cat.dead:
         # should never need a mask since they can't appear on the Clan screen
         cat.sprite_mask = None
         return
 
-    val = pygame.mask.from_surface(
-        pygame.transform.scale(cat.sprite, ui_scale_dimensions((50, 50))), threshold=250
-    )
+    # cats that look the same share their sprite, so they can share the mask too
+    sprite = cat.sprite
+    size = ui_scale_dimensions((50, 50))
+    cached = _sprite_masks.get(sprite)
+    if cached is not None and cached[0] == size:
+        cat.sprite_mask = cached[1]
+        return
 
-    inflated_mask = pygame.Mask(
-        (
-            val.get_size()[0] + 10,
-            val.get_size()[1] + 10,
-        )
+    val = pygame.mask.from_surface(pygame.transform.scale(sprite, size), threshold=250)
+
+    inflated_mask = inflate_mask(
+        val, 3, (val.get_size()[0] + 10, val.get_size()[1] + 10), (5, 5)
     )
-    inflated_mask.draw(val, (5, 5))
-    for _ in range(3):
-        outline = inflated_mask.outline()
-        for point in outline:
-            for dx in range(-1, 2):
-                for dy in range(-1, 2):
-                    try:
-                        inflated_mask.set_at((point[0] + dx, point[1] + dy), 1)
-                    except IndexError:
-                        continue
+    _sprite_masks[sprite] = (size, inflated_mask)
     cat.sprite_mask = inflated_mask
 
 
+def inflate_mask(
+    mask: pygame.Mask, padding: int, size: Tuple[int, int], offset: Tuple[int, int]
+) -> pygame.Mask:
+    """
+    Makes a bigger mask with the given mask grown by padding pixels in every direction.
+
+    :param mask: The mask to grow
+    :param padding: How many pixels to grow it by
+    :param size: Size of the new mask
+    :param offset: Where the original mask is placed on the new mask
+    """
+    inflated_mask = pygame.Mask(size)
+    kernel = pygame.Mask((padding * 2 + 1, padding * 2 + 1), fill=True)
+    mask.convolve(kernel, inflated_mask, (offset[0] - padding, offset[1] - padding))
+    return inflated_mask
+
+
 def clan_symbol_sprite(clan, return_string=False, force_light=False):
     """
     returns the clan symbol for the given clan_name, if no symbol exists then random symbol is chosen
@@ -2726,6 +2556,11 @@ def generate_sprite(
         else:
             cat_sprite = str(cat.pelt.cat_sprites[age])
 
+    sprite_key = get_sprite_key(cat, cat_sprite, dead, scars_hidden, acc_hidden)
+    cached_sprite = sprites.get_cat_sprite(sprite_key)
+    if cached_sprite is not None:
+        return cached_sprite
+
     new_sprite = pygame.Surface(
         (sprites.size, sprites.size), pygame.HWSURFACE | pygame.SRCALPHA
     )
@@ -2946,6 +2781,8 @@ def generate_sprite(
         if cat.pelt.reverse:
             new_sprite = pygame.transform.flip(new_sprite, True, False)
 
+        sprites.cache_cat_sprite(sprite_key, new_sprite)
+
     except (TypeError, KeyError):
         logger.exception("Failed to load sprite")
 
@@ -2957,6 +2794,58 @@ def generate_sprite(
     return new_sprite
 
 
+def get_sprite_key(cat, cat_sprite, dead, scars_hidden, acc_hidden) -> tuple:
+    """
+    Returns everything generate_sprite draws from, so cats that look the same share one sprite.
+
+    :param cat_sprite: the pose index chosen by generate_sprite
+    """
+    pelt = cat.pelt
+
+    fade_stage = None
+    if (
+        pelt.opacity <= 97
+        and not cat.prevent_fading
+        and get_clan_setting("fading")
+        and dead
+    ):
+        fade_stage = 0 if pelt.opacity > 80 else 1 if pelt.opacity > 45 else 2
+
+    scars = None if scars_hidden else tuple(pelt.scars)
+    accessory = pelt.accessory
+    if acc_hidden or not accessory:
+        accessory = None
+    elif isinstance(accessory, list):
+        accessory = tuple(accessory)
+
+    return (
+        cat_sprite,
+        cat.species,
+        pelt.name,
+        pelt.get_sprites_name(),
+        pelt.colour,
+        pelt.tortiebase,
+        pelt.tortiepattern,
+        pelt.tortiecolour,
+        pelt.pattern,
+        pelt.tint,
+        pelt.white_patches,
+        pelt.white_patches_tint,
+        pelt.points,
+        pelt.vitiligo,
+        pelt.eye_colour,
+        pelt.eye_colour2,
+        pelt.skin,
+        scars,
+        accessory,
+        pelt.reverse,
+        dead,
+        dead and cat.status.group == CatGroup.DARK_FOREST,
+        fade_stage,
+        game_setting_get("shaders"),
+    )
+
+
 def apply_opacity(surface, opacity):
     for x in range(surface.get_width()):
         for y in range(surface.get_height()):
@@ -3011,6 +2900,10 @@ def quit(savesettings=False, clearevents=False):
     """
     if savesettings:
         game_settings_save(None)
+    try:
+        wait_for_save()
+    except (RuntimeError, OSError):
+        print("ERROR: The last save could not be written.")
     if clearevents:
         game.cur_events_list.clear()
     game.rpc.close_rpc.set()
@@ -3040,9 +2933,8 @@ with open(
 ) as read_file:
     PERMANENT = ujson.loads(read_file.read())
 
-langs = {"snippet": None, "prey": None}
+langs = {"prey": None}
 
-SNIPPETS = None
 PREY_LISTS = None
 
 with open(
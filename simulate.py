@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Skips moons without opening the game, to measure how fast moon skips are.
+
+    python simulate.py --cats 200 --moons 10 --seed 1
+    python simulate.py --clan Thunder --moons 5
+    python simulate.py --benchmark
+    python simulate.py --benchmark 50 1000 --json results.json
+    python simulate.py --clan Thunder --moons 5 --replay
+
+Generated clans are saved (see scripts/simulation.py) and loaded again on the
+next run with the same settings, use --regenerate to make them anew. They are
+saved in a temporary folder instead of the game's saves, unless --data-dir says
+otherwise; --clan loads from the game's data directory by default. The
+benchmark runs every scenario in its own process, so the peak memory use of
+one scenario doesn't carry over into the next.
+
+Moon skips depend on the order of sets, so everything is run with a fixed
+PYTHONHASHSEED to get the same results from the same seed. --replay skips the
+moons twice from the save and checks that both went the same way.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+import ujson
+
+HASH_SEED = "0"
+
+DEFAULT_DATA_DIR = os.path.join(tempfile.gettempdir(), "clangen_simulate")
+"""data directory of generated clans, so they don't end up in the game's saves"""
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    clan = parser.add_mutually_exclusive_group(required=True)
+    clan.add_argument(
+        "--cats", type=int, help="generate a clan with this many living cats"
+    )
+    clan.add_argument("--clan", help="load the saved clan with this name")
+    clan.add_argument("--scenario", help="generate the clan of this benchmark scenario")
+    clan.add_argument(
+        "--benchmark",
+        nargs="*",
+        metavar="SCENARIO",
+        help="run these benchmark scenarios, or all of them",
+    )
+    parser.add_argument(
+        "--moons", type=int, help="moons to skip, defaults to 10 or the scenario's"
+    )
+    parser.add_argument("--seed", type=int, default=1, help="random seed, default 1")
+    parser.add_argument(
+        "--game-mode",
+        default="expanded",
+        choices=["classic", "expanded", "cruel season"],
+        help="game mode of a clan generated with --cats",
+    )
+    parser.add_argument(
+        "--regenerate",
+        action="store_true",
+        help="generate the clan again even if it was saved before",
+    )
+    parser.add_argument(
+        "--no-hunting",
+        dest="hunt",
+        action="store_false",
+        help="don't add the prey the clan needs before each moon",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="skip the moons again from the save and check they went the same way",
+    )
+    parser.add_argument(
+        "--data-dir",
+        help="data directory to save and load clans in, defaults to a temporary "
+        "folder, or to the game's data directory for --clan",
+    )
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument(
+        "--folded", help="write the phases as collapsed stacks to this file"
+    )
+    parser.add_argument(
+        "--phases", type=int, default=15, help="how many phases to show, default 15"
+    )
+    return parser.parse_args(args)
+
+
+def format_result(name: str, result: dict, phases: int) -> str:
+    lines = [
+        f"{name}: {result['moons']} moons in {result['seconds']:.2f}s, "
+        f"{result['moons_per_second']:.3f} moons/s, "
+        f"{result['cats_before']} -> {result['cats_after']} cats "
+        f"({result['living_after']} living)",
+    ]
+    if result["peak_rss"] is not None:
+        lines.append(f"  peak RSS: {result['peak_rss'] / 1024 / 1024:.1f} MB")
+    slowest = sorted(result["phases"].items(), key=lambda item: -item[1]["self"])
+    for path, timing in slowest[:phases]:
+        lines.append(
+            f"  {timing['self'] * 1000:10.1f} ms self {timing['calls']:7d} calls  {path}"
+        )
+    return "\n".join(lines)
+
+
+def run_benchmark(args) -> int:
+    from scripts.simulation import BENCHMARK_SCENARIOS
+
+    scenario_names = args.benchmark or list(BENCHMARK_SCENARIOS)
+    unknown = [name for name in scenario_names if name not in BENCHMARK_SCENARIOS]
+    if unknown:
+        print(
+            f"Unknown scenario(s) {', '.join(unknown)}, "
+            f"expected {', '.join(BENCHMARK_SCENARIOS)}"
+        )
+        return 2
+
+    results = {}
+    for name in scenario_names:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result_path = os.path.join(temp_dir, "result.json")
+            command = [
+                sys.executable,
+                __file__,
+                "--scenario",
+                name,
+                "--seed",
+                str(args.seed),
+                "--json",
+                result_path,
+                "--phases",
+                "0",
+            ]
+            if args.moons is not None:
+                command += ["--moons", str(args.moons)]
+            if args.regenerate:
+                command.append("--regenerate")
+            if not args.hunt:
+                command.append("--no-hunting")
+            if args.data_dir:
+                command += ["--data-dir", args.data_dir]
+            if subprocess.run(command, check=False).returncode != 0:
+                print(f"WARNING: scenario {name} failed")
+                continue
+            with open(result_path, "r", encoding="utf-8") as read_file:
+                results[name] = ujson.load(read_file)
+
+    print("")
+    for name, result in results.items():
+        print(format_result(f"{name} cats", result, args.phases))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as write_file:
+            ujson.dump(results, write_file, indent=4)
+    return 0 if len(results) == len(scenario_names) else 1
+
+
+def run_simulation(args) -> int:
+    from scripts.housekeeping.datadir import set_data_dir, setup_data_dir
+
+    # before anything else is imported, some paths are set when their module is imported
+    if args.data_dir or not args.clan:
+        set_data_dir(args.data_dir or DEFAULT_DATA_DIR)
+
+    from scripts.events_module.moon_profiler import moon_profiler
+    from scripts.simulation import (
+        BENCHMARK_SCENARIOS,
+        Scenario,
+        load_clan,
+        prepare_clan,
+        replay_moons,
+        run_moons,
+        setup_headless,
+    )
+
+    setup_data_dir()
+    setup_headless()
+
+    if args.clan:
+        name = args.clan
+        load_clan(name)
+        moons = args.moons or 10
+    else:
+        if args.scenario:
+            if args.scenario not in BENCHMARK_SCENARIOS:
+                print(
+                    f"Unknown scenario {args.scenario}, "
+                    f"expected {', '.join(BENCHMARK_SCENARIOS)}"
+                )
+                return 2
+            scenario = BENCHMARK_SCENARIOS[args.scenario]
+        else:
+            scenario = Scenario(living=args.cats, game_mode=args.game_mode)
+        name = prepare_clan(scenario, args.seed, args.regenerate)
+        moons = args.moons or scenario.moons
+
+    if args.replay:
+        moon = replay_moons(name, moons, args.seed, args.hunt)
+        if moon is not None:
+            print(f"{name}: moon {moon} of {moons} went differently when replayed")
+            return 1
+        print(f"{name}: all {moons} moons went the same way when replayed")
+        return 0
+
+    result = run_moons(moons, args.seed, args.hunt)
+    result["clan"] = name
+    result["seed"] = args.seed
+    print(format_result(name, result, args.phases))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as write_file:
+            ujson.dump(result, write_file, indent=4)
+    if args.folded:
+        moon_profiler.write_collapsed_stacks(args.folded)
+    return 0
+
+
+def main() -> int:
+    args = parse_args()
+
+    if os.environ.get("PYTHONHASHSEED") != HASH_SEED:
+        # restart with the fixed hash seed, it can't be changed while running
+        env = dict(os.environ, PYTHONHASHSEED=HASH_SEED)
+        return subprocess.run(
+            [sys.executable, __file__] + sys.argv[1:], env=env, check=False
+        ).returncode
+
+    if args.data_dir:
+        # relative to where simulate.py was started from, not the repository
+        args.data_dir = os.path.abspath(args.data_dir)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    if args.benchmark is not None:
+        return run_benchmark(args)
+    return run_simulation(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
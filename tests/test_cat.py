@@ -7,8 +7,10 @@ from scripts.game_structure.game_essentials import game
 os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
 
+from scripts.cat.cat_pool import CatPool
 from scripts.cat.cats import Cat
 from scripts.cat.enums import CatAge, CatRank, CatGroup, CatSocial
+from scripts.cat_relations.family_clusters import FamilyClusters, family_clusters
 from scripts.cat_relations.relationship import Relationship
 
 
@@ -87,6 +89,77 @@ class TestRelativesFunction(unittest.TestCase):
         self.assertFalse(kit.is_grandparent(grand_parent))
         self.assertTrue(grand_parent.is_grandparent(kit))
 
+    # test that parents set after the cat was created are found as well
+    def test_parents_set_later(self):
+        parent = Cat()
+        adoptive_parent = Cat()
+        kit = Cat()
+        kit.parent1 = parent.ID
+        kit.set_adoptive_parent(adoptive_parent)
+        parent.create_inheritance_new_cat()
+        self.assertTrue(parent.is_parent(kit))
+        self.assertTrue(adoptive_parent.is_parent(kit))
+
+        # kits that got other parents since are not found anymore
+        kit.parent1 = None
+        parent.create_inheritance_new_cat()
+        self.assertFalse(parent.is_parent(kit))
+
+
+class TestFamilyClusters(unittest.TestCase):
+    def test_families_merge_and_track_biggest(self):
+        clusters = FamilyClusters()
+        for cat_id in ("a", "b", "c", "d", "e"):
+            clusters.add_cat(cat_id)
+        clusters.link("c", "a")
+        clusters.link("c", "b")
+        clusters.link("e", "d")
+        self.assertEqual(clusters.biggest_family(), {"a", "b", "c"})
+        self.assertEqual(clusters.family_of("e"), {"d", "e"})
+
+        # a faded parent keeps its kits in the same family
+        clusters.remove_cat("c")
+        self.assertEqual(clusters.family_of("a"), {"a", "b"})
+        self.assertTrue(clusters.in_biggest_family("b"))
+
+        clusters.add_cat("f")
+        clusters.link("f", "e")
+        self.assertEqual(clusters.biggest_family_size(), 3)
+        self.assertTrue(clusters.in_biggest_family("f"))
+        self.assertFalse(clusters.in_biggest_family("a"))
+
+    def test_cats_are_linked_to_their_parents(self):
+        parent = Cat()
+        kit = Cat(parent1=parent.ID)
+        adoptive_parent = Cat()
+        kit.set_adoptive_parent(adoptive_parent)
+        self.assertTrue(
+            {parent.ID, kit.ID, adoptive_parent.ID} <= family_clusters.family_of(kit.ID)
+        )
+
+    def test_families_contain_the_relatives(self):
+        # two families whose kits become mates, and the kits of those
+        first_parents = [Cat(), Cat()]
+        second_parents = [Cat(), Cat()]
+        first_kits = [
+            Cat(parent1=first_parents[0].ID, parent2=first_parents[1].ID)
+            for _ in range(3)
+        ]
+        second_kit = Cat(parent1=second_parents[0].ID, parent2=second_parents[1].ID)
+        grandkits = [
+            Cat(parent1=first_kits[0].ID, parent2=second_kit.ID),
+            Cat(parent1=first_kits[1].ID),
+        ]
+        cats = [*first_parents, *second_parents, *first_kits, second_kit, *grandkits]
+        # the relatives of a cat already reach into the families of both its parents
+        self.assertIn(first_parents[0].ID, grandkits[0].get_relatives())
+        self.assertIn(second_parents[0].ID, grandkits[0].get_relatives())
+
+        # the relatives the biggest family was taken from before are always in the cat's family
+        for cat in cats:
+            relatives = {*cat.get_relatives(), cat.ID}
+            self.assertLessEqual(relatives, family_clusters.family_of(cat.ID))
+
 
 class TestPossibleMateFunction(unittest.TestCase):
     # test that is_potential_mate returns False for cats that are related to each other
@@ -438,6 +511,133 @@ class TestUpdateMentor(unittest.TestCase):
         self.assertIsNone(app.mentor)
 
 
+class TestStatusIndex(unittest.TestCase):
+    def assert_index_matches_all_cats(self):
+        for group in (None, *CatGroup):
+            with self.subTest(group=group):
+                self.assertEqual(
+                    [cat for cat in Cat.all_cats.values() if cat.status.group == group],
+                    Cat.fetch_cats_in_group(group),
+                )
+
+    def test_index_follows_status_changes(self):
+        warrior = Cat(moons=20, status_dict={"rank": CatRank.WARRIOR})
+        app = Cat(moons=7, status_dict={"rank": CatRank.APPRENTICE})
+        self.assertIn(warrior, Cat.fetch_living_clan_cats([CatRank.WARRIOR]))
+        self.assertNotIn(app, Cat.fetch_living_clan_cats([CatRank.WARRIOR]))
+
+        app.rank_change(CatRank.WARRIOR)
+        self.assertIn(app, Cat.fetch_living_clan_cats([CatRank.WARRIOR]))
+
+        warrior.dead = True
+        self.assertNotIn(warrior, Cat.fetch_living_clan_cats())
+        self.assertIn(warrior, Cat.fetch_cats_in_group(CatGroup.STARCLAN))
+
+        app.status.exile_from_group()
+        self.assertNotIn(app, Cat.fetch_living_clan_cats())
+        self.assertIn(app, Cat.fetch_cats_in_group(None, [CatRank.LONER]))
+
+        self.assert_index_matches_all_cats()
+
+    def test_removed_cats_are_skipped(self):
+        cat = Cat(moons=20, status_dict={"rank": CatRank.WARRIOR})
+        Cat.all_cats.pop(cat.ID)
+
+        self.assertNotIn(cat, Cat.fetch_living_clan_cats())
+        self.assert_index_matches_all_cats()
+
+        Cat.all_cats[cat.ID] = cat
+
+    def test_pool_follows_status_changes(self):
+        warrior = Cat(moons=20, status_dict={"rank": CatRank.WARRIOR})
+        app = Cat(moons=7, status_dict={"rank": CatRank.APPRENTICE})
+        self.assertIn(warrior, Cat.living_clan_pool)
+        self.assertIn(app, Cat.living_clan_pool)
+
+        warrior.dead = True
+        app.status.exile_from_group()
+        self.assertNotIn(warrior, Cat.living_clan_pool)
+        self.assertNotIn(app, Cat.living_clan_pool)
+        self.assertEqual(
+            sorted(cat.ID for cat in Cat.living_clan_pool),
+            sorted(cat.ID for cat in Cat.fetch_living_clan_cats()),
+        )
+
+
+class TestCatPool(unittest.TestCase):
+    def setUp(self):
+        self.pool = CatPool()
+        self.cats = [Cat(moons=20) for _ in range(4)]
+        for cat in self.cats:
+            self.pool.add(cat)
+
+    def test_discard_keeps_other_cats(self):
+        self.pool.discard(self.cats[1])
+        self.pool.discard(self.cats[1])
+
+        self.assertEqual(len(self.pool), 3)
+        self.assertNotIn(self.cats[1], self.pool)
+        self.assertCountEqual(self.pool.filter(), [self.cats[0], *self.cats[2:]])
+
+    def test_choice_never_returns_excluded_cat(self):
+        for _ in range(100):
+            self.assertIsNot(self.pool.choice(exclude=self.cats[3]), self.cats[3])
+
+        for cat in self.cats[1:]:
+            self.pool.discard(cat)
+        self.assertIsNone(self.pool.choice(exclude=self.cats[0]))
+        self.assertIs(self.pool.choice(exclude=self.cats[1]), self.cats[0])
+
+    def test_filtered_choice(self):
+        self.assertIs(
+            self.pool.filtered_choice(lambda cat: cat is self.cats[2]), self.cats[2]
+        )
+        self.assertIsNone(self.pool.filtered_choice(lambda cat: False))
+
+
+class TestRelationshipMap(unittest.TestCase):
+    def test_default_relationships_are_not_stored(self):
+        cat1 = Cat()
+        cat2 = Cat()
+        cat1.create_one_relationship(cat2)
+
+        self.assertIn(cat2.ID, cat1.relationships)
+        self.assertEqual(len(cat1.relationships), 1)
+        self.assertEqual(cat1.relationships.stored_count(), 0)
+
+        relationship = cat1.relationships.get(cat2.ID)
+        self.assertIs(relationship.cat_to, cat2)
+        self.assertEqual(relationship.platonic_like, 0)
+        self.assertIs(cat1.relationships[cat2.ID], relationship)
+        self.assertEqual(cat1.relationships.stored_count(), 0)
+
+    def test_changes_store_the_relationship(self):
+        cat1 = Cat()
+        cat2 = Cat()
+        cat3 = Cat()
+        cat1.relationships.set_default(cat2)
+        cat1.relationships.set_default(cat3)
+
+        cat1.relationships[cat2.ID].trust += 10
+        self.assertEqual(cat1.relationships[cat2.ID].trust, 10)
+
+        cat1.relationships[cat3.ID].log.append("They shared a mouse.")
+        self.assertEqual(cat1.relationships[cat3.ID].log, ["They shared a mouse."])
+        self.assertEqual(cat1.relationships.stored_count(), 2)
+        self.assertEqual(list(cat1.relationships), [cat2.ID, cat3.ID])
+
+    def test_assigned_default_relationship(self):
+        cat1 = Cat()
+        cat2 = Cat()
+        relationship = Relationship(cat1, cat2)
+        cat1.relationships[cat2.ID] = relationship
+        self.assertEqual(cat1.relationships.stored_count(), 0)
+
+        relationship.mates = True
+        self.assertIs(cat1.relationships[cat2.ID], relationship)
+        self.assertEqual(cat1.relationships.stored_count(), 1)
+
+
 class TestNameRepr(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -8,6 +8,7 @@ os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
 
 from scripts.cat.cats import Cat
+from scripts.cat.infections import InfectionTracker, get_injury_infectiousness
 from scripts.conditions import medicine_cats_can_cover_clan
 
 
@@ -67,3 +68,33 @@ class TestInjury(unittest.TestCase):
         with open(f"{resource_directory}Injuries.json", "r") as read_file:
             injuries = ujson.loads(read_file.read())
         return injuries
+
+
+class TestInfectionTracker(unittest.TestCase):
+    def test_ill_cats_are_tracked_until_cured(self):
+        tracker = InfectionTracker()
+        ill_cat = Cat(moons=20, status_dict={"rank": CatRank.WARRIOR})
+        ill_cat.illnesses["whitecough"] = {"infectiousness": 10}
+        healthy_cat = Cat(moons=20, status_dict={"rank": CatRank.WARRIOR})
+        tracker.add(ill_cat)
+        tracker.add(healthy_cat)
+
+        self.assertEqual(tracker.fetch_ill_cats(Cat.all_cats), [ill_cat])
+        self.assertEqual(tracker.count_living_clan_ill_cats(Cat.all_cats), 1)
+
+        ill_cat.illnesses.clear()
+        self.assertEqual(tracker.fetch_ill_cats(Cat.all_cats), [])
+        self.assertEqual(tracker.infected, {})
+
+    def test_injury_infectiousness(self):
+        self.assertEqual(
+            get_injury_infectiousness("water in their lungs", {}),
+            {"running nose": 5, "whitecough": 3},
+        )
+        self.assertEqual(
+            get_injury_infectiousness(
+                "removed injury",
+                {"illness_infectiousness": [{"name": "fleas", "lower_by": 2}]},
+            ),
+            {"fleas": 2},
+        )
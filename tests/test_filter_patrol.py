@@ -8,6 +8,11 @@ from scripts.cat.cats import Cat
 from scripts.cat_relations.relationship import Relationship
 from scripts.clan import Clan
 from scripts.events_module.patrol.patrol import PatrolEvent, Patrol
+from scripts.events_module.patrol.patrol_catalog import (
+    PatrolCatalog,
+    fits_setting,
+    get_patrol_files,
+)
 
 from scripts.utility import filter_relationship_type
 
@@ -892,3 +897,52 @@ class TestRelationshipConstraintPatrols(unittest.TestCase):
                 patrol.patrol_leader,
             )
         )
+
+
+class TestPatrolCatalog(unittest.TestCase):
+    def test_fits_setting(self):
+        patrol = PatrolEvent(
+            patrol_id="test",
+            biome=["forest"],
+            season=["any"],
+            types=["hunting"],
+            min_cats=2,
+            max_cats=3,
+        )
+
+        self.assertTrue(
+            fits_setting(patrol, "forest", "camp1", "newleaf", "hunting", 2)
+        )
+        self.assertFalse(
+            fits_setting(patrol, "beach", "camp1", "newleaf", "hunting", 2)
+        )
+        self.assertFalse(
+            fits_setting(patrol, "forest", "camp1", "newleaf", "border", 2)
+        )
+        self.assertFalse(
+            fits_setting(patrol, "forest", "camp1", "newleaf", "hunting", 4)
+        )
+        # other patrol types don't need a type
+        self.assertTrue(fits_setting(patrol, "forest", "camp1", "newleaf", "other", 3))
+
+    def test_patrols_are_parsed_once_and_bucketed(self):
+        catalog = PatrolCatalog()
+        file_path = get_patrol_files("forest", "greenleaf")["HUNTING"]
+        patrols = catalog.get_patrols(file_path)
+        self.assertIs(catalog.get_patrols(file_path), patrols)
+
+        normal, romantic = catalog.get_bucket(
+            file_path, "forest", "camp1", "greenleaf", "hunting", 3
+        )
+        fitting = [
+            patrol
+            for patrol in patrols
+            if fits_setting(patrol, "forest", "camp1", "greenleaf", "hunting", 3)
+        ]
+        self.assertTrue(normal)
+        self.assertEqual(
+            normal, [patrol for patrol in fitting if "romantic" not in patrol.tags]
+        )
+        self.assertEqual(
+            romantic, [patrol for patrol in fitting if "romantic" in patrol.tags]
+        )
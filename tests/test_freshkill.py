@@ -107,6 +107,46 @@ class FreshkillPileTest(unittest.TestCase):
             self.amount - self.prey_requirement["warrior"],
         )
 
+    def test_feed_cats_counts_needed_prey_once(self) -> None:
+        # given
+        freshkill_pile = FreshkillPile()
+        warriors = [
+            Cat(status_dict={"rank": CatRank.WARRIOR}, moons=1) for _ in range(3)
+        ]
+        counted = []
+        amount_food_needed = freshkill_pile.amount_food_needed
+
+        def count_food_needed():
+            counted.append(True)
+            return amount_food_needed()
+
+        freshkill_pile.amount_food_needed = count_food_needed
+
+        # when
+        freshkill_pile.feed_cats(warriors)
+
+        # then
+        self.assertEqual(len(counted), 1)
+        self.assertIsNone(freshkill_pile._round_needed_prey)
+        self.assertEqual(freshkill_pile.already_fed, set(warriors))
+
+    def test_feed_group_feeds_cat_once(self) -> None:
+        # given
+        warrior = Cat(status_dict={"rank": CatRank.WARRIOR}, moons=1)
+        once_pile = FreshkillPile()
+        twice_pile = FreshkillPile()
+        for freshkill_pile in (once_pile, twice_pile):
+            freshkill_pile.add_cat_to_nutrition(warrior)
+            freshkill_pile.living_cats = [warrior]
+
+        # when
+        once_pile.feed_group([warrior])
+        twice_pile.feed_group([warrior, warrior])
+
+        # then
+        self.assertLess(twice_pile.total_amount, self.amount)
+        self.assertEqual(twice_pile.total_amount, once_pile.total_amount)
+
     def test_tactic_younger_first(self) -> None:
         # given
         freshkill_pile = FreshkillPile()
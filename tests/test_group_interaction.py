@@ -395,6 +395,45 @@ class Abbreviations(unittest.TestCase):
         self.assertEqual(len(abbreviations_possibilities["1"]["r_c1"]), 2)
         self.assertEqual(len(abbreviations_possibilities["2"]["r_c1"]), 1)
 
+    def test_get_abbreviation_possibilities_combined(self):
+        # given
+        random1 = Cat(status_dict={"rank": CatRank.WARRIOR})
+        random1.personality.trait = "troublesome"
+        random1.skills.primary = Skill(SkillPath.HUNTER, points=9)
+        random2 = Cat(status_dict={"rank": CatRank.WARRIOR})
+        random2.personality.trait = "troublesome"
+        random2.skills.primary = Skill(SkillPath.TEACHER, points=9)
+        random2.skills.secondary = None
+        random3 = Cat(status_dict={"rank": CatRank.ELDER})
+        random3.personality.trait = "troublesome"
+        random3.skills.primary = Skill(SkillPath.HUNTER, points=9)
+
+        interaction1 = GroupInteraction("1")
+        interaction1.status_constraint = {"r_c1": ["warrior", "elder"]}
+        interaction1.trait_constraint = {"r_c1": ["troublesome"]}
+        interaction1.skill_constraint = {"r_c1": ["HUNTER,1"]}
+
+        interaction2 = GroupInteraction("2")
+        interaction2.status_constraint = {"r_c1": ["warrior"]}
+
+        # when
+        (
+            abbreviations_possibilities,
+            cat_abbreviations_counter,
+        ) = GroupEvents().get_abbreviations_possibilities(
+            [interaction1, interaction2], 2, [random1, random2, random3]
+        )
+
+        # then
+        self.assertEqual(
+            abbreviations_possibilities["1"]["r_c1"], {random1.ID, random3.ID}
+        )
+        self.assertEqual(
+            abbreviations_possibilities["2"]["r_c1"], {random1.ID, random2.ID}
+        )
+        self.assertEqual(cat_abbreviations_counter[random1.ID], {"r_c1": 2, "r_c2": 2})
+        self.assertEqual(cat_abbreviations_counter[random3.ID], {"r_c1": 1, "r_c2": 2})
+
     def test_remove_abbreviations_missing_cats(self):
         # given
         abbreviations_possibilities = {
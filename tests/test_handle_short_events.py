@@ -1,17 +1,58 @@
 import os
 import unittest
+from types import SimpleNamespace
 
 os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
 
 from scripts.cat.cats import Cat
+from scripts.events_module.generate_events import ShortEventCatalog
 from scripts.events_module.short.handle_short_events import HandleShortEvents
+from scripts.game_structure.game_essentials import game
 
 
 class TestHandleEvent(unittest.TestCase):
     pass
 
 
+class TestShortEventCatalog(unittest.TestCase):
+    def setUp(self):
+        self.clan = game.clan
+        game.clan = SimpleNamespace(
+            biome="Forest",
+            override_biome=None,
+            camp_bg="camp1",
+            current_season="Newleaf",
+            reputation=50,
+            age=10,
+        )
+
+    def tearDown(self):
+        game.clan = self.clan
+
+    def test_events_are_parsed_once(self):
+        catalog = ShortEventCatalog()
+        events = catalog.get_events("misc/forest.json", 4)
+        self.assertTrue(events)
+        self.assertIs(catalog.get_events("misc/forest.json", 4), events)
+
+        for event in catalog.get_events("misc/forest.json", 4, ["accessory"]):
+            self.assertEqual(set(event.sub_type), {"accessory"})
+
+    def test_clan_events_follow_the_season(self):
+        catalog = ShortEventCatalog()
+        newleaf = catalog.get_clan_events("misc/forest.json", 4)
+        self.assertIs(catalog.get_clan_events("misc/forest.json", 4), newleaf)
+        for event in newleaf:
+            self.assertTrue("any" in event.season or "newleaf" in event.season)
+
+        game.clan.current_season = "Leaf-bare"
+        leaf_bare = catalog.get_clan_events("misc/forest.json", 4)
+        self.assertIsNot(leaf_bare, newleaf)
+        for event in leaf_bare:
+            self.assertTrue("any" in event.season or "leaf-bare" in event.season)
+
+
 class TestHandleNewCats(unittest.TestCase):
     pass
 
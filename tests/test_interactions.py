@@ -8,6 +8,7 @@ os.environ["SDL_AUDIODRIVER"] = "dummy"
 
 from scripts.cat.cats import Cat, Relationship
 from scripts.cat.skills import SkillPath, Skill
+from scripts.cat_relations.relationship_constraint import RelationshipConstraint
 from scripts.cat_relations.interaction import (
     SingleInteraction,
     rel_fulfill_rel_constraints,
@@ -120,6 +121,59 @@ class RelationshipConstraints(unittest.TestCase):
         self.assertFalse(rel_fulfill_rel_constraints(rel, ["trust_30_lower"], "test"))
 
 
+class CompiledRelationshipConstraint(unittest.TestCase):
+    def test_parsed_once(self):
+        # given
+        constraint = RelationshipConstraint(
+            ["siblings", "platonic_20", "dislike_20_lower"], "test"
+        )
+
+        # then
+        self.assertTrue(constraint.siblings)
+        self.assertFalse(constraint.mates)
+        self.assertEqual(
+            constraint.thresholds,
+            (("platonic_like", 20, False), ("dislike", 20, True)),
+        )
+        self.assertFalse(constraint.malformed)
+
+    def test_malformed(self):
+        # then
+        self.assertTrue(RelationshipConstraint(["romantic_high"], "test").malformed)
+        self.assertTrue(RelationshipConstraint(["trust_120"], "test").malformed)
+        self.assertTrue(
+            RelationshipConstraint(["trust_10", "trust_20_lower"], "test").malformed
+        )
+        self.assertFalse(RelationshipConstraint([], "test"))
+
+    def test_admiration(self):
+        # given
+        rel = Relationship(Cat(), Cat())
+        rel.admiration = 50
+
+        # then
+        self.assertTrue(rel_fulfill_rel_constraints(rel, ["admiration_30"], "test"))
+        self.assertFalse(rel_fulfill_rel_constraints(rel, ["admiration_60"], "test"))
+
+    def test_filter(self):
+        # given
+        cat_from = Cat()
+        relationships = []
+        for value in (10, 30, 50, 70):
+            rel = Relationship(cat_from, Cat())
+            rel.platonic_like = value
+            rel.dislike = 100 - value
+            relationships.append(rel)
+        constraint = RelationshipConstraint(["platonic_30", "dislike_70_lower"], "test")
+
+        # then
+        self.assertEqual(constraint.filter(relationships), relationships[1:])
+        self.assertEqual(
+            constraint.filter(relationships),
+            [rel for rel in relationships if constraint.fulfilled_by(rel)],
+        )
+
+
 class SingleInteractionCatConstraints(unittest.TestCase):
     def test_status(self):
         # given
@@ -5,10 +5,14 @@ import i18n
 import ujson
 
 from scripts.cat.cats import Cat
+from scripts.game_structure import localization
 from scripts.game_structure.localization import (
     get_new_pronouns,
     determine_plural_pronouns,
     set_lang_config_directory,
+    load_lang_resource,
+    clear_lang_resource_cache,
+    resource_cache_stats,
 )
 from scripts.utility import event_text_adjust
 
@@ -98,3 +102,44 @@ class TestLocalisation(unittest.TestCase):
                     ),
                     value[1]["subject"],
                 )
+
+
+class TestLangResourceCache(unittest.TestCase):
+    def setUp(self):
+        clear_lang_resource_cache()
+
+    def tearDown(self):
+        i18n.config.set("locale", "en")
+        localization.RESOURCE_CACHE_SIZE = 256
+        clear_lang_resource_cache()
+
+    def test_resource_is_cached(self):
+        misses = resource_cache_stats["misses"]
+        hits = resource_cache_stats["hits"]
+
+        first = load_lang_resource("thoughts/alive/general.json")
+        second = load_lang_resource("/thoughts/alive/general.json")
+
+        self.assertIs(first, second)
+        self.assertEqual(resource_cache_stats["misses"], misses + 1)
+        self.assertEqual(resource_cache_stats["hits"], hits + 1)
+
+    def test_cache_cleared_on_changes(self):
+        first = load_lang_resource("thoughts/alive/general.json")
+
+        # falls back to the english file, but is cached separately
+        i18n.config.set("locale", "fr")
+        self.assertIsNot(first, load_lang_resource("thoughts/alive/general.json"))
+        i18n.config.set("locale", "en")
+
+        second = load_lang_resource("thoughts/alive/general.json")
+        set_lang_config_directory("resources/lang/en/config.json")
+        self.assertIsNot(second, load_lang_resource("thoughts/alive/general.json"))
+
+    def test_cache_size_is_bounded(self):
+        localization.RESOURCE_CACHE_SIZE = 1
+
+        first = load_lang_resource("thoughts/alive/general.json")
+        load_lang_resource("thoughts/alive/newborn.json")
+
+        self.assertIsNot(first, load_lang_resource("thoughts/alive/general.json"))
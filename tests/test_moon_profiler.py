@@ -0,0 +1,87 @@
+import unittest
+
+from scripts.events_module.moon_profiler import MoonProfiler
+
+
+class FakeCat:
+    def __init__(self, cat_id, name):
+        self.ID = cat_id
+        self.name = name
+
+
+class TestMoonProfiler(unittest.TestCase):
+    def setUp(self):
+        self.profiler = MoonProfiler()
+
+    def record_moon(self):
+        cat = FakeCat("1", "Firepaw")
+        with self.profiler.moon():
+            with self.profiler.phase("cats"):
+                for _ in range(2):
+                    with self.profiler.phase("one_moon_cat", cat):
+                        with self.profiler.phase("thoughts"):
+                            pass
+
+    def test_nothing_recorded_when_disabled(self):
+        self.record_moon()
+
+        self.assertEqual(self.profiler.moons, 0)
+        self.assertEqual(self.profiler.phases, {})
+
+    def test_phase_outside_of_moon_not_recorded(self):
+        self.profiler.enabled = True
+        with self.profiler.phase("thoughts"):
+            pass
+
+        self.assertEqual(self.profiler.phases, {})
+
+    def test_phases_recorded_by_stack(self):
+        self.profiler.enabled = True
+        self.record_moon()
+
+        self.assertEqual(self.profiler.moons, 1)
+        self.assertEqual(
+            set(self.profiler.phases),
+            {
+                ("one_moon",),
+                ("one_moon", "cats"),
+                ("one_moon", "cats", "one_moon_cat"),
+                ("one_moon", "cats", "one_moon_cat", "thoughts"),
+            },
+        )
+        self.assertEqual(
+            self.profiler.phases[("one_moon", "cats", "one_moon_cat", "thoughts")][2],
+            2,
+        )
+        self.assertEqual(self.profiler.cats["1"][0], "Firepaw")
+        self.assertEqual(self.profiler.cats["1"][2], 2)
+
+    def test_self_time_excludes_children(self):
+        self.profiler.enabled = True
+        self.record_moon()
+
+        for path, (total, self_time, calls) in self.profiler.phases.items():
+            children = sum(
+                timing[0]
+                for child, timing in self.profiler.phases.items()
+                if len(child) == len(path) + 1 and child[:-1] == path
+            )
+            self.assertAlmostEqual(self_time, total - children)
+
+    def test_collapsed_stacks(self):
+        self.profiler.enabled = True
+        self.record_moon()
+
+        stacks = self.profiler.collapsed_stacks()
+        self.assertEqual(len(stacks), 4)
+        self.assertTrue(stacks[-1].startswith("one_moon;cats;one_moon_cat;thoughts "))
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isnumeric() for line in stacks))
+
+    def test_report_sort(self):
+        self.profiler.enabled = True
+        self.record_moon()
+
+        report = self.profiler.report("calls")
+        self.assertIn("one_moon > cats > one_moon_cat", report[2])
+        with self.assertRaises(ValueError):
+            self.profiler.report("speed")
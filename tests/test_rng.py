@@ -0,0 +1,77 @@
+import random
+import unittest
+
+from scripts.game_structure.rng import RandomStreams, STREAM_NAMES, random_streams
+from scripts.game_structure.rng import conditions, events
+
+
+class TestRandomStreams(unittest.TestCase):
+    def setUp(self):
+        self.streams = RandomStreams()
+
+    def draw(self):
+        return {name: self.streams[name].random() for name in STREAM_NAMES}
+
+    def test_same_seed_and_moon_repeat(self):
+        self.streams.seed_streams(1234, 5)
+        first = self.draw()
+        self.streams.seed_streams(1234, 5)
+
+        self.assertEqual(self.draw(), first)
+
+    def test_moons_and_seeds_differ(self):
+        self.streams.seed_streams(1234, 5)
+        first = self.draw()
+        self.streams.seed_streams(1234, 6)
+        next_moon = self.draw()
+        self.streams.seed_streams(4321, 5)
+        other_seed = self.draw()
+
+        for name in STREAM_NAMES:
+            self.assertNotEqual(first[name], next_moon[name])
+            self.assertNotEqual(first[name], other_seed[name])
+
+    def test_streams_are_independent(self):
+        self.streams.seed_streams(1234, 5)
+        expected = self.streams["conditions"].random()
+
+        self.streams.seed_streams(1234, 5)
+        for _ in range(10):
+            self.streams["events"].random()
+
+        self.assertEqual(self.streams["conditions"].random(), expected)
+
+    def test_global_random_not_seeded(self):
+        state = random.getstate()
+        self.streams.seed_streams(1234, 5)
+
+        self.assertEqual(random.getstate(), state)
+
+    def test_new_seed_independent_of_global_random(self):
+        random.seed(1234)
+        first = RandomStreams.new_seed()
+        random.seed(1234)
+
+        self.assertNotEqual(RandomStreams.new_seed(), first)
+
+
+class TestStreamModules(unittest.TestCase):
+    def setUp(self):
+        state = random_streams.getstate()
+        self.addCleanup(random_streams.setstate, state)
+
+    def test_imported_functions_follow_reseeding(self):
+        random_streams.seed_streams(99, 1)
+        first = [conditions.randint(1, 1000) for _ in range(5)]
+        random_streams.seed_streams(99, 1)
+
+        self.assertEqual([conditions.randint(1, 1000) for _ in range(5)], first)
+
+    def test_modules_use_their_stream(self):
+        random_streams.seed_streams(99, 1)
+        conditions_state = random_streams["conditions"].getstate()
+        events_state = random_streams["events"].getstate()
+        events.random()
+
+        self.assertEqual(random_streams["conditions"].getstate(), conditions_state)
+        self.assertNotEqual(random_streams["events"].getstate(), events_state)
@@ -1,12 +1,42 @@
 import os
 import shutil
+import tempfile
 import unittest
+from unittest import mock
 
-from scripts.game_structure.game.save_load import read_clans
+import ujson
+
+from scripts.game_structure.game.save_load import (
+    read_clans,
+    safe_delete,
+    safe_save,
+    save_transaction,
+    wait_for_save,
+)
+from scripts.game_structure.game.save_load.save_load import (
+    JOURNAL_FILE_NAME,
+    SaveTransaction,
+    recover_interrupted_save,
+)
 
 os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
 
+from scripts.cat.cats import Cat
+from scripts.cat.history import History
+from scripts.cat.history_cache import HistoryCache
+from scripts.cat_relations.relationship import Relationship
+from scripts.cat.save_load import save_cats
+from scripts.cat_relations.relationship_store import (
+    RelationshipPacker,
+    RelationshipStore,
+    get_store_path,
+)
+from scripts.game_structure.game.switches import (
+    Switch,
+    switch_get_value,
+    switch_set_value,
+)
 from scripts.game_structure.game_essentials import Game
 from scripts.housekeeping.datadir import get_save_dir
 
@@ -147,3 +177,284 @@ class MigrateSave(unittest.TestCase):
                     file_list,
                     "Save " + str(i) + " not migrated correctly",
                 )
+
+
+class TestRelationshipStore(unittest.TestCase):
+    def test_store_round_trip(self):
+        cat1 = Cat()
+        cat2 = Cat()
+        cat3 = Cat()
+        rel = Relationship(cat1, cat2, mates=True, romantic_love=40, trust=15)
+        rel.log.append("They had a nice talk.")
+        cat1.relationships[cat2.ID] = rel
+        cat2.relationships[cat1.ID] = Relationship(cat2, cat1, family=True)
+        cat2.relationships.set_default(cat3)
+
+        packer = RelationshipPacker()
+        for cat in (cat1, cat2, cat3):
+            packer.pack_cat(cat)
+        store = packer.make_store([cat1.ID, cat2.ID, cat3.ID])
+        store = RelationshipStore(ujson.loads(ujson.dumps(store.to_dict())))
+
+        rel_data = store.get_relations_of(cat1.ID)
+        self.assertEqual(len(rel_data), 1)
+        self.assertEqual(rel_data[0]["cat_to_id"], cat2.ID)
+        self.assertTrue(rel_data[0]["mates"])
+        self.assertFalse(rel_data[0]["family"])
+        self.assertEqual(rel_data[0]["romantic_love"], 40)
+        self.assertEqual(rel_data[0]["trust"], 15)
+        self.assertEqual(rel_data[0]["log"], ["They had a nice talk."])
+
+        rel_data = store.get_relations_of(cat2.ID)
+        self.assertTrue(rel_data[0]["family"])
+        self.assertEqual(rel_data[0]["log"], [])
+        self.assertEqual(rel_data[1]["cat_to_id"], cat3.ID)
+        self.assertFalse(rel_data[1]["family"])
+        self.assertEqual(rel_data[1]["platonic_like"], 0)
+
+        self.assertEqual(store.get_relations_of(cat3.ID), [])
+
+    def test_store_unsaved_cat(self):
+        cat1 = Cat()
+        cat2 = Cat()
+
+        packer = RelationshipPacker()
+        packer.pack_cat(cat1)
+        store = packer.make_store([cat1.ID])
+
+        # saved without any relationships is not the same as not saved at all
+        self.assertEqual(store.get_relations_of(cat1.ID), [])
+        self.assertIsNone(store.get_relations_of(cat2.ID))
+
+    def test_packer_skips_unchanged(self):
+        cat1 = Cat()
+        cat2 = Cat()
+        cat1.relationships[cat2.ID] = Relationship(cat1, cat2)
+
+        packer = RelationshipPacker()
+        self.assertTrue(packer.pack_cat(cat1))
+        self.assertFalse(packer.pack_cat(cat1))
+
+        cat1.relationships[cat2.ID].trust += 10
+        self.assertTrue(packer.pack_cat(cat1))
+
+        cat1.relationships[cat2.ID].log.append("They went hunting together.")
+        self.assertTrue(packer.pack_cat(cat1))
+        self.assertFalse(packer.pack_cat(cat1))
+
+        store = packer.make_store([cat1.ID])
+        rel_data = store.get_relations_of(cat1.ID)
+        self.assertEqual(rel_data[0]["trust"], 10)
+        self.assertEqual(rel_data[0]["log"], ["They went hunting together."])
+
+    def test_unchanged_save_keeps_store(self):
+        clan_name = "unittestStoreClan"
+        self.addCleanup(
+            shutil.rmtree, os.path.join(get_save_dir(), clan_name), ignore_errors=True
+        )
+        self.addCleanup(
+            switch_set_value, Switch.clan_name, switch_get_value(Switch.clan_name)
+        )
+        switch_set_value(Switch.clan_name, clan_name)
+        cat1 = Cat()
+        cat2 = Cat()
+        cat1.relationships[cat2.ID] = Relationship(cat1, cat2, trust=15)
+
+        save_cats(clan_name, Cat, Game())
+        # nothing changed, so the store isn't written again and has to be kept
+        save_cats(clan_name, Cat, Game())
+
+        self.assertTrue(os.path.exists(get_store_path(clan_name)))
+
+
+class TestHistoryCache(unittest.TestCase):
+    def test_cold_histories_are_dropped_first(self):
+        cache = HistoryCache()
+        cache.get_budget = lambda: 2000
+        living_cat = Cat()
+        dead_cat = Cat()
+        dead_cat.dead = True
+        changed_cat = Cat()
+
+        histories = {}
+        for cat in (living_cat, dead_cat, changed_cat):
+            histories[cat.ID] = History(cat=cat)
+            histories[cat.ID].dirty = False
+            cat.history = histories[cat.ID]
+            cache.loaded(cat, histories[cat.ID], 1000)
+        histories[changed_cat.ID].dirty = True
+
+        cache.used(living_cat)
+        cache.trim(Cat.all_cats)
+        self.assertEqual(list(cache.resident), [changed_cat.ID, living_cat.ID])
+        self.assertFalse(dead_cat.history_loaded)
+
+        # unsaved changes are kept even if the cache is over its budget
+        cache.get_budget = lambda: 0
+        cache.trim(Cat.all_cats)
+        self.assertEqual(list(cache.resident), [changed_cat.ID])
+        self.assertEqual(cache.size, 1000)
+        self.assertEqual(cache.stats, {"hits": 1, "misses": 3, "evictions": 2})
+
+
+class TestSaveTransaction(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def read(self, file_name):
+        with open(os.path.join(self.directory, file_name), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def test_transaction_writes_on_commit(self):
+        first_path = os.path.join(self.directory, "first.json")
+        second_path = os.path.join(self.directory, "sub", "second.txt")
+
+        with save_transaction(wait=True):
+            safe_save(first_path, {"cats": [1, 2]})
+            safe_save(second_path, "text")
+            self.assertFalse(os.path.exists(first_path))
+            self.assertFalse(os.path.exists(second_path))
+
+        self.assertEqual(ujson.loads(self.read("first.json")), {"cats": [1, 2]})
+        self.assertEqual(self.read("sub/second.txt"), "text")
+        self.assertEqual(sorted(os.listdir(self.directory)), ["first.json", "sub"])
+        self.assertFalse(
+            os.path.exists(os.path.join(get_save_dir(), JOURNAL_FILE_NAME))
+        )
+
+    def test_failed_transaction_keeps_old_files(self):
+        path = os.path.join(self.directory, "clan.json")
+        safe_save(path, "old")
+
+        with self.assertRaises(ValueError):
+            with save_transaction(wait=True):
+                safe_save(path, "new")
+                raise ValueError()
+
+        self.assertEqual(self.read("clan.json"), "old")
+
+    def test_data_serialized_when_added(self):
+        path = os.path.join(self.directory, "conditions.json")
+        conditions = {"illnesses": {}}
+
+        with save_transaction() as transaction:
+            safe_save(path, conditions)
+        # the game keeps changing its dicts while the files are written
+        conditions["illnesses"]["fever"] = {}
+        transaction.thread.join()
+
+        self.assertEqual(ujson.loads(self.read("conditions.json")), {"illnesses": {}})
+
+    def test_delete_after_writes(self):
+        path = os.path.join(self.directory, "conditions.json")
+        safe_save(path, "old")
+
+        with self.assertRaises(ValueError):
+            with save_transaction(wait=True):
+                safe_delete(path)
+                raise ValueError()
+        self.assertEqual(self.read("conditions.json"), "old")
+
+        with save_transaction(wait=True):
+            safe_delete(path)
+            self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(path))
+
+    def test_error_kept_for_finishing_save(self):
+        safe_save(os.path.join(self.directory, "saves"), "not a directory")
+        path = os.path.join(self.directory, "saves", "clan.json")
+
+        with save_transaction():
+            safe_save(path, "new")
+        wait_for_save(raise_error=False)
+
+        with self.assertRaises(OSError):
+            wait_for_save()
+        wait_for_save()
+
+    def test_failed_save_is_written_again(self):
+        clan_name = "unittestFailedSaveClan"
+        self.addCleanup(
+            shutil.rmtree, os.path.join(get_save_dir(), clan_name), ignore_errors=True
+        )
+        self.addCleanup(
+            switch_set_value, Switch.clan_name, switch_get_value(Switch.clan_name)
+        )
+        switch_set_value(Switch.clan_name, clan_name)
+        cat1 = Cat()
+        cat2 = Cat()
+        cat1.relationships[cat2.ID] = Relationship(cat1, cat2, trust=15)
+        cat1.history = History(cat=cat1)
+        with save_transaction(wait=True):
+            save_cats(clan_name, Cat, Game())
+
+        cat1.relationships[cat2.ID].trust = 30
+        cat1.illnesses = {"fever": {"severity": "minor"}}
+        cat1.history.murder = {"is_murderer": []}
+        cat1.history.dirty = True
+        with mock.patch.object(
+            SaveTransaction, "_write_all", side_effect=OSError("disk full")
+        ):
+            with self.assertRaises(OSError):
+                with save_transaction(wait=True):
+                    save_cats(clan_name, Cat, Game())
+
+        # nothing changed since, but the failed save has to be written again
+        with save_transaction(wait=True):
+            save_cats(clan_name, Cat, Game())
+
+        clan_dir = os.path.join(get_save_dir(), clan_name)
+        with open(get_store_path(clan_name), "r", encoding="utf-8") as read_file:
+            store = RelationshipStore(ujson.loads(read_file.read()))
+        self.assertEqual(store.get_relations_of(cat1.ID)[0]["trust"], 30)
+        with open(
+            os.path.join(clan_dir, "conditions", f"{cat1.ID}_conditions.json"),
+            "r",
+            encoding="utf-8",
+        ) as read_file:
+            self.assertIn("fever", ujson.loads(read_file.read())["illnesses"])
+        with open(
+            os.path.join(clan_dir, "history", f"{cat1.ID}_history.json"),
+            "r",
+            encoding="utf-8",
+        ) as read_file:
+            self.assertEqual(
+                ujson.loads(read_file.read())["murder"], {"is_murderer": []}
+            )
+
+    def test_temp_files_removed_without_journal(self):
+        clan_dir = os.path.join(get_save_dir(), "unittestTempClan")
+        self.addCleanup(shutil.rmtree, clan_dir, ignore_errors=True)
+        path = os.path.join(clan_dir, "history", "1_history.json")
+        safe_save(path, "old")
+        safe_save(path + ".tmp", "new")
+
+        recover_interrupted_save()
+
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["1_history.json"])
+        with open(path, "r", encoding="utf-8") as read_file:
+            self.assertEqual(read_file.read(), "old")
+
+    def test_recover_interrupted_save(self):
+        path = os.path.join(self.directory, "clan.json")
+        deleted_path = os.path.join(self.directory, "herbs.json")
+        safe_save(path, "old")
+        safe_save(path + ".tmp", "new")
+        safe_save(deleted_path, "old")
+        safe_save(
+            os.path.join(get_save_dir(), JOURNAL_FILE_NAME),
+            ujson.dumps(
+                {"renames": [[path, path + ".tmp"]], "deletes": [deleted_path]}
+            ),
+        )
+
+        recover_interrupted_save()
+
+        self.assertEqual(self.read("clan.json"), "new")
+        self.assertEqual(os.listdir(self.directory), ["clan.json"])
+        self.assertFalse(
+            os.path.exists(os.path.join(get_save_dir(), JOURNAL_FILE_NAME))
+        )
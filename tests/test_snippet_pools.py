@@ -0,0 +1,49 @@
+import os
+import unittest
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+from scripts.game_structure.snippet_pools import SnippetPools
+
+
+class TestSnippetPools(unittest.TestCase):
+    def setUp(self):
+        self.pools = SnippetPools()
+
+    def test_pools_are_immutable(self):
+        self.pools.load()
+
+        for pool in self.pools.pools.values():
+            self.assertIsInstance(pool, tuple)
+            self.assertTrue(all(isinstance(group, tuple) for group in pool))
+
+    def test_senses_joined(self):
+        smell = self.pools.get_pool("omen_list", "forest", ["smell"])
+        sound = self.pools.get_pool("omen_list", "forest", ["sound"])
+
+        self.assertEqual(
+            self.pools.get_pool("omen_list", "forest", ["smell", "sound"]),
+            smell + sound,
+        )
+        self.assertGreater(
+            len(self.pools.get_pool("omen_list", "forest")), len(smell + sound)
+        )
+        self.assertEqual(
+            self.pools.get_pool("dream_list", "forest"),
+            self.pools.get_pool("dream_list", "beach"),
+        )
+
+    def test_draw_does_not_grow_pools(self):
+        pool = self.pools.get_pool("story_list", "forest")
+        sizes = {key: len(pool) for key, pool in self.pools.pools.items()}
+
+        for _ in range(20):
+            snippets = self.pools.draw("story_list", "forest", 2)
+            self.assertEqual(len(snippets), 2)
+            for snippet in snippets:
+                self.assertTrue(any(snippet in group for group in pool))
+
+        self.assertEqual(
+            {key: len(pool) for key, pool in self.pools.pools.items()}, sizes
+        )
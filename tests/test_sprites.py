@@ -0,0 +1,36 @@
+import os
+import unittest
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+import pygame
+
+from scripts.cat.sprites import Sprites
+from scripts.game_structure.game_essentials import game
+
+
+class TestLoadAll(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        pygame.display.init()
+        pygame.display.set_mode((10, 10))
+        cls.sprites = Sprites()
+        cls.sprites.load_all()
+
+    def test_every_folder_loaded(self):
+        self.assertEqual(set(self.sprites.load_timings), set(game.sprite_folders))
+        for folder in game.sprite_folders:
+            self.assertIn(f"lines{folder}_0", self.sprites.sprites)
+            self.assertIn(f"skin{folder}_BLACK0", self.sprites.sprites)
+
+    def test_sheets_converted_for_display(self):
+        for sheet in self.sprites.spritesheets.values():
+            self.assertTrue(sheet.get_flags() & pygame.SRCALPHA)
+
+    def test_reload_keeps_symbols_unique(self):
+        self.sprites.load_all()
+
+        self.assertEqual(
+            len(self.sprites.clan_symbols), len(set(self.sprites.clan_symbols))
+        )
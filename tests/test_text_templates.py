@@ -0,0 +1,67 @@
+import os
+import unittest
+
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+from scripts.game_structure.localization import get_new_pronouns
+from scripts.game_structure.text_templates import (
+    NAME,
+    PRONOUN,
+    TEXT,
+    TextTemplate,
+    get_template,
+)
+from scripts.utility import process_text
+
+
+class TestTextTemplates(unittest.TestCase):
+    def setUp(self):
+        self.cat_dict = {
+            "m_c": ("Firepaw", get_new_pronouns("male")[0]),
+            "r_c": ("Sandpaw", get_new_pronouns("female")[0]),
+        }
+
+    def test_tokens(self):
+        template = TextTemplate(
+            "m_c thanks r_c, {PRONOUN/r_c/subject} {VERB/r_c/purr/purrs}.",
+            ("m_c", "r_c"),
+        )
+
+        self.assertEqual(
+            [kind for kind, _ in template.tokens],
+            [NAME, TEXT, NAME, TEXT, PRONOUN, TEXT, PRONOUN, TEXT],
+        )
+        self.assertEqual(template.tokens[4][1][1], ("PRONOUN", "r_c", "subject"))
+
+    def test_render(self):
+        text = "m_c thanks r_c, {PRONOUN/r_c/subject/CAP} {VERB/r_c/purr/purrs}."
+
+        self.assertEqual(
+            process_text(text, self.cat_dict), "Firepaw thanks Sandpaw, She purrs."
+        )
+
+    def test_braces_kept(self):
+        # names in braces and escaped tags are left alone, like {insert}
+        self.assertEqual(
+            process_text("%{r_c} m_c {insert}", self.cat_dict),
+            "%{r_c} Firepaw {insert}",
+        )
+
+    def test_abbreviations_in_order(self):
+        cat_dict = {"r_c": ("Sandpaw", None), "r_c1": ("Graypaw", None)}
+
+        self.assertEqual(process_text("r_c1", cat_dict), "Sandpaw1")
+        self.assertEqual(
+            process_text("r_c1", dict(reversed(cat_dict.items()))), "Graypaw"
+        )
+
+    def test_template_cached(self):
+        text = "m_c watches r_c."
+
+        self.assertIs(
+            get_template(text, ("m_c", "r_c")), get_template(text, ("m_c", "r_c"))
+        )
+        self.assertIsNot(
+            get_template(text, ("m_c", "r_c")), get_template(text, ("m_c",))
+        )
@@ -7,7 +7,7 @@ os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
 
 from scripts.cat.cats import Cat
-from scripts.cat.thoughts import Thoughts
+from scripts.cat.thoughts import Thoughts, ThoughtIndex
 
 
 class TestNotWorkingThoughts(unittest.TestCase):
@@ -170,3 +170,46 @@ class TestFamilyThoughts(unittest.TestCase):
         # when
 
         # then
+
+
+class TestThoughtIndex(unittest.TestCase):
+    def setUp(self):
+        self.main = Cat(status_dict={"rank": CatRank.WARRIOR}, moons=40)
+        self.other = Cat(status_dict={"rank": CatRank.WARRIOR}, moons=40)
+        self.index = ThoughtIndex(
+            [
+                {"id": "forest", "thoughts": ["m_c hunts"], "biome": ["Forest"]},
+                {"id": "random_cat", "thoughts": ["m_c greets r_c"]},
+                {
+                    "id": "elder",
+                    "thoughts": ["m_c naps"],
+                    "main_status_constraint": [CatRank.ELDER],
+                },
+                {"id": "not_working", "thoughts": ["m_c rests"], "not_working": True},
+            ]
+        )
+
+    def candidate_ids(self, random_cat, biome):
+        candidates = self.index.get_candidates(
+            self.main, random_cat, biome, "Newleaf", "camp1"
+        )
+        return {thought["id"] for thought in candidates}
+
+    def test_candidates_filter_static_constraints(self):
+        self.assertEqual(
+            {"forest", "random_cat", "not_working"},
+            self.candidate_ids(self.other, "Forest"),
+        )
+        self.assertEqual({"not_working"}, self.candidate_ids(None, "Beach"))
+
+    def test_choose_checks_cat_constraints(self):
+        for _ in range(10):
+            thought = self.index.choose(
+                self.main, None, "expanded", "Beach", "Newleaf", "camp1"
+            )
+            self.assertIsNone(thought)
+
+        thought = self.index.choose(
+            self.main, None, "expanded", "Forest", "Newleaf", "camp1"
+        )
+        self.assertEqual("forest", thought["id"])
@@ -6,13 +6,18 @@ from scripts.cat.enums import CatRank
 os.environ["SDL_VIDEODRIVER"] = "dummy"
 os.environ["SDL_AUDIODRIVER"] = "dummy"
 
+import pygame
+
 from scripts.cat.cats import Cat
+from scripts.cat.sprites import Sprites
 from scripts.cat_relations.relationship import Relationship
 from scripts.utility import (
     get_highest_romantic_relation,
     get_personality_compatibility,
     get_amount_of_cats_with_relation_value_towards,
     get_alive_clan_queens,
+    get_sprite_key,
+    inflate_mask,
 )
 
 
@@ -411,3 +416,43 @@ class TestGetQueens(unittest.TestCase):
         self.assertEqual(
             [self.test_cat2.ID], list(get_alive_clan_queens(living_cats)[0].keys())
         )
+
+
+class TestCatSpriteCache(unittest.TestCase):
+    def test_sprite_key(self):
+        cat = Cat(moons=40)
+        twin = Cat(moons=40)
+        twin.pelt = cat.pelt
+        twin.species = cat.species
+
+        key = get_sprite_key(cat, "8", False, False, False)
+        self.assertEqual(key, get_sprite_key(twin, "8", False, False, False))
+        self.assertNotEqual(key, get_sprite_key(cat, "8", True, False, False))
+        self.assertNotEqual(key, get_sprite_key(cat, "9", False, False, False))
+
+    def test_cache_evicts_least_recently_used(self):
+        cache = Sprites()
+        cache.CAT_SPRITE_CACHE_BYTES = 2 * 10 * 10 * 4
+        first = pygame.Surface((10, 10), pygame.SRCALPHA)
+
+        cache.cache_cat_sprite("first", first)
+        cache.cache_cat_sprite("second", pygame.Surface((10, 10), pygame.SRCALPHA))
+        self.assertIs(first, cache.get_cat_sprite("first"))
+        cache.cache_cat_sprite("third", pygame.Surface((10, 10), pygame.SRCALPHA))
+
+        self.assertIs(first, cache.get_cat_sprite("first"))
+        self.assertIsNone(cache.get_cat_sprite("second"))
+        self.assertEqual(cache.cat_sprite_cache_bytes, 2 * 10 * 10 * 4)
+        self.assertEqual(cache.cat_sprite_cache_stats, {"hits": 2, "misses": 1})
+
+    def test_inflate_mask(self):
+        mask = pygame.Mask((3, 3))
+        mask.set_at((0, 1))
+
+        inflated = inflate_mask(mask, 1, (7, 7), (2, 2))
+
+        expected = {(x, y) for x in range(1, 4) for y in range(2, 5)}
+        self.assertEqual(
+            expected,
+            {(x, y) for x in range(7) for y in range(7) if inflated.get_at((x, y))},
+        )